@@ -2,26 +2,77 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 
-db = SQLAlchemy()
+from app.utils.db_routing import RoutingSession
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object('app.config.Config')
     
+    # Pool sizing and per-connection PRAGMAs for DATABASE_PROFILE
+    from app.utils.db_profile import engine_options, init_engine
+    from app.utils import db_routing
+    app.config['SQLALCHEMY_BINDS'] = {**app.config.get('SQLALCHEMY_BINDS', {}), **db_routing.replica_binds(app.config)}
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
     db.init_app(app)
-    migrate.init_app(app, db)
+    with app.app_context():
+        for engine in db.engines.values():
+            init_engine(engine, app.config)
+    
+    # Read-only requests go to DATABASE_REPLICA_URLS when there are any
+    db_routing.init_app(app, db)
+    
+    # Cross-origin clients cannot rely on the session cookie, so they must
+    # be able to read the replica stickiness header and send it back
+    origins = [origin.strip() for origin in app.config['CORS_ORIGINS'].split(',') if origin.strip()]
+    if origins:
+        from flask_cors import CORS
+        CORS(app, resources={r'/api/*': {'origins': origins}}, expose_headers=[db_routing.STICKY_HEADER])
+    
+    from app.utils.search import include_object
+    migrate.init_app(app, db, include_object=include_object)
+    
+    from app.utils.quote_cache import quote_cache
+    quote_cache.init_app(app)
+    
+    # GET responses cached until a commit changes their rows
+    from app.utils.response_cache import response_cache
+    response_cache.init_app(app, db.session)
     
     # Import models after db initialization
     from app import models
     
+    # Generated per-model serializers and the API's JSON encoder
+    from app.utils.serializers import build_serializers
+    from app.utils.json_provider import FastJSONProvider
+    build_serializers()
+    app.json = FastJSONProvider(app)
+    
+    # Keeps the kanban tag index in step with every flush
+    from app.utils import tag_index
+    
+    # Records ticket events for /api/kanban/stream on every flush
+    from app.utils import kanban_feed
+    
+    # Logs ticket status changes and their time-in-stage aggregates
+    from app.utils import kanban_metrics
+    
     # Register blueprints
-    from app.routes import clients, projects, pricing, kanban, demo_analysis, documents
+    from app.routes import clients, projects, pricing, kanban, demo_analysis, documents, fx, search, imports, cache
     app.register_blueprint(clients.bp, url_prefix='/api/clients')
     app.register_blueprint(projects.bp, url_prefix='/api/projects')
     app.register_blueprint(pricing.bp, url_prefix='/api/pricing')
     app.register_blueprint(kanban.bp, url_prefix='/api/kanban')
     app.register_blueprint(demo_analysis.bp, url_prefix='/api/demo-analysis')
     app.register_blueprint(documents.bp, url_prefix='/api/documents')
+    app.register_blueprint(fx.bp, url_prefix='/api/fx')
+    app.register_blueprint(search.bp, url_prefix='/api/search')
+    app.register_blueprint(imports.bp, url_prefix='/api/import')
+    app.register_blueprint(cache.bp, url_prefix='/api/cache')
+    
+    from app.utils.bulk_import import import_command
+    app.cli.add_command(import_command)
     
     return app
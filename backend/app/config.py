@@ -10,4 +10,56 @@ class Config:
         'sqlite:///' + os.path.join(basedir, 'app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
-    UPLOAD_FOLDER = os.path.join(basedir, 'uploads')
\ No newline at end of file
+    UPLOAD_FOLDER = os.path.join(basedir, 'uploads')
+    RATE_CARD_REFRESH_SECONDS = int(os.environ.get('RATE_CARD_REFRESH_SECONDS', 30))
+    SWEEP_MAX_POINTS = int(os.environ.get('SWEEP_MAX_POINTS', 1000000))
+    QUOTE_CACHE_SIZE = int(os.environ.get('QUOTE_CACHE_SIZE', 4096))
+    QUOTE_CACHE_TTL = int(os.environ.get('QUOTE_CACHE_TTL', 300))
+    REPRICING_CHUNK_SIZE = int(os.environ.get('REPRICING_CHUNK_SIZE', 1000))
+    REPRICING_STALE_SECONDS = int(os.environ.get('REPRICING_STALE_SECONDS', 300))
+    MONTE_CARLO_SAMPLES = int(os.environ.get('MONTE_CARLO_SAMPLES', 20000))
+    MONTE_CARLO_MAX_SAMPLES = int(os.environ.get('MONTE_CARLO_MAX_SAMPLES', 200000))
+    FX_RATE_REFRESH_SECONDS = int(os.environ.get('FX_RATE_REFRESH_SECONDS', 60))
+    PAGE_SIZE = int(os.environ.get('PAGE_SIZE', 50))
+    MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', 500))
+    BOARD_COLUMN_LIMIT = int(os.environ.get('BOARD_COLUMN_LIMIT', 50))
+    SEARCH_ENGINE = os.environ.get('SEARCH_ENGINE', 'auto')  # auto, fts5 or like
+    DATABASE_PROFILE = os.environ.get('DATABASE_PROFILE', 'default')  # default or production
+    # Connections per process: one per request thread; SQLite has one writer
+    # at a time, so overflow connections would only queue on its lock
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 0))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 65536))
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 268435456))
+    # Comma-separated read replica URLs; GET requests are served from them
+    DATABASE_REPLICA_URLS = os.environ.get('DATABASE_REPLICA_URLS', '')
+    # How long a client's reads stay on the primary after it writes
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))
+    # Comma-separated origins allowed to call /api/* from a browser (the
+    # frontend's dev server runs on another port); empty disables CORS
+    CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '')
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 1000))
+    IMPORT_MAX_ERRORS = int(os.environ.get('IMPORT_MAX_ERRORS', 100))
+    EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 1000))
+    FULL_PROJECT_MAX_IDS = int(os.environ.get('FULL_PROJECT_MAX_IDS', 100))
+    # stdlib (byte-identical to Flask's default) or orjson (faster, optional package)
+    JSON_BACKEND = os.environ.get('JSON_BACKEND', 'stdlib')
+    # Worker processes serving the app; gunicorn reads WEB_CONCURRENCY too
+    WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 1))
+    # memory (single process only: other workers would keep serving what
+    # they cached, unchecked, until the TTL), redis (shared, needs the redis
+    # package and RESPONSE_CACHE_URL), none, or auto: redis with more than
+    # one worker, memory otherwise
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'auto')
+    RESPONSE_CACHE_URL = os.environ.get('RESPONSE_CACHE_URL', 'redis://localhost:6379/0')
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 10000))
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 60))
+    # Ticket events kept for /api/kanban/stream resumes (Last-Event-ID)
+    KANBAN_EVENT_BUFFER = int(os.environ.get('KANBAN_EVENT_BUFFER', 1000))
+    KANBAN_STREAM_POLL_SECONDS = float(os.environ.get('KANBAN_STREAM_POLL_SECONDS', 0.5))
+    KANBAN_STREAM_HEARTBEAT_SECONDS = int(os.environ.get('KANBAN_STREAM_HEARTBEAT_SECONDS', 15))
+    KANBAN_BULK_MAX_TICKETS = int(os.environ.get('KANBAN_BULK_MAX_TICKETS', 500))
+    # Default window of /api/kanban/metrics throughput
+    KANBAN_METRICS_DAYS = int(os.environ.get('KANBAN_METRICS_DAYS', 30))
@@ -18,9 +18,18 @@ class Client(db.Model):
     has_bi_team = db.Column(db.Boolean)
     wants_bi_tool = db.Column(db.Boolean)
     will_provide_bi_projects = db.Column(db.Boolean)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     projects = db.relationship('Project', backref='client', lazy=True)
 
+    # Column groups for ?fields= (see app/utils/fields.py)
+    FIELD_GROUPS = {
+        'summary': ['id', 'name', 'client_type', 'currency', 'created_at', 'updated_at'],
+        'contact': ['analyst_name', 'contact_name', 'email', 'phone', 'country', 'city'],
+        'profile': ['industry_sector', 'company_size', 'annual_revenue', 'has_bi_team',
+                    'wants_bi_tool', 'will_provide_bi_projects']
+    }
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -39,12 +48,13 @@ class Client(db.Model):
             'has_bi_team': self.has_bi_team,
             'wants_bi_tool': self.wants_bi_tool,
             'will_provide_bi_projects': self.will_provide_bi_projects,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
 class Project(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    client_id = db.Column(db.Integer, db.ForeignKey('client.id'), nullable=False)
+    client_id = db.Column(db.Integer, db.ForeignKey('client.id'), nullable=False, index=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
     business_objective = db.Column(db.Text)
@@ -72,12 +82,25 @@ class Project(db.Model):
     suggested_pricing_model = db.Column(db.Text)
     risk_factors = db.Column(db.Text)
     next_steps = db.Column(db.Text)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     quote = db.relationship('Quote', backref='project', uselist=False)
     kanban_ticket = db.relationship('KanbanTicket', backref='project', uselist=False)
     demo_analysis = db.relationship('DemoBusinessAnalysis', backref='project', uselist=False)
     documents = db.relationship('Document', backref='project', lazy=True)
 
+    # Column groups for ?fields= (see app/utils/fields.py); the JSON and
+    # Text columns are kept out of summary
+    FIELD_GROUPS = {
+        'summary': ['id', 'client_id', 'title', 'subscription_plan', 'engagement_type', 'support_plan',
+                    'budget_range', 'start_date', 'end_date', 'created_at', 'updated_at'],
+        'requirements': ['expected_deliverables', 'target_audience', 'data_sources', 'data_volume',
+                         'api_details', 'google_spreadsheet', 'required_integrations', 'interactivity',
+                         'user_access', 'customization', 'delivery_model', 'tiered_pricing'],
+        'notes': ['description', 'business_objective', 'competitor_comparison', 'roi_expectations',
+                  'analyst_notes', 'suggested_pricing_model', 'risk_factors', 'next_steps']
+    }
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -109,12 +132,13 @@ class Project(db.Model):
             'suggested_pricing_model': self.suggested_pricing_model,
             'risk_factors': self.risk_factors,
             'next_steps': self.next_steps,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
 class Quote(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False, unique=True, index=True)
     base_price = db.Column(db.Float)
     widgets_price = db.Column(db.Float)
     data_sources_price = db.Column(db.Float)
@@ -125,8 +149,10 @@ class Quote(db.Model):
     hosting_price = db.Column(db.Float)
     total_price = db.Column(db.Float)
     currency = db.Column(db.String(10))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
+    rate_card_version = db.Column(db.Integer)
+    inputs = db.Column(db.JSON)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     def to_dict(self):
         return {
@@ -142,17 +168,101 @@ class Quote(db.Model):
             'hosting_price': self.hosting_price,
             'total_price': self.total_price,
             'currency': self.currency,
+            'rate_card_version': self.rate_card_version,
+            'inputs': self.inputs,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
-class KanbanTicket(db.Model):
+class RateCard(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
-    status = db.Column(db.String(50), default='Pricing Submissions')
-    tags = db.Column(db.JSON)
+    version = db.Column(db.Integer, unique=True, nullable=False)
+    rates = db.Column(db.JSON, nullable=False)
+    description = db.Column(db.String(255))
+    published_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'version': self.version,
+            'rates': self.rates,
+            'description': self.description,
+            'published_at': self.published_at.isoformat() if self.published_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+class FxRate(db.Model):
+    __table_args__ = (db.UniqueConstraint('currency', 'effective_date', name='uq_fx_rate_currency_date'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    currency = db.Column(db.String(10), nullable=False)
+    # Value of one unit of `currency` in the base currency (USD) from effective_date on
+    rate = db.Column(db.Float, nullable=False)
+    effective_date = db.Column(db.Date, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'currency': self.currency,
+            'rate': self.rate,
+            'effective_date': self.effective_date.isoformat() if self.effective_date else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+class RepricingJob(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    status = db.Column(db.String(20), default='pending', index=True)
+    chunk_size = db.Column(db.Integer, nullable=False)
+    total = db.Column(db.Integer, default=0)
+    processed = db.Column(db.Integer, default=0)
+    skipped = db.Column(db.Integer, default=0)
+    last_quote_id = db.Column(db.Integer, default=0)
+    rate_card_version = db.Column(db.Integer)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    run_started_at = db.Column(db.DateTime)
+    run_start_processed = db.Column(db.Integer, default=0)
     updated_at = db.Column(db.DateTime, onupdate=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+
+    # Left out of to_dict and the generated serializer (app/utils/serializers.py)
+    SERIALIZE_EXCLUDE = ['run_start_processed']
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'chunk_size': self.chunk_size,
+            'total': self.total,
+            'processed': self.processed,
+            'skipped': self.skipped,
+            'last_quote_id': self.last_quote_id,
+            'rate_card_version': self.rate_card_version,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'run_started_at': self.run_started_at.isoformat() if self.run_started_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class KanbanTicket(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False, unique=True, index=True)
+    status = db.Column(db.String(50), default='Pricing Submissions', index=True)
+    tags = db.Column(db.JSON)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    # When the ticket entered its current status
+    status_changed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Added after the columns by to_dict and the generated serializer
+    SERIALIZE_EXTRA = {
+        'project_title': lambda ticket: ticket.project.title if ticket.project else None
+    }
 
     def to_dict(self):
         # Avoid circular reference by not including full project data
@@ -163,12 +273,82 @@ class KanbanTicket(db.Model):
             'tags': self.tags,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'status_changed_at': self.status_changed_at.isoformat() if self.status_changed_at else None,
             'project_title': self.project.title if self.project else None
         }
 
+# Inverted index of KanbanTicket.tags, one row per ticket and tag
+class KanbanTicketTag(db.Model):
+    __table_args__ = (db.Index('ix_kanban_ticket_tag_tag_ticket_id', 'tag', 'ticket_id'),)
+
+    ticket_id = db.Column(db.Integer, db.ForeignKey('kanban_ticket.id', ondelete='CASCADE'), primary_key=True)
+    tag = db.Column(db.String(100), primary_key=True)
+
+# Recent ticket changes for the /api/kanban/stream feed; only the newest
+# KANBAN_EVENT_BUFFER rows are kept
+class KanbanEvent(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    event = db.Column(db.String(30), nullable=False)
+    ticket_id = db.Column(db.Integer, nullable=False)
+    data = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'event': self.event,
+            'ticket_id': self.ticket_id,
+            'data': self.data,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+# Append-only log of ticket status changes, one row per move (and one with
+# no from_status when a ticket is created)
+class KanbanStatusChange(db.Model):
+    __table_args__ = (db.Index('ix_kanban_status_change_ticket_id_id', 'ticket_id', 'id'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    ticket_id = db.Column(db.Integer, nullable=False)
+    from_status = db.Column(db.String(50))
+    to_status = db.Column(db.String(50), nullable=False)
+    analyst_name = db.Column(db.String(120), nullable=False)
+    # When the ticket entered from_status, and how long it stayed there
+    entered_at = db.Column(db.DateTime)
+    changed_at = db.Column(db.DateTime, nullable=False, index=True)
+    dwell_seconds = db.Column(db.Float)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'ticket_id': self.ticket_id,
+            'from_status': self.from_status,
+            'to_status': self.to_status,
+            'analyst_name': self.analyst_name,
+            'entered_at': self.entered_at.isoformat() if self.entered_at else None,
+            'changed_at': self.changed_at.isoformat() if self.changed_at else None,
+            'dwell_seconds': self.dwell_seconds
+        }
+
+# Histogram of time spent in each status, per analyst: `count` stays ending
+# in a bucket of dwell times (see kanban_metrics), updated with every move
+class KanbanDwellStat(db.Model):
+    status = db.Column(db.String(50), primary_key=True)
+    analyst_name = db.Column(db.String(120), primary_key=True)
+    bucket = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    total_seconds = db.Column(db.Float, nullable=False, default=0)
+
+# Tickets entering and leaving each status per day and analyst
+class KanbanThroughput(db.Model):
+    day = db.Column(db.Date, primary_key=True)
+    status = db.Column(db.String(50), primary_key=True)
+    analyst_name = db.Column(db.String(120), primary_key=True)
+    entered = db.Column(db.Integer, nullable=False, default=0)
+    exited = db.Column(db.Integer, nullable=False, default=0)
+
 class DemoBusinessAnalysis(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False, unique=True, index=True)
     analysis_type = db.Column(db.String(50))
     company_website = db.Column(db.String(255))
     use_case_description = db.Column(db.Text)
@@ -186,7 +366,18 @@ class DemoBusinessAnalysis(db.Model):
     documentation_status = db.Column(db.Text)
     support_team_available = db.Column(db.Boolean)
     mathematical_modeling = db.Column(db.Boolean)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+    # Column groups for ?fields= (see app/utils/fields.py)
+    FIELD_GROUPS = {
+        'summary': ['id', 'project_id', 'analysis_type', 'created_at', 'updated_at'],
+        'links': ['company_website', 'reference_links', 'attachments'],
+        'scope': ['verticals', 'custom_vertical', 'demo_details', 'support_team_available',
+                  'mathematical_modeling', 'documentation_status'],
+        'narrative': ['use_case_description', 'client_suggestions', 'problem_statement', 'case_description',
+                      'stakeholders', 'visualization_goal', 'resources_provided']
+    }
 
     def to_dict(self):
         return {
@@ -209,16 +400,18 @@ class DemoBusinessAnalysis(db.Model):
             'documentation_status': self.documentation_status,
             'support_team_available': self.support_team_available,
             'mathematical_modeling': self.mathematical_modeling,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
 class Document(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False, index=True)
     filename = db.Column(db.String(255), nullable=False)
     filepath = db.Column(db.String(512), nullable=False)
     filetype = db.Column(db.String(50))
-    uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
+    uploaded_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     def to_dict(self):
         return {
@@ -227,5 +420,6 @@ class Document(db.Model):
             'filename': self.filename,
             'filepath': self.filepath,
             'filetype': self.filetype,
-            'uploaded_at': self.uploaded_at.isoformat() if self.uploaded_at else None
+            'uploaded_at': self.uploaded_at.isoformat() if self.uploaded_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
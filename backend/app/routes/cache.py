@@ -0,0 +1,15 @@
+from flask import Blueprint, jsonify
+from app.utils.response_cache import response_cache
+
+bp = Blueprint('cache', __name__)
+
+@bp.route('/responses', methods=['GET'])
+def get_response_cache_stats():
+    """Hit ratio of the GET response cache, overall and per endpoint"""
+    return jsonify(response_cache.stats())
+
+@bp.route('/responses', methods=['DELETE'])
+def clear_response_cache():
+    """Drop every cached response"""
+    response_cache.clear()
+    return jsonify({'cleared': True})
@@ -1,5 +1,11 @@
 from flask import Blueprint, request, jsonify
 from app.models import Client
+from app.utils.pagination import paginate, filter_created
+from app.utils.validators import client_values
+from app.utils.fields import parse_fields, load_fields, fields_dict
+from app.utils.serializers import serialize
+from app.utils.conditional import query_validators, is_fresh, not_modified, with_validators
+from app.utils.response_cache import response_cache
 from app import db
 
 bp = Blueprint('clients', __name__)
@@ -12,56 +18,66 @@ def create_client():
         if not data:
             return jsonify({'error': 'No JSON data provided'}), 400
         
-        # Validate required fields
-        required_fields = ['analyst_name', 'name', 'client_type', 'email']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({'error': f'{field} is required'}), 400
+        try:
+            values = client_values(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Validate pricing analyst name
-        if not data.get('analyst_name', '').lower().startswith('pricing'):
-            return jsonify({'error': 'Analyst name must start with "pricing"'}), 400
-        
-        client = Client(
-            analyst_name=data['analyst_name'],
-            name=data['name'],
-            client_type=data['client_type'],
-            country=data.get('country'),
-            city=data.get('city'),
-            currency=data.get('currency'),
-            industry_sector=data.get('industry_sector'),
-            company_size=data.get('company_size'),
-            annual_revenue=data.get('annual_revenue'),
-            contact_name=data.get('contact_name'),
-            email=data['email'],
-            phone=data.get('phone'),
-            has_bi_team=data.get('has_bi_team', False),
-            wants_bi_tool=data.get('wants_bi_tool', False),
-            will_provide_bi_projects=data.get('will_provide_bi_projects', False)
-        )
+        client = Client(**values)
         
         db.session.add(client)
         db.session.commit()
         
-        return jsonify(client.to_dict()), 201
+        return jsonify(serialize(client)), 201
     
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/', methods=['GET'])
+@response_cache.cached(Client)
 def get_all_clients():
+    """Keyset-paginated clients
+    ?limit=50&cursor=...&sort=-created_at&currency=EUR&client_type=...
+    &created_from=2026-01-01&created_to=2026-02-01&fields=summary,email
+    """
     try:
-        clients = Client.query.all()
-        return jsonify([client.to_dict() for client in clients])
+        query = Client.query
+        if request.args.get('currency'):
+            query = query.filter(Client.currency == request.args['currency'])
+        if request.args.get('client_type'):
+            query = query.filter(Client.client_type == request.args['client_type'])
+        
+        try:
+            fields = parse_fields(Client, request.args.get('fields'))
+            query = filter_created(query, Client.created_at, request.args)
+            validators = query_validators(query, Client.updated_at)
+            if is_fresh(validators):
+                return not_modified(validators)
+            query = load_fields(query, Client, fields, request.args.get('sort', '-id').lstrip('-'))
+            page = paginate(query, Client, request.args, ['id', 'created_at', 'name', 'updated_at'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        page['items'] = [fields_dict(client, fields) for client in page['items']]
+        return with_validators(jsonify(page), validators)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/<int:id>', methods=['GET'])
+@response_cache.cached(Client, 'id')
 def get_client(id):
+    """?fields=summary,contact for a subset of the columns"""
     try:
-        client = Client.query.get_or_404(id)
-        return jsonify(client.to_dict())
+        try:
+            fields = parse_fields(Client, request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        validators = query_validators(Client.query.filter(Client.id == id), Client.updated_at)
+        if is_fresh(validators):
+            return not_modified(validators)
+        client = load_fields(Client.query, Client, fields).get_or_404(id)
+        return with_validators(jsonify(fields_dict(client, fields)), validators)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -82,7 +98,7 @@ def update_client(id):
                 setattr(client, field, data[field])
         
         db.session.commit()
-        return jsonify(client.to_dict())
+        return jsonify(serialize(client))
     
     except Exception as e:
         db.session.rollback()
@@ -1,11 +1,16 @@
 from flask import Blueprint, request, jsonify
+from sqlalchemy.exc import IntegrityError
 from app.models import DemoBusinessAnalysis, Project
+from app.utils.fields import parse_fields, load_fields, fields_dict
+from app.utils.serializers import serialize
+from app.utils.conditional import query_validators, is_fresh, not_modified, with_validators
 from app import db
 
 bp = Blueprint('demo_analysis', __name__)
 
 @bp.route('/project/<int:project_id>', methods=['POST'])
 def create_demo_analysis(project_id):
+    """Store the project's demo analysis, replacing the one it already has"""
     try:
         project = Project.query.get_or_404(project_id)
         data = request.get_json()
@@ -16,8 +21,7 @@ def create_demo_analysis(project_id):
         if not data.get('analysis_type'):
             return jsonify({'error': 'analysis_type is required'}), 400
         
-        analysis = DemoBusinessAnalysis(
-            project_id=project_id,
+        fields = dict(
             analysis_type=data['analysis_type'],
             company_website=data.get('company_website'),
             use_case_description=data.get('use_case_description'),
@@ -37,29 +41,50 @@ def create_demo_analysis(project_id):
             mathematical_modeling=data.get('mathematical_modeling', False)
         )
         
-        db.session.add(analysis)
+        # One analysis per project: update it in place like a quote
+        analysis = project.demo_analysis
+        created = analysis is None
+        if created:
+            analysis = DemoBusinessAnalysis(project_id=project_id, **fields)
+            db.session.add(analysis)
+        else:
+            for key, value in fields.items():
+                setattr(analysis, key, value)
         
-        # Update kanban ticket tags
+        # Add the analysis type to the kanban ticket tags. Assign a new list:
+        # appending in place is not seen as a change to the JSON column.
         if project.kanban_ticket:
             tags = project.kanban_ticket.tags or []
             if data['analysis_type'] not in tags:
-                tags.append(data['analysis_type'])
-                project.kanban_ticket.tags = tags
+                project.kanban_ticket.tags = tags + [data['analysis_type']]
         
         db.session.commit()
         
-        return jsonify(analysis.to_dict()), 201
+        return jsonify(serialize(analysis)), 201 if created else 200
     
+    except IntegrityError:
+        # Another request created the project's analysis first
+        db.session.rollback()
+        return jsonify({'error': 'Demo analysis already exists for this project'}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/project/<int:project_id>', methods=['GET'])
 def get_demo_analysis(project_id):
+    """?fields=summary,narrative for a subset of the columns"""
     try:
-        analysis = DemoBusinessAnalysis.query.filter_by(project_id=project_id).first()
+        try:
+            fields = parse_fields(DemoBusinessAnalysis, request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        query = DemoBusinessAnalysis.query.filter_by(project_id=project_id)
+        validators = query_validators(query, DemoBusinessAnalysis.updated_at)
+        if is_fresh(validators):
+            return not_modified(validators)
+        analysis = load_fields(query, DemoBusinessAnalysis, fields).first()
         if not analysis:
             return jsonify({'error': 'Demo analysis not found'}), 404
-        return jsonify(analysis.to_dict())
+        return with_validators(jsonify(fields_dict(analysis, fields)), validators)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
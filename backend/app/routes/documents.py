@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.models import Document, Project
+from app.utils.serializers import serialize
+from app.utils.conditional import query_validators, is_fresh, not_modified, with_validators
 from app import db
 import os
 from werkzeug.utils import secure_filename
@@ -42,7 +44,7 @@ def upload_document(project_id):
             db.session.add(document)
             db.session.commit()
             
-            return jsonify(document.to_dict()), 201
+            return jsonify(serialize(document)), 201
         
         return jsonify({'error': 'Invalid file type'}), 400
     
@@ -53,8 +55,12 @@ def upload_document(project_id):
 @bp.route('/project/<int:project_id>', methods=['GET'])
 def get_project_documents(project_id):
     try:
-        documents = Document.query.filter_by(project_id=project_id).all()
-        return jsonify([d.to_dict() for d in documents])
+        query = Document.query.filter_by(project_id=project_id)
+        validators = query_validators(query, Document.updated_at)
+        if is_fresh(validators):
+            return not_modified(validators)
+        documents = query.all()
+        return with_validators(jsonify([serialize(d) for d in documents]), validators)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
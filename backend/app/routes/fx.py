@@ -0,0 +1,108 @@
+from flask import Blueprint, request, jsonify
+from app.models import FxRate
+from app.utils.currencies import CURRENCIES, FX_BASE_CURRENCY
+from app.utils.fx import store_fx_rates, convert
+from app.utils.validators import validate_currency, validate_date_format
+from app.utils.serializers import serialize
+from app.utils.conditional import query_validators, is_fresh, not_modified, with_validators
+from app import db
+from datetime import datetime
+
+bp = Blueprint('fx', __name__)
+
+@bp.route('/currencies', methods=['GET'])
+def get_currencies():
+    return jsonify({
+        'base_currency': FX_BASE_CURRENCY,
+        'currencies': [{'code': code, 'name': name} for code, name in CURRENCIES.items()]
+    })
+
+@bp.route('/rates', methods=['GET'])
+def get_fx_rates():
+    """Stored rates, newest first; ?currency=EUR to filter"""
+    try:
+        query = FxRate.query
+        if request.args.get('currency'):
+            query = query.filter_by(currency=request.args['currency'])
+        validators = query_validators(query, FxRate.updated_at)
+        if is_fresh(validators):
+            return not_modified(validators)
+        rates = query.order_by(FxRate.effective_date.desc(), FxRate.currency).all()
+        return with_validators(jsonify([serialize(r) for r in rates]), validators)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/rates', methods=['POST'])
+def create_fx_rates():
+    """Store rates, replacing any for the same currency and date
+    Body: {"rates": [{"currency": "EUR", "rate": 1.08, "effective_date": "2026-10-01"}, ...]}
+    `rate` is the value of one unit of the currency in USD
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('rates'), list) or not data['rates']:
+            return jsonify({'error': 'rates list is required'}), 400
+        
+        entries = []
+        for entry in data['rates']:
+            if not isinstance(entry, dict):
+                return jsonify({'error': 'Each rate must be an object'}), 400
+            currency = entry.get('currency')
+            if not validate_currency(currency):
+                return jsonify({'error': f'Invalid currency: {currency}'}), 400
+            if currency == FX_BASE_CURRENCY:
+                return jsonify({'error': f'{FX_BASE_CURRENCY} is the base currency and has no rate'}), 400
+            rate = entry.get('rate')
+            if not isinstance(rate, (int, float)) or isinstance(rate, bool) or rate <= 0:
+                return jsonify({'error': f'rate for {currency} must be a positive number'}), 400
+            effective_date = entry.get('effective_date')
+            if not isinstance(effective_date, str) or not validate_date_format(effective_date):
+                return jsonify({'error': 'effective_date must be YYYY-MM-DD'}), 400
+            entries.append({
+                'currency': currency,
+                'rate': float(rate),
+                'effective_date': datetime.strptime(effective_date, '%Y-%m-%d').date()
+            })
+        
+        rows = store_fx_rates(entries)
+        return jsonify([serialize(r) for r in rows]), 201
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/convert', methods=['GET'])
+def convert_amount():
+    """?amount=100&from=EUR&to=GBP&date=2026-10-01 (date defaults to today)"""
+    try:
+        amount = request.args.get('amount', type=float)
+        from_currency = request.args.get('from')
+        to_currency = request.args.get('to')
+        on_date = request.args.get('date')
+        
+        if amount is None:
+            return jsonify({'error': 'amount must be a number'}), 400
+        for currency in [from_currency, to_currency]:
+            if not validate_currency(currency):
+                return jsonify({'error': f'Invalid currency: {currency}'}), 400
+        if on_date is not None:
+            if not validate_date_format(on_date):
+                return jsonify({'error': 'date must be YYYY-MM-DD'}), 400
+            on_date = datetime.strptime(on_date, '%Y-%m-%d').date()
+        
+        try:
+            converted = convert(amount, from_currency, to_currency, on_date)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 404
+        
+        return jsonify({
+            'amount': amount,
+            'from': from_currency,
+            'to': to_currency,
+            'date': on_date.isoformat() if on_date else None,
+            'converted': round(converted, 2)
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
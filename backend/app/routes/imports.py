@@ -0,0 +1,44 @@
+from flask import Blueprint, request, jsonify
+from app.utils.bulk_import import import_records, detect_format, IMPORT_KINDS, IMPORT_FORMATS
+from app.utils.pagination import parse_int
+from app import db
+
+bp = Blueprint('imports', __name__)
+
+@bp.route('/<kind>', methods=['POST'])
+def bulk_import(kind):
+    """Bulk import clients or projects from CSV or NDJSON
+    Send the file as the request body (Content-Type text/csv or
+    application/x-ndjson) or as a multipart `file`; ?format=csv|ndjson
+    overrides the detection and ?batch_size= the rows per insert.
+    The body is parsed as it streams in. Returns counts, rows/s and the
+    line and message of every rejected row.
+    """
+    try:
+        if kind not in IMPORT_KINDS:
+            return jsonify({'error': f'kind must be one of {list(IMPORT_KINDS)}'}), 404
+        
+        upload = request.files.get('file')
+        if upload:
+            stream = upload.stream
+            fmt = request.args.get('format') or detect_format(upload.filename, upload.mimetype)
+        else:
+            stream = request.stream
+            fmt = request.args.get('format') or detect_format(content_type=request.mimetype)
+        if fmt not in IMPORT_FORMATS:
+            return jsonify({'error': f'format must be one of {IMPORT_FORMATS}'}), 400
+        
+        try:
+            batch_size = parse_int('batch_size', request.args.get('batch_size')) if request.args.get('batch_size') else None
+            if batch_size is not None and batch_size < 1:
+                raise ValueError('batch_size must be at least 1')
+            stats = import_records(kind, stream, fmt, batch_size=batch_size)
+        except ValueError as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify(stats), 201 if stats['imported'] else 200
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
@@ -1,22 +1,117 @@
-from flask import Blueprint, request, jsonify
-from app.models import KanbanTicket, Project
+from flask import Blueprint, Response, request, jsonify, current_app
+from sqlalchemy.orm import joinedload, load_only
+from app.models import KanbanTicket, KanbanStatusChange, Project
+from app.utils.pagination import paginate, filter_created, parse_int
+from app.utils.kanban_board import KANBAN_STATUSES, kanban_board, board_validators
+from app.utils.tag_index import parse_tag_query, filter_by_tags, tag_counts
+from app.utils.kanban_feed import kanban_feed, events_after, stream_events, RESET_MESSAGE
+from app.utils.kanban_bulk import parse_ticket_changes, apply_ticket_changes
+from app.utils.kanban_metrics import dwell_metrics, throughput_metrics
+from app.utils.serializers import serialize
+from app.utils.conditional import query_validators, is_fresh, not_modified, with_validators
 from app import db
 
 bp = Blueprint('kanban', __name__)
 
 @bp.route('/', methods=['GET'])
 def get_all_tickets():
+    """Keyset-paginated tickets
+    ?limit=50&cursor=...&sort=-updated_at&status=Quote Generated&client_id=1
+    &project_id=2&created_from=2026-01-01&created_to=2026-02-01
+    """
     try:
-        tickets = KanbanTicket.query.all()
-        return jsonify([t.to_dict() for t in tickets])
+        query = KanbanTicket.query
+        try:
+            if request.args.get('status'):
+                query = query.filter(KanbanTicket.status == request.args['status'])
+            if request.args.get('project_id'):
+                query = query.filter(KanbanTicket.project_id == parse_int('project_id', request.args['project_id']))
+            if request.args.get('client_id'):
+                query = query.join(Project, KanbanTicket.project_id == Project.id).filter(
+                    Project.client_id == parse_int('client_id', request.args['client_id'])
+                )
+            query = filter_created(query, KanbanTicket.created_at, request.args)
+            # Cards show their project's title
+            validators = query_validators(query, KanbanTicket.updated_at, related=[Project])
+            if is_fresh(validators):
+                return not_modified(validators)
+            # to_dict reads the project title; load it in the same query
+            query = query.options(joinedload(KanbanTicket.project).options(load_only(Project.id, Project.title)))
+            page = paginate(query, KanbanTicket, request.args, ['id', 'created_at', 'updated_at'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        page['items'] = [serialize(t) for t in page['items']]
+        return with_validators(jsonify(page), validators)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/stream', methods=['GET'])
+def stream_ticket_events():
+    """Server-Sent Events feed of ticket.created, ticket.moved and
+    ticket.retagged events, each carrying the ticket as in GET /api/kanban/
+    Reconnects resume after the Last-Event-ID header (or ?last_event_id=)
+    from the last KANBAN_EVENT_BUFFER events; a reset event means some were
+    missed and the board should be re-fetched
+    """
+    try:
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        try:
+            last_event_id = parse_int('Last-Event-ID', last_event_id) if last_event_id else None
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Live events are picked up from here on, so none fall between the
+        # replay below and the stream
+        kanban_feed.subscribe(current_app._get_current_object())
+        try:
+            replay, after_id = [], kanban_feed.last_id
+            if last_event_id is not None:
+                events, complete = events_after(last_event_id, current_app.config['KANBAN_EVENT_BUFFER'])
+                if complete:
+                    replay = [message for event_id, message in events]
+                    after_id = events[-1][0] if events else last_event_id
+                else:
+                    # The client re-fetches the board, which already holds
+                    # everything up to the newest event
+                    replay = [RESET_MESSAGE]
+        except Exception:
+            kanban_feed.unsubscribe()
+            raise
+        
+        response = Response(
+            stream_events(replay, after_id, current_app.config['KANBAN_STREAM_HEARTBEAT_SECONDS']),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+        # Runs when the client goes away, even before the body started
+        response.call_on_close(kanban_feed.unsubscribe)
+        return response
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/<int:ticket_id>', methods=['GET'])
 def get_ticket(ticket_id):
     try:
+        validators = query_validators(
+            KanbanTicket.query.outerjoin(Project, KanbanTicket.project_id == Project.id)
+            .filter(KanbanTicket.id == ticket_id),
+            KanbanTicket.updated_at, Project.updated_at
+        )
+        if is_fresh(validators):
+            return not_modified(validators)
         ticket = KanbanTicket.query.get_or_404(ticket_id)
-        return jsonify(ticket.to_dict())
+        return with_validators(jsonify(serialize(ticket)), validators)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/<int:ticket_id>/history', methods=['GET'])
+def get_ticket_history(ticket_id):
+    """Every status change of a ticket, oldest first"""
+    try:
+        KanbanTicket.query.get_or_404(ticket_id)
+        changes = KanbanStatusChange.query.filter_by(ticket_id=ticket_id).order_by(KanbanStatusChange.id).all()
+        return jsonify([serialize(change) for change in changes])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -29,42 +124,137 @@ def update_ticket_status(ticket_id):
         if not data or 'status' not in data:
             return jsonify({'error': 'Status is required'}), 400
         
-        valid_statuses = [
-            'Pricing Submissions',
-            'Quote Generated',
-            'Contract Signed',
-            'Contract Rejected',
-            'Project Started',
-            'Project Delivered',
-            'Project Change Log After Delivery',
-            'Change Log Pricing Accepted',
-            'Change Log Pricing Rejected'
-        ]
-        
-        if data['status'] not in valid_statuses:
+        if data['status'] not in KANBAN_STATUSES:
             return jsonify({'error': 'Invalid status'}), 400
         
         ticket.status = data['status']
         db.session.commit()
         
-        return jsonify(ticket.to_dict())
+        return jsonify(serialize(ticket))
     
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@bp.route('/bulk', methods=['POST'])
+def bulk_update_tickets():
+    """Move and retag many tickets in one transaction
+    Body: {"changes": [{"ticket_id": 1, "status": "Quote Generated",
+    "add_tags": ["urgent"], "remove_tags": ["backlog"]}, ...]}
+    status, add_tags and remove_tags are each optional
+    """
+    try:
+        try:
+            changes = parse_ticket_changes(request.get_json(silent=True), current_app.config['KANBAN_BULK_MAX_TICKETS'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        tickets, missing = apply_ticket_changes(changes)
+        if missing:
+            db.session.rollback()
+            return jsonify({'error': f'Tickets not found: {missing}'}), 404
+        # Serialized before the commit expires them, to avoid a reload per ticket
+        result = {'tickets': [serialize(t) for t in tickets]}
+        db.session.commit()
+        
+        return jsonify(result)
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Time in stage (count, mean, p50, p90 seconds) per status, overall and
+    per analyst, and tickets entering and leaving each status over the last
+    ?days= days (default KANBAN_METRICS_DAYS); ?analyst= restricts both to
+    one analyst
+    """
+    try:
+        try:
+            days = parse_int('days', request.args.get('days', current_app.config['KANBAN_METRICS_DAYS']))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        if days < 1:
+            return jsonify({'error': 'days must be at least 1'}), 400
+        
+        analyst_name = request.args.get('analyst') or None
+        return jsonify({
+            'time_in_stage': dwell_metrics(analyst_name),
+            'throughput': {'days': days, 'statuses': throughput_metrics(days, analyst_name)}
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @bp.route('/search', methods=['GET'])
 def search_tickets():
+    """Tickets by tag, answered from the tag index
+    ?all=a,b (or tag=a) every tag, ?any=c,d at least one, ?not=e none of them;
+    keyset-paginated like /api/kanban/, with tag_counts over all matches
+    """
     try:
-        tag = request.args.get('tag')
-        if not tag:
-            return jsonify({'error': 'Tag parameter is required'}), 400
+        all_tags, any_tags, no_tags = parse_tag_query(request.args)
+        if not (all_tags or any_tags or no_tags):
+            return jsonify({'error': 'At least one of tag, all, any or not is required'}), 400
+        
+        query = filter_by_tags(KanbanTicket.query, all_tags, any_tags, no_tags)
+        validators = query_validators(query, KanbanTicket.updated_at, related=[Project])
+        if is_fresh(validators):
+            return not_modified(validators)
+        try:
+            page = paginate(
+                query.options(joinedload(KanbanTicket.project).options(load_only(Project.id, Project.title))),
+                KanbanTicket, request.args, ['id', 'created_at', 'updated_at']
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Use proper JSON query for PostgreSQL/MySQL or LIKE for SQLite
-        tickets = KanbanTicket.query.filter(
-            KanbanTicket.tags.contains([tag])
-        ).all()
-        return jsonify([t.to_dict() for t in tickets])
+        page['items'] = [serialize(t) for t in page['items']]
+        page['tag_counts'] = tag_counts(query)
+        return with_validators(jsonify(page), validators)
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/tags', methods=['GET'])
+def get_tags():
+    """Every tag with the number of tickets carrying it"""
+    try:
+        validators = query_validators(KanbanTicket.query, KanbanTicket.updated_at)
+        if is_fresh(validators):
+            return not_modified(validators)
+        return with_validators(jsonify(tag_counts()), validators)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/board', methods=['GET'])
+def get_board():
+    """The whole board in one query: every status column with its ticket
+    count and its first ?limit= cards (default BOARD_COLUMN_LIMIT)
+    ?client_id=1 restricts the board to one client
+    """
+    try:
+        try:
+            limit = parse_int('limit', request.args.get('limit', current_app.config['BOARD_COLUMN_LIMIT']))
+            client_id = request.args.get('client_id')
+            if client_id:
+                client_id = parse_int('client_id', client_id)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        max_limit = current_app.config['MAX_PAGE_SIZE']
+        if not 0 <= limit <= max_limit:
+            return jsonify({'error': f'limit must be between 0 and {max_limit}'}), 400
+        
+        validators = board_validators(client_id or None)
+        if is_fresh(validators):
+            return not_modified(validators)
+        columns = kanban_board(limit, client_id or None)
+        return with_validators(jsonify({
+            'limit': limit,
+            'total': sum(column['count'] for column in columns),
+            'columns': columns
+        }), validators)
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
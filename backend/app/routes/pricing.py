@@ -1,6 +1,17 @@
-from flask import Blueprint, request, jsonify
-from app.models import Project, Quote
-from app.utils.pricing_logic import generate_quote
+from flask import Blueprint, request, jsonify, current_app
+from app.models import Project, Quote, Client, RateCard, RepricingJob
+from app.utils.pricing_logic import build_quote_data, quote_inputs
+from app.utils.batch_pricing import generate_quotes_batch
+from app.utils.rate_card import get_rate_card, publish_rate_card
+from app.utils.price_sweep import sweep_quote
+from app.utils.quote_cache import quote_cache, cached_generate_quote
+from app.utils.repricing import start_repricing_job, resume_repricing_job, job_progress
+from app.utils.quote_uncertainty import simulate_quote
+from app.utils.fx import quote_totals, TOTALS_GROUPS
+from app.utils.validators import validate_currency, validate_date_format
+from app.utils.serializers import serialize
+from app.utils.conditional import query_validators, is_fresh, not_modified, with_validators
+from app.utils.response_cache import response_cache
 from app import db
 from datetime import datetime
 
@@ -8,27 +19,43 @@ bp = Blueprint('pricing', __name__)
 
 @bp.route('/generate/<int:project_id>', methods=['POST'])
 def generate_project_quote(project_id):
+    """Price a project and store its quote
+    Optional "uncertainty": {"distributions": {"num_widgets": {"distribution":
+    "triangular", "min": 10, "mode": 20, "max": 40}, ...}, "samples": 50000,
+    "seed": 1} adds P10/P50/P90 bands to the response; the stored quote is
+    still priced from the plain inputs.
+    """
     try:
         project = Project.query.get_or_404(project_id)
         data = request.get_json() or {}
         
         # Merge project data with additional pricing details
-        quote_data = {
-            'num_dashboards': data.get('num_dashboards', 1),
-            'num_widgets': data.get('num_widgets', 0),
-            'file_counts': data.get('file_counts', {}),
-            'database_sources': data.get('database_sources', []),
-            'integrations': data.get('integrations', {}),
-            'features': data.get('features', {}),
-            'branding': data.get('branding', {}),
-            'support_plan': project.support_plan or 'Basic',
-            'support_hours': data.get('support_hours', 0),
-            'hosting_details': data.get('hosting_details', {}),
-            'currency': project.client.currency if project.client else 'USD'
-        }
+        quote_data = build_quote_data(
+            data,
+            project.support_plan,
+            project.client.currency if project.client else 'USD'
+        )
+        rates = get_rate_card()
+        
+        bands = None
+        if data.get('uncertainty') is not None:
+            options = data['uncertainty']
+            if not isinstance(options, dict):
+                return jsonify({'error': 'uncertainty must be an object'}), 400
+            samples = options.get('samples', current_app.config['MONTE_CARLO_SAMPLES'])
+            max_samples = current_app.config['MONTE_CARLO_MAX_SAMPLES']
+            if not isinstance(samples, int) or isinstance(samples, bool) or not 1 <= samples <= max_samples:
+                return jsonify({'error': f'samples must be an integer from 1 to {max_samples}'}), 400
+            seed = options.get('seed')
+            if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool) or seed < 0):
+                return jsonify({'error': 'seed must be a non-negative integer'}), 400
+            try:
+                bands = simulate_quote(quote_data, options.get('distributions'), rates, samples, seed)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
         
         # Calculate quote
-        quote_result = generate_quote(quote_data)
+        quote_result = cached_generate_quote(quote_data, rates)
         
         # Create or update quote
         if project.quote:
@@ -43,18 +70,289 @@ def generate_project_quote(project_id):
             )
             db.session.add(quote)
         
+        # Keep the inputs so the quote can be repriced when rates change
+        quote.inputs = quote_inputs(data)
         db.session.commit()
         
-        return jsonify(quote.to_dict()), 201
+        result = serialize(quote)
+        if bands is not None:
+            result['uncertainty'] = bands
+        return jsonify(result), 201
     
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/quote/<int:quote_id>', methods=['GET'])
+@response_cache.cached(Quote, 'quote_id')
 def get_quote(quote_id):
     try:
+        validators = query_validators(Quote.query.filter(Quote.id == quote_id), Quote.updated_at)
+        if is_fresh(validators):
+            return not_modified(validators)
         quote = Quote.query.get_or_404(quote_id)
-        return jsonify(quote.to_dict())
+        return with_validators(jsonify(serialize(quote)), validators)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/generate-batch', methods=['POST'])
+def generate_batch_quotes():
+    """Price many projects at once and upsert their quotes in one transaction
+    Body: {"quotes": [{"project_id": 1, "num_widgets": 4, ...}, ...]}
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('quotes'), list):
+            return jsonify({'error': 'quotes list is required'}), 400
+        
+        items = data['quotes']
+        project_ids = []
+        for item in items:
+            project_id = item.get('project_id') if isinstance(item, dict) else None
+            if not isinstance(project_id, int) or isinstance(project_id, bool):
+                return jsonify({'error': 'Each quote requires an integer project_id'}), 400
+            project_ids.append(project_id)
+        
+        if len(set(project_ids)) != len(project_ids):
+            return jsonify({'error': 'Duplicate project_id in batch'}), 400
+        
+        # Only the columns pricing needs, for every project in one query
+        projects = {
+            row.id: row for row in db.session.query(
+                Project.id, Project.support_plan, Client.currency, Client.id.label('client_id')
+            ).outerjoin(Client, Project.client_id == Client.id)
+            .filter(Project.id.in_(project_ids))
+        }
+        missing = [pid for pid in project_ids if pid not in projects]
+        if missing:
+            return jsonify({'error': f'Projects not found: {missing}'}), 404
+        
+        payloads = []
+        for item in items:
+            project = projects[item['project_id']]
+            currency = project.currency if project.client_id is not None else 'USD'
+            payloads.append(build_quote_data(item, project.support_plan, currency))
+        
+        results = generate_quotes_batch(payloads, get_rate_card())
+        
+        existing = dict(
+            db.session.query(Quote.project_id, Quote.id)
+            .filter(Quote.project_id.in_(project_ids))
+        )
+        now = datetime.utcnow()
+        inserts, updates = [], []
+        for item, project_id, result in zip(items, project_ids, results):
+            result = dict(result, inputs=quote_inputs(item))
+            if project_id in existing:
+                updates.append(dict(result, id=existing[project_id], updated_at=now))
+            else:
+                inserts.append(dict(result, project_id=project_id))
+        
+        if updates:
+            db.session.bulk_update_mappings(Quote, updates)
+        if inserts:
+            db.session.bulk_insert_mappings(Quote, inserts)
+        # Bulk mappings skip the flush events the response cache listens to
+        response_cache.invalidate(db.session, Quote, [update['id'] for update in updates])
+        db.session.commit()
+        
+        quotes = Quote.query.filter(Quote.project_id.in_(project_ids)).all()
+        return jsonify({
+            'created': len(inserts),
+            'updated': len(updates),
+            'quotes': [serialize(q) for q in quotes]
+        }), 201
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/sweep', methods=['POST'])
+def sweep_prices():
+    """Price a whole grid of scenarios without storing any quote
+    Body: {"base": {...quote inputs...}, "project_id": 1, "components": [...],
+           "axes": [{"name": "num_widgets", "start": 0, "stop": 100},
+                    {"name": "branding.logo", "values": [false, true]}, ...]}
+    With project_id the support plan and currency come from the project, as in
+    /generate; an axis on support_plan still overrides the plan.
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('axes'), (dict, list)):
+            return jsonify({'error': 'axes are required'}), 400
+        
+        base = data.get('base') or {}
+        if not isinstance(base, dict):
+            return jsonify({'error': 'base must be an object'}), 400
+        
+        if data.get('project_id') is not None:
+            project = Project.query.get_or_404(data['project_id'])
+            base = build_quote_data(
+                base,
+                project.support_plan,
+                project.client.currency if project.client else 'USD'
+            )
+        
+        rates = get_rate_card()
+        try:
+            result = sweep_quote(
+                base,
+                data['axes'],
+                rates,
+                max_points=current_app.config['SWEEP_MAX_POINTS'],
+                components=data.get('components'),
+                expand=bool(data.get('expand'))
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({
+            'axes': [{'name': name, 'values': values} for name, values in result['axes']],
+            'shape': result['shape'],
+            'currency': base.get('currency', 'USD'),
+            'rate_card_version': rates.version,
+            'components': {
+                name: {'shape': list(grid.shape), 'values': grid.tolist()}
+                for name, grid in result['components'].items()
+            }
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/totals', methods=['GET'])
+def get_quote_totals():
+    """Quote totals converted to one currency, in a single grouped query
+    ?currency=EUR&group_by=client|currency|status&as_of=2026-10-01
+    Without as_of each quote is converted at the rates of the day it was priced.
+    """
+    try:
+        currency = request.args.get('currency', 'USD')
+        group_by = request.args.get('group_by')
+        as_of = request.args.get('as_of')
+        
+        if not validate_currency(currency):
+            return jsonify({'error': f'Invalid currency: {currency}'}), 400
+        if group_by is not None and group_by not in TOTALS_GROUPS:
+            return jsonify({'error': f'group_by must be one of {TOTALS_GROUPS}'}), 400
+        if as_of is not None:
+            if not validate_date_format(as_of):
+                return jsonify({'error': 'as_of must be YYYY-MM-DD'}), 400
+            as_of = datetime.strptime(as_of, '%Y-%m-%d').date()
+        
+        groups = quote_totals(currency, group_by, as_of)
+        return jsonify({
+            'currency': currency,
+            'group_by': group_by,
+            'as_of': as_of.isoformat() if as_of else None,
+            'total_price': round(sum(g['total_price'] for g in groups), 2),
+            'quote_count': sum(g['quote_count'] for g in groups),
+            'unconverted_count': sum(g['unconverted_count'] for g in groups),
+            'groups': groups
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/rate-card', methods=['GET'])
+def get_active_rate_card():
+    try:
+        card = get_rate_card()
+        return jsonify({'version': card.version, 'rates': card.rates})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/rate-card', methods=['POST'])
+def create_rate_card_version():
+    """Publish a new rate card version
+    Body: {"rates": {"widget": 25, ...}, "description": "..."}, omitted rates
+    are carried over from the active card
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('rates'), dict):
+            return jsonify({'error': 'rates object is required'}), 400
+        
+        try:
+            rate_card = publish_rate_card(data['rates'], data.get('description'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Entries for the old version can no longer be hit
+        quote_cache.invalidate()
+        
+        return jsonify(serialize(rate_card)), 201
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/rate-cards', methods=['GET'])
+def get_rate_card_versions():
+    try:
+        validators = query_validators(RateCard.query, RateCard.updated_at)
+        if is_fresh(validators):
+            return not_modified(validators)
+        rate_cards = RateCard.query.order_by(RateCard.version.desc()).all()
+        return with_validators(jsonify([serialize(r) for r in rate_cards]), validators)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/cache', methods=['GET'])
+def get_quote_cache_stats():
+    return jsonify(quote_cache.stats())
+
+@bp.route('/cache', methods=['DELETE'])
+def invalidate_quote_cache():
+    """Drop every cached quote, or only the one for {"key": ...}"""
+    data = request.get_json(silent=True) or {}
+    removed = quote_cache.invalidate(data.get('key'))
+    return jsonify({'invalidated': removed})
+
+@bp.route('/reprice', methods=['POST'])
+def start_repricing():
+    """Start a background job that reprices every stored quote
+    Body (optional): {"chunk_size": 1000}
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        chunk_size = data.get('chunk_size', current_app.config['REPRICING_CHUNK_SIZE'])
+        
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            return jsonify({'error': 'chunk_size must be a positive integer'}), 400
+        
+        job, error = start_repricing_job(chunk_size)
+        if error:
+            return jsonify({'error': error}), 409
+        
+        return jsonify(job_progress(job)), 202
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/reprice/<int:job_id>', methods=['GET'])
+def get_repricing_status(job_id):
+    try:
+        job = RepricingJob.query.get_or_404(job_id)
+        return jsonify(job_progress(job))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/reprice/<int:job_id>/resume', methods=['POST'])
+def resume_repricing(job_id):
+    try:
+        job = RepricingJob.query.get_or_404(job_id)
+        
+        job, error = resume_repricing_job(job)
+        if error:
+            return jsonify({'error': error}), 409
+        
+        return jsonify(job_progress(job)), 202
+    
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
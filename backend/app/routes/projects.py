@@ -1,5 +1,13 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context, current_app
 from app.models import Project, Client, KanbanTicket
+from app.utils.pagination import paginate, filter_created, parse_int
+from app.utils.validators import project_values
+from app.utils.export import EXPORT_FORMATS, export_query, stream_export
+from app.utils.project_graph import load_full_projects, full_project_dict, full_project_validators
+from app.utils.fields import parse_fields, load_fields, fields_dict
+from app.utils.serializers import serialize
+from app.utils.conditional import query_validators, is_fresh, not_modified, with_validators
+from app.utils.response_cache import response_cache
 from app import db
 from datetime import datetime
 
@@ -13,55 +21,15 @@ def create_project():
         if not data:
             return jsonify({'error': 'No JSON data provided'}), 400
         
-        # Validate required fields
-        if not data.get('client_id'):
-            return jsonify({'error': 'client_id is required'}), 400
-        if not data.get('title'):
-            return jsonify({'error': 'title is required'}), 400
+        try:
+            values = project_values(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         # Validate client exists
-        client = Client.query.get_or_404(data['client_id'])
-        
-        project = Project(
-            client_id=data['client_id'],
-            title=data['title'],
-            description=data.get('description'),
-            business_objective=data.get('business_objective'),
-            expected_deliverables=data.get('expected_deliverables', []),
-            subscription_plan=data.get('subscription_plan'),
-            target_audience=data.get('target_audience', []),
-            data_sources=data.get('data_sources', {}),
-            data_volume=data.get('data_volume'),
-            api_details=data.get('api_details', {}),
-            google_spreadsheet=data.get('google_spreadsheet'),
-            required_integrations=data.get('required_integrations', []),
-            interactivity=data.get('interactivity', {}),
-            user_access=data.get('user_access', {}),
-            customization=data.get('customization', {}),
-            engagement_type=data.get('engagement_type'),
-            support_plan=data.get('support_plan'),
-            delivery_model=data.get('delivery_model', {}),
-            budget_range=data.get('budget_range'),
-            competitor_comparison=data.get('competitor_comparison'),
-            roi_expectations=data.get('roi_expectations'),
-            tiered_pricing=data.get('tiered_pricing', {}),
-            analyst_notes=data.get('analyst_notes'),
-            suggested_pricing_model=data.get('suggested_pricing_model'),
-            risk_factors=data.get('risk_factors'),
-            next_steps=data.get('next_steps')
-        )
+        client = Client.query.get_or_404(values['client_id'])
         
-        if data.get('start_date'):
-            try:
-                project.start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
-            except ValueError:
-                return jsonify({'error': 'Invalid start_date format. Use YYYY-MM-DD'}), 400
-        
-        if data.get('end_date'):
-            try:
-                project.end_date = datetime.strptime(data['end_date'], '%Y-%m-%d').date()
-            except ValueError:
-                return jsonify({'error': 'Invalid end_date format. Use YYYY-MM-DD'}), 400
+        project = Project(**values)
         
         db.session.add(project)
         db.session.flush()  # Flush to get the project ID
@@ -75,7 +43,7 @@ def create_project():
         db.session.add(kanban_ticket)
         db.session.commit()
         
-        return jsonify(project.to_dict()), 201
+        return jsonify(serialize(project)), 201
     
     except Exception as e:
         db.session.rollback()
@@ -83,17 +51,127 @@ def create_project():
 
 @bp.route('/', methods=['GET'])
 def get_all_projects():
+    """Keyset-paginated projects
+    ?limit=50&cursor=...&sort=-created_at&client_id=1&status=Quote Generated
+    &currency=EUR&created_from=2026-01-01&created_to=2026-02-01
+    &fields=summary,description
+    status is the project's kanban column and currency its client's currency;
+    fields takes columns and the groups in Project.FIELD_GROUPS
+    """
+    try:
+        query = Project.query
+        # A filter's joined rows decide which projects match, so their
+        # changes count as changes to the list
+        timestamps = [Project.updated_at]
+        try:
+            fields = parse_fields(Project, request.args.get('fields'))
+            if request.args.get('client_id'):
+                query = query.filter(Project.client_id == parse_int('client_id', request.args['client_id']))
+            if request.args.get('status'):
+                query = query.join(KanbanTicket, KanbanTicket.project_id == Project.id).filter(
+                    KanbanTicket.status == request.args['status']
+                )
+                timestamps.append(KanbanTicket.updated_at)
+            if request.args.get('currency'):
+                query = query.join(Client, Project.client_id == Client.id).filter(
+                    Client.currency == request.args['currency']
+                )
+                timestamps.append(Client.updated_at)
+            query = filter_created(query, Project.created_at, request.args)
+            validators = query_validators(query, *timestamps)
+            if is_fresh(validators):
+                return not_modified(validators)
+            query = load_fields(query, Project, fields, request.args.get('sort', '-id').lstrip('-'))
+            page = paginate(query, Project, request.args, ['id', 'created_at', 'title', 'updated_at'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        page['items'] = [fields_dict(project, fields) for project in page['items']]
+        return with_validators(jsonify(page), validators)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/export', methods=['GET'])
+def export_projects():
+    """Stream every project with its client, quote and ticket status
+    ?format=ndjson|csv plus the filters of GET /api/projects/
+    The response is chunked and built as the rows are read
+    """
+    try:
+        fmt = request.args.get('format', 'ndjson')
+        if fmt not in EXPORT_FORMATS:
+            return jsonify({'error': f'format must be one of {list(EXPORT_FORMATS)}'}), 400
+        
+        try:
+            query = export_query(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return Response(
+            stream_with_context(stream_export(query, fmt)),
+            mimetype=EXPORT_FORMATS[fmt],
+            headers={'Content-Disposition': f'attachment; filename=projects.{fmt}'}
+        )
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/full', methods=['GET'])
+def get_full_projects():
+    """Many projects with all their related entities
+    ?ids=1,2,3 (at most FULL_PROJECT_MAX_IDS); unknown ids are listed in missing
+    """
     try:
-        projects = Project.query.all()
-        return jsonify([project.to_dict() for project in projects])
+        try:
+            ids = list(dict.fromkeys(
+                parse_int('ids', value) for value in request.args.get('ids', '').split(',') if value.strip()
+            ))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        max_ids = current_app.config.get('FULL_PROJECT_MAX_IDS', 100)
+        if not ids or len(ids) > max_ids:
+            return jsonify({'error': f'ids must list between 1 and {max_ids} project ids'}), 400
+        
+        validators = full_project_validators(ids)
+        if is_fresh(validators):
+            return not_modified(validators)
+        projects = load_full_projects(ids)
+        return with_validators(jsonify({
+            'items': [full_project_dict(projects[i]) for i in ids if i in projects],
+            'missing': [i for i in ids if i not in projects]
+        }), validators)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/<int:id>/full', methods=['GET'])
+def get_full_project(id):
+    """The project page in one request: the project with its client, quote,
+    kanban ticket, demo analysis and documents, loaded in two queries
+    """
+    try:
+        validators = full_project_validators([id])
+        if is_fresh(validators):
+            return not_modified(validators)
+        project = load_full_projects([id]).get(id)
+        if not project:
+            return jsonify({'error': 'Project not found'}), 404
+        return with_validators(jsonify(full_project_dict(project)), validators)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/<int:id>', methods=['GET'])
+@response_cache.cached(Project, 'id')
 def get_project(id):
+    """?fields=summary,notes for a subset of the columns"""
     try:
-        project = Project.query.get_or_404(id)
-        return jsonify(project.to_dict())
+        try:
+            fields = parse_fields(Project, request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        validators = query_validators(Project.query.filter(Project.id == id), Project.updated_at)
+        if is_fresh(validators):
+            return not_modified(validators)
+        project = load_fields(Project.query, Project, fields).get_or_404(id)
+        return with_validators(jsonify(fields_dict(project, fields)), validators)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -134,7 +212,7 @@ def update_project(id):
                 return jsonify({'error': 'Invalid end_date format. Use YYYY-MM-DD'}), 400
         
         db.session.commit()
-        return jsonify(project.to_dict())
+        return jsonify(serialize(project))
     
     except Exception as e:
         db.session.rollback()
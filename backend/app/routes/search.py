@@ -0,0 +1,30 @@
+from flask import Blueprint, request, jsonify
+from app.utils.search import search, SEARCH_SOURCES
+from app.utils.pagination import parse_int
+
+bp = Blueprint('search', __name__)
+
+@bp.route('/', methods=['GET'])
+def search_text():
+    """Full-text search over project and demo analysis text
+    ?q=churn dashboard*&type=project|demo_analysis&limit=20
+    Hits are best first, with a snippet marking the matched words in **bold**
+    """
+    try:
+        types = request.args.getlist('type') or None
+        if types and any(t not in SEARCH_SOURCES for t in types):
+            return jsonify({'error': f'type must be one of {list(SEARCH_SOURCES)}'}), 400
+        
+        try:
+            limit = parse_int('limit', request.args.get('limit', 20))
+            if not 1 <= limit <= 100:
+                raise ValueError('limit must be between 1 and 100')
+            result = search(request.args.get('q'), types, limit)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        result['query'] = request.args.get('q')
+        return jsonify(result)
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,96 @@
+import numpy as np
+
+from app.utils.pricing_logic import generate_quote
+from app.utils.rate_card import DEFAULT_RATE_CARD
+
+INTEGRATION_TYPES = ['custom_apis', 'cloud_integrations', 'software_integrations', 'standard_integrations']
+BRANDING_OPTIONS = [
+    # (flag, scales with) -- order matters, it matches calculate_branding_price
+    ('logo', None),
+    ('widget_color', 'widgets'),
+    ('dashboard_color', 'dashboards'),
+    ('widget_font', 'widgets'),
+    ('dashboard_style', 'dashboards'),
+    ('localization', 'widgets'),
+    ('dashboard_localization', 'dashboards'),
+]
+SUPPORT_PLANS = {'Priority': 1, 'Dedicated Account Manager': 2}
+
+
+NUMBER_TYPES = (int, float)
+
+
+def _as_float(value):
+    # Record counts are only compared against tier bounds, so integers too
+    # large for a float still land in the top tier like they do in Python
+    try:
+        return float(value)
+    except OverflowError:
+        return float('inf') if value > 0 else float('-inf')
+
+
+def widgets_price(num_widgets, rates):
+    """Vectorized calculate_widgets_price"""
+    return num_widgets * rates.widget
+
+
+def database_tier_price(records, rates):
+    """Price of each table from its record count, looked up by bisection"""
+    return rates.tier_prices_array[np.searchsorted(rates.tier_bounds_array, records, side='right')]
+
+
+def integrations_price(counts, rates):
+    """Vectorized calculate_integrations_price
+    counts is a sequence of arrays, one per entry in INTEGRATION_TYPES
+    """
+    total = 0
+    for count in counts:
+        total = total + count * rates.integration
+    return total
+
+
+def features_price(drilldowns, rates):
+    """Vectorized calculate_features_price"""
+    return drilldowns * rates.drilldown
+
+
+def branding_price(has_branding, flags, num_widgets, num_dashboards, rates):
+    """Vectorized calculate_branding_price
+    flags is a sequence of boolean arrays, one per entry in BRANDING_OPTIONS
+    """
+    total = 0
+    for (name, scale), flag in zip(BRANDING_OPTIONS, flags):
+        if scale is None:
+            amount = rates.branding_logo
+        elif scale == 'widgets':
+            amount = num_widgets * rates.branding_per_widget
+        else:
+            amount = num_dashboards * rates.branding_per_dashboard
+        total = total + np.where(flag, amount, 0)
+    return np.where(has_branding, total, 0)
+
+
+def support_price(plan_codes, hours, rates):
+    """Vectorized calculate_support_price"""
+    return np.where(plan_codes == SUPPORT_PLANS['Priority'], hours * rates.support_priority_hourly,
+                    np.where(plan_codes == SUPPORT_PLANS['Dedicated Account Manager'],
+                             rates.support_dedicated_flat, 0))
+
+
+def hosting_price(has_details, widget_count, api_count, tables_count, rates):
+    """Vectorized calculate_hosting_price"""
+    block = rates.hosting_block_size
+    total = (np.floor_divide(widget_count, block) * rates.hosting_widget_block +
+             np.floor_divide(api_count, block) * rates.hosting_api_block +
+             tables_count * rates.hosting_table)
+    return np.where(has_details, total, 0) + rates.hosting_deployment
+
+
+def generate_quotes_batch(payloads, rates=DEFAULT_RATE_CARD):
+    """Generate quotes for many project payloads at once
+
+    Returns a list of dicts, one per payload, as generate_quote returns
+    them. Quotes are priced one at a time: unpacking nested payloads into
+    arrays costs more than the arithmetic it would vectorize.
+    """
+    return [generate_quote(data, rates) for data in payloads]
@@ -0,0 +1,242 @@
+import csv
+import io
+import json
+import os
+import time
+from datetime import datetime
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import select, insert, Boolean, Integer, Float, JSON
+from sqlalchemy.orm import joinedload, load_only
+
+from app import db
+from app.models import Client, Project, KanbanTicket
+from app.utils.kanban_feed import event_row, store_events
+from app.utils.kanban_metrics import record_status_changes
+from app.utils.tag_index import sync_ticket_tags
+from app.utils.validators import client_values, project_values
+
+IMPORT_KINDS = {'clients': Client, 'projects': Project}
+IMPORT_FORMATS = ['csv', 'ndjson']
+FORMAT_EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+TRUE_VALUES = {'true', '1', 'yes', 'y'}
+FALSE_VALUES = {'false', '0', 'no', 'n'}
+
+
+def detect_format(name=None, content_type=None):
+    """'csv' or 'ndjson' from a file name or content type, else None"""
+    if name:
+        extension = os.path.splitext(name)[1].lower()
+        if extension in FORMAT_EXTENSIONS:
+            return FORMAT_EXTENSIONS[extension]
+    if content_type:
+        if 'csv' in content_type:
+            return 'csv'
+        if 'ndjson' in content_type or 'jsonl' in content_type:
+            return 'ndjson'
+    return None
+
+
+def _csv_value(model, field, value):
+    # CSV cells are text: give them the type the JSON API would have sent
+    column = model.__table__.columns.get(field)
+    if field == 'tags' or (column is not None and isinstance(column.type, JSON)):
+        try:
+            return json.loads(value)
+        except ValueError:
+            raise ValueError(f'{field} must be JSON')
+    if column is None:
+        return value
+    if isinstance(column.type, Boolean):
+        if value.lower() not in TRUE_VALUES | FALSE_VALUES:
+            raise ValueError(f'{field} must be true or false')
+        return value.lower() in TRUE_VALUES
+    try:
+        if isinstance(column.type, Integer):
+            return int(value)
+        if isinstance(column.type, Float):
+            return float(value)
+    except ValueError:
+        raise ValueError(f'{field} must be a number')
+    return value
+
+
+def read_records(stream, fmt, model):
+    """Yield (line, data, error) for every record of a binary stream
+
+    The stream is decoded and parsed as it is read, one record at a time, so
+    memory use does not grow with the file. Empty CSV cells are left out
+    of `data`, as a JSON client would leave the key out.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        for row in reader:
+            data = {}
+            try:
+                for field, value in row.items():
+                    if field and value not in (None, ''):
+                        data[field] = _csv_value(model, field, value)
+            except ValueError as e:
+                yield reader.line_num, None, str(e)
+                continue
+            yield reader.line_num, data, None
+    else:
+        for line, raw in enumerate(text, 1):
+            if not raw.strip():
+                continue
+            try:
+                data = json.loads(raw)
+            except ValueError as e:
+                yield line, None, f'Invalid JSON: {e}'
+                continue
+            if not isinstance(data, dict):
+                yield line, None, 'Each line must be a JSON object'
+                continue
+            yield line, data, None
+
+
+def _insert_clients(batch):
+    db.session.execute(insert(Client), [values for line, values, tags in batch])
+    return []
+
+
+def _insert_projects(batch):
+    client_ids = {values['client_id'] for line, values, tags in batch}
+    existing = set(db.session.scalars(select(Client.id).where(Client.id.in_(client_ids))))
+    errors = [
+        {'line': line, 'error': f"Client {values['client_id']} not found"}
+        for line, values, tags in batch if values['client_id'] not in existing
+    ]
+    batch = [item for item in batch if item[1]['client_id'] in existing]
+    if not batch:
+        return errors
+
+    # RETURNING in parameter order pairs every new id with its row
+    project_ids = db.session.scalars(
+        insert(Project).returning(Project.id, sort_by_parameter_order=True),
+        [values for line, values, tags in batch]
+    ).all()
+    now = datetime.utcnow()
+    ticket_ids = db.session.scalars(
+        insert(KanbanTicket).returning(KanbanTicket.id, sort_by_parameter_order=True),
+        [
+            {'project_id': project_id, 'status': 'Pricing Submissions', 'tags': tags, 'status_changed_at': now}
+            for project_id, (line, values, tags) in zip(project_ids, batch)
+        ]
+    ).all()
+    # Bulk inserts skip the flush listeners that maintain the tag index, the
+    # status history and the kanban event feed
+    sync_ticket_tags(db.session.connection(), {
+        ticket_id: tags for ticket_id, (line, values, tags) in zip(ticket_ids, batch)
+    })
+    record_status_changes(db.session.connection(), [
+        {
+            'ticket_id': ticket_id,
+            'project_id': project_id,
+            'from_status': None,
+            'to_status': 'Pricing Submissions',
+            'entered_at': None,
+            'changed_at': now
+        }
+        for ticket_id, project_id in zip(ticket_ids, project_ids)
+    ])
+    tickets = KanbanTicket.query.options(
+        joinedload(KanbanTicket.project).options(load_only(Project.id, Project.title))
+    ).filter(KanbanTicket.id.in_(ticket_ids)).order_by(KanbanTicket.id)
+    store_events(db.session.connection(), [event_row(db.session, 'ticket.created', ticket) for ticket in tickets])
+    return errors
+
+
+def import_records(kind, stream, fmt, batch_size=None, max_errors=None):
+    """Validate and insert the clients or projects of a CSV/NDJSON stream
+
+    Rows are checked with the same rules as POST /api/clients/ and
+    /api/projects/, and valid ones are inserted with one executemany per
+    batch (projects together with their kanban tickets), committing each
+    batch. Invalid rows are skipped and reported with their line number,
+    up to `max_errors` of them; a batch the database refuses is retried
+    row by row so that only the offending lines fail. Raises ValueError for an unknown kind or
+    format.
+    """
+    if kind not in IMPORT_KINDS:
+        raise ValueError(f"kind must be one of: {', '.join(IMPORT_KINDS)}")
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(IMPORT_FORMATS)}")
+    batch_size = batch_size or current_app.config.get('IMPORT_BATCH_SIZE', 1000)
+    max_errors = current_app.config.get('IMPORT_MAX_ERRORS', 100) if max_errors is None else max_errors
+    clean = client_values if kind == 'clients' else project_values
+    insert_batch = _insert_clients if kind == 'clients' else _insert_projects
+
+    stats = {'kind': kind, 'format': fmt, 'rows': 0, 'imported': 0, 'failed': 0, 'batches': 0, 'errors': []}
+
+    def report(errors):
+        stats['failed'] += len(errors)
+        stats['errors'].extend(errors[:max(max_errors - len(stats['errors']), 0)])
+
+    def insert(batch):
+        try:
+            errors = insert_batch(batch)
+            db.session.commit()
+            return errors
+        except Exception as e:
+            db.session.rollback()
+            if len(batch) == 1:
+                return [{'line': batch[0][0], 'error': str(getattr(e, 'orig', None) or e)}]
+        # The database refused a row the checks let through: insert the rows
+        # one at a time so only that line fails
+        return [error for item in batch for error in insert([item])]
+
+    def flush(batch):
+        errors = insert(batch)
+        stats['imported'] += len(batch) - len(errors)
+        stats['batches'] += 1
+        report(errors)
+
+    start = time.perf_counter()
+    batch = []
+    for line, data, error in read_records(stream, fmt, IMPORT_KINDS[kind]):
+        stats['rows'] += 1
+        if error is None:
+            try:
+                values = clean(data)
+                tags = data.get('tags', []) if kind == 'projects' else None
+            except ValueError as e:
+                error = str(e)
+        if error is not None:
+            report([{'line': line, 'error': error}])
+            continue
+        batch.append((line, values, tags))
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+    seconds = time.perf_counter() - start
+    stats['seconds'] = round(seconds, 3)
+    stats['rows_per_second'] = round(stats['rows'] / seconds, 1) if seconds else None
+    return stats
+
+
+@click.command('import')
+@click.argument('kind', type=click.Choice(list(IMPORT_KINDS)))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(IMPORT_FORMATS), help='Defaults to the file extension')
+@click.option('--batch-size', type=int, help='Rows per insert batch (IMPORT_BATCH_SIZE)')
+@with_appcontext
+def import_command(kind, path, fmt, batch_size):
+    """Bulk import clients or projects from a CSV or NDJSON file"""
+    fmt = fmt or detect_format(path)
+    if fmt is None:
+        raise click.ClickException('cannot tell the format from the file name; pass --format')
+    with open(path, 'rb') as stream:
+        stats = import_records(kind, stream, fmt, batch_size=batch_size)
+    for error in stats['errors']:
+        click.echo(f"line {error['line']}: {error['error']}", err=True)
+    click.echo(
+        f"{stats['imported']:,} of {stats['rows']:,} {kind} imported in {stats['seconds']}s "
+        f"({stats['rows_per_second']} rows/s), {stats['failed']:,} failed"
+    )
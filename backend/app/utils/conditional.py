@@ -0,0 +1,60 @@
+import hashlib
+from collections import namedtuple
+from datetime import timezone
+
+from flask import request, current_app
+from sqlalchemy import select, func
+
+Validators = namedtuple('Validators', ['etag', 'last_modified', 'count'])
+
+
+def query_validators(query, *timestamps, related=()):
+    """ETag and Last-Modified for the rows `query` selects, from one aggregate
+
+    The validators are the row count and the newest of each `timestamps`
+    column (the model's updated_at, plus that of any model the query joins
+    for a filter), the newest updated_at of every `related` model over its
+    whole table (models whose fields the payload embeds), and a hash of the
+    request path and arguments (filters, sort, cursor, fields). Any insert,
+    update or delete among the selected rows changes the ETag. Deletes do
+    not move Last-Modified, so clients should prefer If-None-Match.
+    """
+    row = query.with_entities(
+        func.count(),
+        *[func.max(column) for column in timestamps],
+        *[select(func.max(model.updated_at)).scalar_subquery() for model in related]
+    ).one()
+    count, times = row[0], [value for value in row[1:] if value is not None]
+    state = [request.path, sorted(request.args.items(multi=True)), count, [t and t.isoformat() for t in row[1:]]]
+    etag = hashlib.sha1(repr(state).encode()).hexdigest()
+    last_modified = max(times).replace(tzinfo=timezone.utc) if times else None
+    return Validators(etag, last_modified, count)
+
+
+def is_fresh(validators):
+    """True when the client's copy matches: If-None-Match, else If-Modified-Since
+
+    Never true for an empty result, so a missing record still gets its 404.
+    """
+    if not validators.count:
+        return False
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(validators.etag)
+    if request.if_modified_since and validators.last_modified:
+        # HTTP dates have whole seconds
+        return validators.last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def with_validators(response, validators):
+    """Set ETag, Last-Modified and revalidate-every-time caching on a response"""
+    response.set_etag(validators.etag, weak=True)
+    if validators.last_modified:
+        response.last_modified = validators.last_modified
+    response.cache_control.no_cache = True
+    return response
+
+
+def not_modified(validators):
+    """Empty 304 carrying the current validators"""
+    return with_validators(current_app.response_class(status=304), validators)
@@ -0,0 +1,17 @@
+# Currencies quotes can be priced and reported in
+CURRENCIES = {
+    'USD': 'US Dollar',
+    'EUR': 'Euro',
+    'GBP': 'Pound Sterling',
+    'CAD': 'Canadian Dollar',
+    'AUD': 'Australian Dollar',
+    'JPY': 'Japanese Yen',
+    'CNY': 'Chinese Yuan',
+    'INR': 'Indian Rupee',
+}
+
+# FX rates are stored as the value of one unit in this currency
+FX_BASE_CURRENCY = 'USD'
+
+# Quotes for clients without a currency are priced in the base currency
+DEFAULT_CURRENCY = FX_BASE_CURRENCY
@@ -0,0 +1,72 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+DATABASE_PROFILES = ['default', 'production']
+
+
+def _is_sqlite(url):
+    return url.get_backend_name() == 'sqlite'
+
+
+def _in_memory(url):
+    return _is_sqlite(url) and url.database in (None, '', ':memory:')
+
+
+def sqlite_pragmas(config):
+    """PRAGMAs run on every new connection, in order, for the profile
+
+    The default profile leaves SQLite as it ships: rollback journal, and
+    writers that collide fail with "database is locked".
+    """
+    if config.get('DATABASE_PROFILE', 'default') != 'production':
+        return []
+    return [
+        # First, so switching the journal mode can wait for a lock too
+        ('busy_timeout', config['SQLITE_BUSY_TIMEOUT_MS']),
+        # Readers see the last commit while a writer appends to the log
+        ('journal_mode', 'WAL'),
+        # fsync at checkpoints only; a crash can lose the last commits but
+        # never corrupts the database
+        ('synchronous', 'NORMAL'),
+        # A negative size is in KiB rather than pages
+        ('cache_size', -config['SQLITE_CACHE_SIZE_KB']),
+        ('mmap_size', config['SQLITE_MMAP_SIZE']),
+        ('foreign_keys', 'ON'),
+        ('temp_store', 'MEMORY'),
+    ]
+
+
+def engine_options(config, uri=None):
+    """Engine options for the profile, merged over SQLALCHEMY_ENGINE_OPTIONS
+
+    `uri` defaults to SQLALCHEMY_DATABASE_URI; replicas pass their own.
+    """
+    profile = config.get('DATABASE_PROFILE', 'default')
+    if profile not in DATABASE_PROFILES:
+        raise ValueError(f"DATABASE_PROFILE must be one of: {', '.join(DATABASE_PROFILES)}")
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    url = make_url(uri or config['SQLALCHEMY_DATABASE_URI'])
+    if profile == 'production' and not _in_memory(url):
+        options.setdefault('pool_size', config['DB_POOL_SIZE'])
+        options.setdefault('max_overflow', config['DB_MAX_OVERFLOW'])
+        options.setdefault('pool_timeout', config['DB_POOL_TIMEOUT'])
+        if _is_sqlite(url):
+            # pysqlite's own wait, used before busy_timeout is set
+            connect_args = dict(options.get('connect_args') or {})
+            connect_args.setdefault('timeout', config['SQLITE_BUSY_TIMEOUT_MS'] / 1000)
+            options['connect_args'] = connect_args
+    return options
+
+
+def init_engine(engine, config):
+    """Apply the profile's PRAGMAs to each connection `engine` opens"""
+    pragmas = sqlite_pragmas(config)
+    if not pragmas or not _is_sqlite(engine.url) or _in_memory(engine.url):
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f'PRAGMA {name} = {value}')
+        cursor.close()
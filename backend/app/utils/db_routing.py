@@ -0,0 +1,145 @@
+import random
+import sqlite3
+import time
+
+import click
+from flask import g, has_app_context, request, session
+from flask.cli import AppGroup
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+from app.utils.db_profile import engine_options
+
+REPLICA_PREFIX = 'replica_'
+READ_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+# Sent after a write with the time reads stay on the primary until; clients
+# that do not keep cookies echo it back on their next requests
+STICKY_HEADER = 'X-DB-Primary-Until'
+
+replica_cli = AppGroup('replica', help='Read replica helpers')
+
+
+def replica_keys(engines):
+    return sorted(key for key in engines if key and key.startswith(REPLICA_PREFIX))
+
+
+def replica_binds(config):
+    """SQLALCHEMY_BINDS entries for DATABASE_REPLICA_URLS, pooled and tuned
+    by the same database profile as the primary"""
+    urls = [url.strip() for url in (config.get('DATABASE_REPLICA_URLS') or '').split(',') if url.strip()]
+    return {f'{REPLICA_PREFIX}{i}': {'url': url, **engine_options(config, url)} for i, url in enumerate(urls)}
+
+
+class RoutingSession(Session):
+    """Session that reads from a replica when the request allows it
+
+    Flushes, DML statements and everything outside a routed request use the
+    primary; on a replica request every other statement goes to the replica
+    picked in before_request.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not getattr(clause, 'is_dml', False):
+            replica = g.get('db_replica') if has_app_context() else None
+            if replica is not None:
+                return self._db.engines[replica]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _read_only(engine):
+    # A write that reaches a replica fails loudly instead of diverging
+    if engine.dialect.name == 'sqlite':
+        statement = 'PRAGMA query_only = ON'
+    elif engine.dialect.name == 'postgresql':
+        statement = 'SET SESSION CHARACTERISTICS AS TRANSACTION READ ONLY'
+    else:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _set_read_only(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(statement)
+        cursor.close()
+
+
+def _sticky_until(window):
+    """When this request's client last asked to read from the primary until
+
+    Either from the Flask session cookie, or from the header a cookie-less
+    (e.g. cross-origin) client echoes back. A header can only ask for the
+    sticky window itself, so it cannot pin a client to the primary.
+    """
+    now = time.time()
+    until = session.get('db_primary_until', 0)
+    try:
+        echoed = float(request.headers.get(STICKY_HEADER, 0))
+    except ValueError:
+        echoed = 0
+    if echoed <= now + window:
+        until = max(until, echoed)
+    return until
+
+
+def init_app(app, db):
+    """Route read-only requests to replicas, with read-your-writes
+
+    A GET/HEAD/OPTIONS request uses a random replica unless the client wrote
+    within the last REPLICA_STICKY_SECONDS: any request that flushes or runs
+    DML marks the client's Flask session and answers with STICKY_HEADER, and
+    the client's reads stay on the primary until replication has had time to
+    catch up.
+    """
+    with app.app_context():
+        replicas = replica_keys(db.engines)
+        for key in replicas:
+            _read_only(db.engines[key])
+    app.cli.add_command(replica_cli)
+    if not replicas:
+        return
+
+    @event.listens_for(db.session, 'after_flush')
+    def _flushed(orm_session, flush_context):
+        g.db_wrote = True
+
+    @event.listens_for(db.session, 'do_orm_execute')
+    def _executed(orm_execute_state):
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            g.db_wrote = True
+
+    @app.before_request
+    def _choose_bind():
+        sticky = _sticky_until(app.config['REPLICA_STICKY_SECONDS']) > time.time()
+        if request.method in READ_METHODS and not sticky:
+            g.db_replica = random.choice(replicas)
+
+    @app.after_request
+    def _remember_write(response):
+        if g.get('db_wrote'):
+            until = time.time() + app.config['REPLICA_STICKY_SECONDS']
+            session['db_primary_until'] = until
+            response.headers[STICKY_HEADER] = f'{until:.3f}'
+        return response
+
+
+@replica_cli.command('sync')
+def sync_replicas():
+    """Copy the primary SQLite database over every SQLite replica
+
+    Stands in for replication when trying the routing locally with files.
+    """
+    from app import db
+
+    primary = db.engine.url
+    if primary.get_backend_name() != 'sqlite':
+        raise click.ClickException('sync only copies SQLite databases; replicate other databases natively')
+    source = sqlite3.connect(primary.database)
+    for key in replica_keys(db.engines):
+        url = db.engines[key].url
+        if url.get_backend_name() != 'sqlite':
+            click.echo(f'{key}: skipped, not SQLite')
+            continue
+        target = sqlite3.connect(url.database)
+        source.backup(target)
+        target.close()
+        click.echo(f'{key}: copied to {url.database}')
+    source.close()
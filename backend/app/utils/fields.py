@@ -0,0 +1,59 @@
+from datetime import date, datetime
+
+from sqlalchemy.orm import load_only
+
+from app.utils.serializers import serialize
+
+
+def _columns(model):
+    return [attribute.key for attribute in model.__mapper__.column_attrs]
+
+
+def parse_fields(model, value):
+    """Column names selected by a ?fields= value, in column order
+
+    `value` is a comma-separated list of column names and of the group names
+    in the model's FIELD_GROUPS. The id is always included. Returns None when
+    `value` is empty (every field). Raises ValueError for unknown names.
+    """
+    if not value:
+        return None
+    columns = _columns(model)
+    groups = getattr(model, 'FIELD_GROUPS', {})
+    selected = {'id'}
+    for name in (part.strip() for part in value.split(',')):
+        if not name:
+            continue
+        if name in groups:
+            selected.update(groups[name])
+        elif name in columns:
+            selected.add(name)
+        else:
+            raise ValueError(
+                f'Unknown field: {name}. Use columns of {model.__name__} or the groups {sorted(groups)}'
+            )
+    return [column for column in columns if column in selected]
+
+
+def load_fields(query, model, fields, *extra):
+    """Load only `fields` (plus any `extra` columns, e.g. a sort key)
+
+    Every other column is deferred and raises if touched, so it is never
+    read from the database or decoded. No-op when `fields` is None.
+    """
+    if fields is None:
+        return query
+    columns = _columns(model)
+    names = list(fields) + [name for name in extra if name in columns and name not in fields]
+    return query.options(load_only(*[getattr(model, name) for name in names], raiseload=True))
+
+
+def fields_dict(obj, fields):
+    """obj.to_dict() restricted to `fields`, reading no other attribute"""
+    if fields is None:
+        return serialize(obj)
+    result = {}
+    for name in fields:
+        value = getattr(obj, name)
+        result[name] = value.isoformat() if isinstance(value, (date, datetime)) else value
+    return result
@@ -0,0 +1,152 @@
+import threading
+import time
+from datetime import date
+from functools import lru_cache
+
+from flask import current_app
+from sqlalchemy import select, func, case, literal
+
+from app import db
+from app.models import FxRate, Quote, Project, Client, KanbanTicket
+from app.utils.currencies import FX_BASE_CURRENCY, DEFAULT_CURRENCY
+
+TOTALS_GROUPS = ['client', 'currency', 'status']
+
+_lock = threading.Lock()
+_cleared_at = time.monotonic()
+
+
+@lru_cache(maxsize=4096)
+def _lookup_rate(currency, on_date):
+    return db.session.execute(
+        select(FxRate.rate)
+        .where(FxRate.currency == currency, FxRate.effective_date <= on_date)
+        .order_by(FxRate.effective_date.desc())
+        .limit(1)
+    ).scalar()
+
+
+def invalidate_fx_cache():
+    global _cleared_at
+    with _lock:
+        _lookup_rate.cache_clear()
+        _cleared_at = time.monotonic()
+
+
+def get_fx_rate(currency, on_date=None):
+    """Value of one unit of `currency` in the base currency on `on_date`
+
+    Lookups are cached in-process; the cache is dropped whenever this
+    process stores a rate and at least every FX_RATE_REFRESH_SECONDS, so
+    rates stored by other workers are picked up. Returns None when no rate
+    is in effect on that date.
+    """
+    if currency == FX_BASE_CURRENCY:
+        return 1.0
+    refresh = current_app.config.get('FX_RATE_REFRESH_SECONDS', 60)
+    if time.monotonic() - _cleared_at >= refresh:
+        invalidate_fx_cache()
+    return _lookup_rate(currency, on_date or date.today())
+
+
+def convert(amount, from_currency, to_currency, on_date=None):
+    """Convert `amount` between currencies at the rates in effect on `on_date`
+    Raises ValueError when either rate is missing.
+    """
+    if from_currency == to_currency:
+        return amount
+    from_rate = get_fx_rate(from_currency, on_date)
+    to_rate = get_fx_rate(to_currency, on_date)
+    for currency, rate in [(from_currency, from_rate), (to_currency, to_rate)]:
+        if rate is None:
+            raise ValueError(f'No FX rate for {currency} on {(on_date or date.today()).isoformat()}')
+    return amount * from_rate / to_rate
+
+
+def store_fx_rates(entries):
+    """Insert or replace rates from [{"currency", "rate", "effective_date"}, ...]
+    `effective_date` must already be a date. Returns the stored rows.
+    """
+    rows = []
+    for entry in entries:
+        row = FxRate.query.filter_by(
+            currency=entry['currency'], effective_date=entry['effective_date']
+        ).first()
+        if row is None:
+            row = FxRate(currency=entry['currency'], effective_date=entry['effective_date'])
+            db.session.add(row)
+        row.rate = entry['rate']
+        rows.append(row)
+    db.session.commit()
+    invalidate_fx_cache()
+    return rows
+
+
+def fx_rate_expr(currency, on_date):
+    """SQL expression for the rate of `currency` in effect on `on_date`
+
+    Both arguments may be columns or literals; the rate is looked up per row
+    with a correlated subquery on the (currency, effective_date) index.
+    """
+    latest = (
+        select(FxRate.rate)
+        .where(FxRate.currency == currency, FxRate.effective_date <= on_date)
+        .order_by(FxRate.effective_date.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    return case((currency == FX_BASE_CURRENCY, literal(1.0)), else_=latest)
+
+
+def quote_totals(target_currency, group_by=None, as_of=None):
+    """Total every quote in `target_currency` with one grouped query
+
+    Each quote is converted at the rates in effect on the day it was last
+    priced, or on `as_of` for all quotes when given. Quotes whose rate is
+    missing are counted as unconverted and left out of the totals.
+    """
+    quote_currency = func.coalesce(Quote.currency, DEFAULT_CURRENCY)
+    if as_of is not None:
+        on_date = literal(as_of)
+    else:
+        on_date = func.date(func.coalesce(Quote.updated_at, Quote.created_at))
+    converted = (
+        Quote.total_price
+        * fx_rate_expr(quote_currency, on_date)
+        / fx_rate_expr(literal(target_currency), on_date)
+    )
+
+    group_columns = {
+        'client': [Client.id.label('client_id'), Client.name.label('client_name')],
+        'currency': [quote_currency.label('currency')],
+        'status': [KanbanTicket.status.label('status')],
+    }.get(group_by, [])
+
+    converted_quotes = (
+        select(*group_columns, Quote.id.label('quote_id'), converted.label('converted'))
+        .select_from(Quote)
+        .join(Project, Quote.project_id == Project.id)
+        .outerjoin(Client, Project.client_id == Client.id)
+        .outerjoin(KanbanTicket, KanbanTicket.project_id == Project.id)
+        .subquery()
+    )
+    keys = [converted_quotes.c[column.key] for column in group_columns]
+    rows = db.session.execute(
+        select(
+            *keys,
+            func.count(converted_quotes.c.quote_id).label('quote_count'),
+            func.count(converted_quotes.c.converted).label('converted_count'),
+            func.coalesce(func.sum(converted_quotes.c.converted), 0.0).label('total_price'),
+        )
+        .group_by(*keys)
+        .order_by(*keys)
+    ).all()
+
+    groups = []
+    for row in rows:
+        group = {column.key: getattr(row, column.key) for column in group_columns}
+        group['quote_count'] = row.quote_count
+        group['unconverted_count'] = row.quote_count - row.converted_count
+        group['total_price'] = round(row.total_price, 2)
+        groups.append(group)
+    return groups
@@ -0,0 +1,51 @@
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+JSON_BACKENDS = ['stdlib', 'orjson']
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider with a reusable encoder for API responses
+
+    The 'stdlib' backend writes exactly the bytes of DefaultJSONProvider
+    (sorted keys, ASCII escapes, compact separators) but builds the encoder
+    once instead of on every response. The 'orjson' backend is several times
+    faster on large lists and decodes to the same values, but its text is not
+    byte-identical: non-ASCII characters are written raw and very small or
+    large floats (e.g. an FX rate of 6.3e-05) are spelled differently, so it
+    is opt-in through JSON_BACKEND.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        backend = app.config.get('JSON_BACKEND', 'stdlib')
+        if backend not in JSON_BACKENDS:
+            raise ValueError(f"JSON_BACKEND must be one of: {', '.join(JSON_BACKENDS)}")
+        if backend == 'orjson' and orjson is None:
+            raise ValueError('JSON_BACKEND=orjson needs the orjson package installed')
+        self.backend = backend
+        self._encoder = json.JSONEncoder(
+            ensure_ascii=self.ensure_ascii, sort_keys=self.sort_keys,
+            separators=(',', ':'), default=self.default
+        )
+
+    def _compact(self):
+        return not ((self.compact is None and self._app.debug) or self.compact is False)
+
+    def _encode(self, obj):
+        if self.backend == 'orjson':
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        return self._encoder.encode(obj).encode()
+
+    def response(self, *args, **kwargs):
+        if not self._compact():
+            # Indented debug output keeps the stock path
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj) + b'\n', mimetype=self.mimetype)
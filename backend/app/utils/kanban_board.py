@@ -0,0 +1,97 @@
+from sqlalchemy import select, func, or_
+
+from app import db
+from app.models import KanbanTicket, Project, Client, Quote
+from app.utils.conditional import query_validators
+
+# Board columns, in display order
+KANBAN_STATUSES = [
+    'Pricing Submissions',
+    'Quote Generated',
+    'Contract Signed',
+    'Contract Rejected',
+    'Project Started',
+    'Project Delivered',
+    'Project Change Log After Delivery',
+    'Change Log Pricing Accepted',
+    'Change Log Pricing Rejected'
+]
+
+
+def board_validators(client_id=None):
+    """Conditional GET validators over every ticket on the board and the
+    project, client and quote each card shows
+    """
+    query = (
+        KanbanTicket.query
+        .join(Project, KanbanTicket.project_id == Project.id)
+        .outerjoin(Client, Project.client_id == Client.id)
+        .outerjoin(Quote, Quote.project_id == Project.id)
+    )
+    if client_id is not None:
+        query = query.filter(Project.client_id == client_id)
+    return query_validators(query, KanbanTicket.updated_at, Project.updated_at, Client.updated_at, Quote.updated_at)
+
+
+def kanban_board(column_limit, client_id=None):
+    """The board as columns of card fields, from a single query
+
+    Window functions rank the tickets within each status (most recently
+    changed first) and count them, so one round trip returns the first
+    `column_limit` cards of every column together with each column's total.
+    """
+    last_change = func.coalesce(KanbanTicket.updated_at, KanbanTicket.created_at)
+    ranked = (
+        select(
+            KanbanTicket.id,
+            KanbanTicket.project_id,
+            KanbanTicket.status,
+            KanbanTicket.tags,
+            KanbanTicket.created_at,
+            KanbanTicket.updated_at,
+            Project.title.label('project_title'),
+            Project.client_id,
+            Client.name.label('client_name'),
+            Quote.total_price,
+            Quote.currency,
+            func.row_number().over(
+                partition_by=KanbanTicket.status,
+                order_by=[last_change.desc(), KanbanTicket.id.desc()]
+            ).label('position'),
+            func.count().over(partition_by=KanbanTicket.status).label('column_count'),
+        )
+        .join(Project, KanbanTicket.project_id == Project.id)
+        .outerjoin(Client, Project.client_id == Client.id)
+        .outerjoin(Quote, Quote.project_id == Project.id)
+    )
+    if client_id is not None:
+        ranked = ranked.where(Project.client_id == client_id)
+    ranked = ranked.subquery()
+
+    rows = db.session.execute(
+        select(ranked)
+        # The first row of each column carries its count even when limit is 0
+        .where(or_(ranked.c.position <= column_limit, ranked.c.position == 1))
+        .order_by(ranked.c.status, ranked.c.position)
+    ).all()
+
+    columns = {status: {'status': status, 'count': 0, 'tickets': []} for status in KANBAN_STATUSES}
+    for row in rows:
+        # Tickets in a status that is no longer offered still get a column
+        column = columns.setdefault(row.status, {'status': row.status, 'count': 0, 'tickets': []})
+        column['count'] = row.column_count
+        if row.position > column_limit:
+            continue
+        column['tickets'].append({
+            'id': row.id,
+            'project_id': row.project_id,
+            'project_title': row.project_title,
+            'client_id': row.client_id,
+            'client_name': row.client_name,
+            'total_price': row.total_price,
+            'currency': row.currency,
+            'tags': row.tags,
+            'created_at': row.created_at.isoformat() if row.created_at else None,
+            'updated_at': row.updated_at.isoformat() if row.updated_at else None
+        })
+    return list(columns.values())
@@ -0,0 +1,134 @@
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import joinedload, load_only
+
+from app import db
+from app.models import KanbanTicket, Project
+from app.utils.kanban_board import KANBAN_STATUSES
+from app.utils.kanban_feed import event_row, store_events
+from app.utils.kanban_metrics import record_status_changes
+from app.utils.tag_index import normalize_tags, sync_ticket_tags
+
+
+def _tag_list(change, field):
+    tags = change.get(field, [])
+    if not isinstance(tags, list) or not all(isinstance(tag, str) and tag for tag in tags):
+        raise ValueError(f'{field} must be a list of non-empty strings')
+    return normalize_tags(tags)
+
+
+def parse_ticket_changes(data, max_tickets):
+    """[{"ticket_id", "status", "add_tags", "remove_tags"}, ...] from a request
+
+    Each change names a ticket and any of a new status (one of
+    KANBAN_STATUSES), tags to add and tags to remove. Raises ValueError for
+    invalid input.
+    """
+    if not data or not isinstance(data.get('changes'), list) or not data['changes']:
+        raise ValueError('changes list is required')
+    if len(data['changes']) > max_tickets:
+        raise ValueError(f'At most {max_tickets} changes per request')
+
+    changes = []
+    for change in data['changes']:
+        if not isinstance(change, dict) or not isinstance(change.get('ticket_id'), int):
+            raise ValueError('Each change requires an integer ticket_id')
+        status = change.get('status')
+        if status is not None and status not in KANBAN_STATUSES:
+            raise ValueError(f'Invalid status: {status}')
+        changes.append({
+            'ticket_id': change['ticket_id'],
+            'status': status,
+            'add_tags': _tag_list(change, 'add_tags'),
+            'remove_tags': _tag_list(change, 'remove_tags')
+        })
+
+    ticket_ids = [change['ticket_id'] for change in changes]
+    if len(set(ticket_ids)) != len(ticket_ids):
+        raise ValueError('Duplicate ticket_id in changes')
+    return changes
+
+
+def apply_ticket_changes(changes):
+    """Apply parsed changes with set-based statements; returns (tickets, missing)
+
+    Current statuses and tags are read in one query. Moves become one
+    UPDATE ... WHERE id IN (...) per target status, and tag edits one
+    executemany UPDATE by primary key. The tag index, the kanban event feed
+    and the status history, which only follow ORM flushes, are written
+    explicitly. Nothing is changed when any ticket is missing. The caller
+    commits.
+    """
+    ticket_ids = [change['ticket_id'] for change in changes]
+    current = {
+        row.id: row for row in db.session.execute(
+            select(
+                KanbanTicket.id, KanbanTicket.project_id, KanbanTicket.status, KanbanTicket.status_changed_at,
+                KanbanTicket.tags
+            ).where(KanbanTicket.id.in_(ticket_ids))
+        )
+    }
+    missing = [ticket_id for ticket_id in ticket_ids if ticket_id not in current]
+    if missing:
+        return [], missing
+
+    now = datetime.utcnow()
+    moves = defaultdict(list)
+    retags = {}
+    for change in changes:
+        row = current[change['ticket_id']]
+        if change['status'] is not None and change['status'] != row.status:
+            moves[change['status']].append(row.id)
+        old_tags = row.tags or []
+        tags = [tag for tag in old_tags if tag not in change['remove_tags']]
+        tags += [tag for tag in change['add_tags'] if tag not in tags]
+        if tags != old_tags:
+            retags[row.id] = tags
+
+    for status, ids in moves.items():
+        db.session.execute(
+            update(KanbanTicket).where(KanbanTicket.id.in_(ids))
+            .values(status=status, status_changed_at=now, updated_at=now),
+            execution_options={'synchronize_session': False}
+        )
+    record_status_changes(db.session.connection(), [
+        {
+            'ticket_id': ticket_id,
+            'project_id': current[ticket_id].project_id,
+            'from_status': current[ticket_id].status,
+            'to_status': status,
+            'entered_at': current[ticket_id].status_changed_at,
+            'changed_at': now
+        }
+        for status, ids in moves.items() for ticket_id in ids
+    ])
+    if retags:
+        db.session.execute(
+            update(KanbanTicket),
+            [{'id': ticket_id, 'tags': tags, 'updated_at': now} for ticket_id, tags in retags.items()]
+        )
+        sync_ticket_tags(db.session.connection(), retags)
+
+    # One query for the response, with the project titles the cards show
+    tickets = {
+        ticket.id: ticket for ticket in KanbanTicket.query.options(
+            joinedload(KanbanTicket.project).options(load_only(Project.id, Project.title))
+        ).filter(KanbanTicket.id.in_(ticket_ids))
+    }
+    moved = {ticket_id for ids in moves.values() for ticket_id in ids}
+    events = []
+    for ticket_id in ticket_ids:
+        ticket, row = tickets[ticket_id], current[ticket_id]
+        if ticket_id in moved:
+            events.append(event_row(db.session, 'ticket.moved', ticket, previous_status=row.status))
+        if ticket_id in retags:
+            old_tags = row.tags or []
+            events.append(event_row(
+                db.session, 'ticket.retagged', ticket,
+                added_tags=[tag for tag in ticket.tags if tag not in old_tags],
+                removed_tags=[tag for tag in old_tags if tag not in ticket.tags]
+            ))
+    store_events(db.session.connection(), events)
+    return [tickets[ticket_id] for ticket_id in ticket_ids], []
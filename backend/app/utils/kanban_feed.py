@@ -0,0 +1,221 @@
+import json
+import threading
+import time
+from collections import deque
+
+from flask import current_app
+from sqlalchemy import event, select, insert, delete, func, text
+from sqlalchemy.orm import attributes
+
+from app import db
+from app.models import KanbanTicket, KanbanEvent, Project
+from app.utils.serializers import serialize
+
+# Sent instead of events a stream can no longer get: the client should
+# re-fetch the board
+RESET_MESSAGE = 'event: reset\ndata: {}\n\n'
+RETRY_MS = 3000
+# PostgreSQL advisory lock serializing event writers (see store_events)
+EVENT_LOCK_KEY = 0x6b616e62616e
+
+
+def event_row(session, name, ticket, **changes):
+    """A KanbanEvent row for `ticket` as it is now, plus `changes`"""
+    data = dict(serialize(ticket), **changes)
+    if data['project_title'] is None and ticket.project_id is not None:
+        # A ticket inserted in this flush does not lazy load its project;
+        # it is normally in the identity map already
+        project = session.get(Project, ticket.project_id)
+        data['project_title'] = project.title if project else None
+    return {'event': name, 'ticket_id': ticket.id, 'data': data}
+
+
+def _previous(history, default=None):
+    return history.deleted[0] if history.deleted else default
+
+
+@event.listens_for(db.session, 'after_flush')
+def _record_ticket_events(session, flush_context):
+    """Store an event for every ticket created, moved or retagged
+
+    The rows are written in the flushing transaction, so they are committed
+    or rolled back with the change itself. Tickets written with Core or bulk
+    operations (e.g. the bulk import) produce no events.
+    """
+    rows = []
+    for ticket in session.new:
+        if isinstance(ticket, KanbanTicket):
+            rows.append(event_row(session, 'ticket.created', ticket))
+    for ticket in session.dirty:
+        if not isinstance(ticket, KanbanTicket):
+            continue
+        status = attributes.get_history(ticket, 'status')
+        if status.has_changes():
+            rows.append(event_row(session, 'ticket.moved', ticket, previous_status=_previous(status)))
+        tags = attributes.get_history(ticket, 'tags')
+        if tags.has_changes():
+            old, new = _previous(tags) or [], ticket.tags or []
+            rows.append(event_row(
+                session, 'ticket.retagged', ticket,
+                added_tags=[tag for tag in new if tag not in old],
+                removed_tags=[tag for tag in old if tag not in new]
+            ))
+    store_events(session.connection(), rows)
+
+
+def store_events(connection, rows):
+    """Insert event rows and prune the buffer to KANBAN_EVENT_BUFFER
+
+    Called for ORM flushes by the listener above; code that changes tickets
+    with Core or bulk statements must call it on the same connection.
+
+    Readers follow the feed with `id > last_id`, which needs ids to become
+    visible in order. SQLite has a single writer, so they do; on PostgreSQL
+    a transaction-level advisory lock makes concurrent writers take their
+    ids and commit one after the other, otherwise an id could commit after
+    a reader had already moved past it.
+    """
+    if not rows:
+        return
+    if connection.dialect.name == 'postgresql':
+        connection.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': EVENT_LOCK_KEY})
+    connection.execute(insert(KanbanEvent), rows)
+    newest = connection.scalar(select(func.max(KanbanEvent.id)))
+    connection.execute(
+        delete(KanbanEvent).where(KanbanEvent.id <= newest - current_app.config.get('KANBAN_EVENT_BUFFER', 1000))
+    )
+
+
+def event_message(row):
+    """A KanbanEvent as a Server-Sent Events message"""
+    data = json.dumps(dict(row.data, event_id=row.id), separators=(',', ':'))
+    return f'id: {row.id}\nevent: {row.event}\ndata: {data}\n\n'
+
+
+def events_after(last_id, limit):
+    """(messages, complete) for the stored events after `last_id`
+
+    `complete` is False when events after `last_id` were already pruned
+    from the buffer, so the client has missed some.
+    """
+    oldest = db.session.scalar(select(func.min(KanbanEvent.id)))
+    rows = db.session.scalars(
+        select(KanbanEvent).where(KanbanEvent.id > last_id).order_by(KanbanEvent.id).limit(limit)
+    ).all()
+    return [(row.id, event_message(row)) for row in rows], oldest is None or last_id >= oldest - 1
+
+
+class KanbanFeed:
+    """Fans stored ticket events out to every stream of this process
+
+    A background thread polls the event table every
+    KANBAN_STREAM_POLL_SECONDS for rows written by any worker, and keeps
+    the newest KANBAN_EVENT_BUFFER of them as rendered messages. Streams
+    only wait on a condition, so an idle subscriber costs no query and no
+    polling; with an async worker class (gevent, eventlet) it costs no
+    thread either. The thread runs while any stream is subscribed and
+    stops after the last one leaves.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._events = deque()
+        self._thread = None
+        self._subscribers = 0
+        # Id of the newest event a stream can no longer be given
+        self._floor = 0
+        self.last_id = 0
+
+    def subscribe(self, app):
+        """Count a new stream, starting the poller if it is the first"""
+        with self._condition:
+            self._subscribers += 1
+            if self._thread is not None:
+                return
+            with app.app_context():
+                self.last_id = self._floor = db.session.scalar(select(func.max(KanbanEvent.id))) or 0
+                db.session.remove()
+            self._events = deque()
+            self._maxlen = app.config.get('KANBAN_EVENT_BUFFER', 1000)
+            self._thread = threading.Thread(target=self._poll, args=(app,), name='kanban-feed', daemon=True)
+            self._thread.start()
+
+    def unsubscribe(self):
+        with self._condition:
+            self._subscribers -= 1
+
+    def _poll(self, app):
+        interval = app.config.get('KANBAN_STREAM_POLL_SECONDS', 0.5)
+        while True:
+            time.sleep(interval)
+            with self._condition:
+                if not self._subscribers:
+                    # The next subscriber starts a new thread
+                    self._thread = None
+                    return
+            try:
+                with app.app_context():
+                    rows = db.session.scalars(
+                        select(KanbanEvent).where(KanbanEvent.id > self.last_id).order_by(KanbanEvent.id)
+                    ).all()
+                    events = [(row.id, event_message(row)) for row in rows]
+                    db.session.remove()
+            except Exception:
+                app.logger.exception('kanban feed poll failed')
+                continue
+            if events:
+                self._publish(events)
+
+    def _publish(self, events):
+        with self._condition:
+            for event_id, message in events:
+                if len(self._events) >= self._maxlen:
+                    self._floor = self._events.popleft()[0]
+                self._events.append((event_id, message))
+            self.last_id = events[-1][0]
+            self._condition.notify_all()
+
+    def wait(self, after_id, timeout):
+        """Events after `after_id`, waiting up to `timeout` seconds for one
+
+        Returns [] on timeout, or None when events after `after_id` have
+        already left the buffer.
+        """
+        with self._condition:
+            if self.last_id <= after_id:
+                self._condition.wait(timeout)
+            if after_id < self._floor:
+                return None
+            newer = []
+            for event_id, message in reversed(self._events):
+                if event_id <= after_id:
+                    break
+                newer.append((event_id, message))
+            newer.reverse()
+            return newer
+
+
+kanban_feed = KanbanFeed()
+
+
+def stream_events(replay, after_id, heartbeat):
+    """The SSE body: `replay` messages, then live events after `after_id`
+
+    Runs without an app context or database connection, so an open stream
+    holds no pooled connection. A comment line is sent every `heartbeat`
+    seconds without events to keep proxies from closing the connection.
+    """
+    yield f'retry: {RETRY_MS}\n\n'
+    for message in replay:
+        yield message
+    while True:
+        events = kanban_feed.wait(after_id, heartbeat)
+        if events is None:
+            yield RESET_MESSAGE
+            after_id = kanban_feed.last_id
+        elif not events:
+            yield ': keepalive\n\n'
+        else:
+            for event_id, message in events:
+                yield message
+            after_id = events[-1][0]
@@ -0,0 +1,196 @@
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, select, insert, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import attributes
+
+from app import db
+from app.models import KanbanTicket, KanbanStatusChange, KanbanDwellStat, KanbanThroughput, Project, Client
+from app.utils.kanban_board import KANBAN_STATUSES
+
+# Dwell times are counted in buckets growing by DWELL_BUCKET_RATIO from
+# DWELL_BUCKET_BASE seconds (bucket 0 is anything shorter), so percentiles
+# read from the histogram are within about 12% of the exact value
+DWELL_BUCKET_BASE = 60
+DWELL_BUCKET_RATIO = 1.25
+PENDING_KEY = 'kanban_status_changes'
+
+
+def dwell_bucket(seconds):
+    if seconds < DWELL_BUCKET_BASE:
+        return 0
+    return int(math.log(seconds / DWELL_BUCKET_BASE, DWELL_BUCKET_RATIO)) + 1
+
+
+def _bucket_seconds(bucket):
+    # Geometric middle of the bucket's bounds
+    if bucket == 0:
+        return DWELL_BUCKET_BASE / 2
+    return DWELL_BUCKET_BASE * DWELL_BUCKET_RATIO ** (bucket - 0.5)
+
+
+def _add_counts(connection, model, keys, rows):
+    """INSERT rows, adding their non-key columns to those of existing rows"""
+    if not rows:
+        return
+    table = model.__table__
+    dialect = postgresql if connection.dialect.name == 'postgresql' else sqlite
+    statement = dialect.insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={name: table.c[name] + statement.excluded[name] for name in rows[0] if name not in keys}
+    )
+    connection.execute(statement, rows)
+
+
+def record_status_changes(connection, changes):
+    """Log status changes and add them to the dwell and throughput aggregates
+
+    `changes` are dicts of ticket_id, project_id, from_status (None for a
+    new ticket), to_status, entered_at (when from_status was entered) and
+    changed_at. Called for ORM flushes by the listeners below; code that
+    creates or moves tickets with Core or bulk statements must call it on
+    the same connection.
+    """
+    if not changes:
+        return
+    analysts = dict(connection.execute(
+        select(Project.id, Client.analyst_name)
+        .join(Client, Project.client_id == Client.id)
+        .where(Project.id.in_({change['project_id'] for change in changes}))
+    ).all())
+
+    rows = []
+    dwell = defaultdict(lambda: {'count': 0, 'total_seconds': 0.0})
+    throughput = defaultdict(lambda: {'entered': 0, 'exited': 0})
+    for change in changes:
+        analyst = analysts.get(change['project_id']) or ''
+        changed_at, entered_at = change['changed_at'], change['entered_at']
+        seconds = None
+        if change['from_status'] is not None:
+            throughput[changed_at.date(), change['from_status'], analyst]['exited'] += 1
+            if entered_at is not None:
+                seconds = max((changed_at - entered_at).total_seconds(), 0.0)
+                stat = dwell[change['from_status'], analyst, dwell_bucket(seconds)]
+                stat['count'] += 1
+                stat['total_seconds'] += seconds
+        throughput[changed_at.date(), change['to_status'], analyst]['entered'] += 1
+        rows.append({
+            'ticket_id': change['ticket_id'],
+            'from_status': change['from_status'],
+            'to_status': change['to_status'],
+            'analyst_name': analyst,
+            'entered_at': entered_at,
+            'changed_at': changed_at,
+            'dwell_seconds': seconds
+        })
+
+    connection.execute(insert(KanbanStatusChange), rows)
+    _add_counts(connection, KanbanDwellStat, ['status', 'analyst_name', 'bucket'], [
+        {'status': status, 'analyst_name': analyst, 'bucket': bucket, **stat}
+        for (status, analyst, bucket), stat in dwell.items()
+    ])
+    _add_counts(connection, KanbanThroughput, ['day', 'status', 'analyst_name'], [
+        {'day': day, 'status': status, 'analyst_name': analyst, **counts}
+        for (day, status, analyst), counts in throughput.items()
+    ])
+
+
+@event.listens_for(db.session, 'before_flush')
+def _stamp_status_changes(session, flush_context, instances):
+    """Move status_changed_at of every moved ticket, remembering the old one"""
+    now = datetime.utcnow()
+    pending = session.info[PENDING_KEY] = []
+    for ticket in session.new:
+        if isinstance(ticket, KanbanTicket):
+            pending.append((ticket, None, None))
+    for ticket in session.dirty:
+        if not isinstance(ticket, KanbanTicket):
+            continue
+        history = attributes.get_history(ticket, 'status')
+        previous = history.deleted[0] if history.deleted else None
+        if history.has_changes() and previous != ticket.status:
+            pending.append((ticket, previous, ticket.status_changed_at))
+            ticket.status_changed_at = now
+
+
+@event.listens_for(db.session, 'after_flush')
+def _record_flushed_status_changes(session, flush_context):
+    # Written in the flushing transaction, with the change itself
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending:
+        return
+    record_status_changes(session.connection(), [
+        {
+            'ticket_id': ticket.id,
+            'project_id': ticket.project_id,
+            'from_status': from_status,
+            'to_status': ticket.status,
+            'entered_at': entered_at,
+            'changed_at': ticket.status_changed_at
+        }
+        for ticket, from_status, entered_at in pending
+    ])
+
+
+def _summary(histogram):
+    count = sum(stat[0] for stat in histogram.values())
+    total = sum(stat[1] for stat in histogram.values())
+    summary = {'count': count, 'mean_seconds': total / count if count else None}
+    for name, fraction in (('p50_seconds', 0.5), ('p90_seconds', 0.9)):
+        rank, seen, summary[name] = max(math.ceil(fraction * count), 1), 0, None
+        for bucket in sorted(histogram):
+            seen += histogram[bucket][0]
+            if count and seen >= rank:
+                summary[name] = _bucket_seconds(bucket)
+                break
+    return summary
+
+
+def _by_status(histograms):
+    known = [status for status in KANBAN_STATUSES if status in histograms]
+    return [dict(status=status, **_summary(histograms[status])) for status in known + sorted(set(histograms) - set(known))]
+
+
+def dwell_metrics(analyst_name=None):
+    """Time-in-stage count, mean, p50 and p90 per status, overall and per analyst
+
+    Read from the incrementally kept histogram, which has at most one row
+    per status, analyst and bucket however long the history grows.
+    """
+    query = select(KanbanDwellStat.status, KanbanDwellStat.analyst_name, KanbanDwellStat.bucket,
+                   KanbanDwellStat.count, KanbanDwellStat.total_seconds)
+    if analyst_name is not None:
+        query = query.where(KanbanDwellStat.analyst_name == analyst_name)
+
+    overall = defaultdict(lambda: defaultdict(lambda: [0, 0.0]))
+    analysts = defaultdict(lambda: defaultdict(lambda: defaultdict(lambda: [0, 0.0])))
+    for status, analyst, bucket, count, total in db.session.execute(query):
+        for stat in (overall[status][bucket], analysts[analyst][status][bucket]):
+            stat[0] += count
+            stat[1] += total
+    return {
+        'statuses': _by_status(overall),
+        'analysts': [
+            {'analyst_name': analyst, 'statuses': _by_status(analysts[analyst])} for analyst in sorted(analysts)
+        ]
+    }
+
+
+def throughput_metrics(days, analyst_name=None):
+    """Tickets that entered and left each status over the last `days` days"""
+    query = (
+        select(KanbanThroughput.status, func.sum(KanbanThroughput.entered), func.sum(KanbanThroughput.exited))
+        .where(KanbanThroughput.day > datetime.utcnow().date() - timedelta(days=days))
+        .group_by(KanbanThroughput.status)
+    )
+    if analyst_name is not None:
+        query = query.where(KanbanThroughput.analyst_name == analyst_name)
+    counts = {status: (entered, exited) for status, entered, exited in db.session.execute(query)}
+    known = [status for status in KANBAN_STATUSES if status in counts]
+    return [
+        {'status': status, 'entered': counts[status][0], 'exited': counts[status][1]}
+        for status in known + sorted(set(counts) - set(known))
+    ]
@@ -0,0 +1,133 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import and_, or_
+
+from app import db
+
+
+def encode_cursor(sort, value, row_id, direction):
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({'s': sort, 'v': value, 'id': row_id, 'd': direction}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, sort, column):
+    """(value, id, direction) from a cursor issued for the same sort"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        value, row_id, direction = payload['v'], payload['id'], payload['d']
+        if payload['s'] != sort or direction not in ('next', 'prev') or not isinstance(row_id, int):
+            raise ValueError
+        if value is not None and isinstance(column.type, db.DateTime):
+            value = datetime.fromisoformat(value)
+    except (ValueError, TypeError, KeyError, binascii.Error, UnicodeError):
+        raise ValueError('Invalid cursor')
+    return value, row_id, direction
+
+
+def parse_datetime(name, value):
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an ISO date or datetime')
+
+
+def parse_int(name, value):
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer')
+
+
+def filter_created(query, column, args):
+    """Apply created_from (inclusive) and created_to (exclusive) from args"""
+    if args.get('created_from'):
+        query = query.filter(column >= parse_datetime('created_from', args['created_from']))
+    if args.get('created_to'):
+        query = query.filter(column < parse_datetime('created_to', args['created_to']))
+    return query
+
+
+def _after(column, id_column, value, row_id, ascending):
+    """Rows strictly after (value, row_id) in the page order
+
+    NULLs sort first ascending and last descending, as the order_by below
+    asks for explicitly. The redundant range term lets the sort column's
+    index seek straight to the cursor instead of scanning from the start.
+    """
+    if ascending:
+        if value is None:
+            return or_(column.is_not(None), and_(column.is_(None), id_column > row_id))
+        return and_(column >= value, or_(column > value, id_column > row_id))
+    if value is None:
+        return and_(column.is_(None), id_column < row_id)
+    return or_(and_(column <= value, or_(column < value, id_column < row_id)), column.is_(None))
+
+
+def _order(column, id_column, ascending):
+    if column is id_column:
+        return [id_column.asc() if ascending else id_column.desc()]
+    if ascending:
+        return [column.asc().nulls_first(), id_column.asc()]
+    return [column.desc().nulls_last(), id_column.desc()]
+
+
+def paginate(query, model, args, sortable):
+    """One keyset page of `query` driven by request args
+
+    `sort` is one of `sortable` (prefix with - for descending, default -id),
+    `limit` the page size and `cursor` a next/prev cursor from an earlier
+    page. Every page is a seek on (sort column, id), so deep pages cost the
+    same as the first. Returns a dict with the page's model instances under
+    "items" plus next_cursor / prev_cursor (None at either end).
+    Raises ValueError for invalid arguments.
+    """
+    default_limit = current_app.config['PAGE_SIZE']
+    max_limit = current_app.config['MAX_PAGE_SIZE']
+    try:
+        limit = int(args.get('limit', default_limit))
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if not 1 <= limit <= max_limit:
+        raise ValueError(f'limit must be between 1 and {max_limit}')
+
+    sort = args.get('sort', '-id')
+    ascending = not sort.startswith('-')
+    sort_name = sort.lstrip('-')
+    if sort_name not in sortable:
+        raise ValueError(f'sort must be one of {sorted(sortable)}, optionally prefixed with -')
+    column = getattr(model, sort_name)
+    id_column = model.id
+
+    cursor = args.get('cursor')
+    direction = 'next'
+    if cursor:
+        value, row_id, direction = decode_cursor(cursor, sort, column)
+        # A prev page walks backwards from the cursor in the opposite order
+        query = query.filter(_after(column, id_column, value, row_id, ascending == (direction == 'next')))
+
+    walk_ascending = ascending == (direction == 'next')
+    rows = query.order_by(*_order(column, id_column, walk_ascending)).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == 'prev':
+        rows.reverse()
+
+    def cursor_for(row, cursor_direction):
+        return encode_cursor(sort, getattr(row, sort_name), row.id, cursor_direction)
+
+    more_after = has_more if direction == 'next' else bool(cursor)
+    more_before = bool(cursor) if direction == 'next' else has_more
+    return {
+        'items': rows,
+        'limit': limit,
+        'sort': sort,
+        'next_cursor': cursor_for(rows[-1], 'next') if rows and more_after else None,
+        'prev_cursor': cursor_for(rows[0], 'prev') if rows and more_before else None,
+    }
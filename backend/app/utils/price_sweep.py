@@ -0,0 +1,293 @@
+import copy
+import math
+
+import numpy as np
+
+from app.utils.batch_pricing import (
+    INTEGRATION_TYPES, BRANDING_OPTIONS, SUPPORT_PLANS, NUMBER_TYPES, _as_float,
+    widgets_price, database_tier_price, integrations_price, features_price,
+    branding_price, support_price, hosting_price
+)
+from app.utils.rate_card import DEFAULT_RATE_CARD
+
+QUOTE_INPUTS = [
+    'num_dashboards', 'num_widgets', 'file_counts', 'database_sources', 'integrations',
+    'features', 'branding', 'support_plan', 'support_hours', 'hosting_details'
+]
+SCALAR_INPUTS = ['num_dashboards', 'num_widgets', 'support_plan', 'support_hours']
+COMPONENTS = [
+    'base_price', 'widgets_price', 'data_sources_price', 'integrations_price', 'features_price',
+    'branding_price', 'support_price', 'hosting_price', 'total_price'
+]
+
+
+class Varying:
+    """A quote input that takes many values at once
+
+    `values` is an array that broadcasts against every other Varying input
+    of the same payload, e.g. one axis of a sweep grid or a column of
+    Monte Carlo samples.
+    """
+
+    def __init__(self, values):
+        self.values = values
+
+
+def _float(value):
+    # numpy cannot hold Python ints wider than 64 bits; generate_quote falls
+    # back to its basic quote once such a price no longer fits a float
+    try:
+        return float(value)
+    except OverflowError:
+        raise ValueError('Quote inputs must be below 1e308')
+
+
+def _number(value, default=0):
+    if isinstance(value, Varying):
+        return value.values
+    return _float(value) if isinstance(value, NUMBER_TYPES) else default
+
+
+def _plan_code(plan):
+    return next((code for name, code in SUPPORT_PLANS.items() if plan == name), 0)
+
+
+def _flag(value):
+    if isinstance(value, Varying):
+        return value.values.astype(bool)
+    return bool(value)
+
+
+def price_components(data, rates=DEFAULT_RATE_CARD):
+    """Price one quote payload whose inputs may be Varying
+
+    Follows the validation rules of generate_quote, with every component
+    evaluated by broadcasting, and returns a dict of arrays (or scalars for
+    components no Varying input reaches).
+    Raises ValueError where generate_quote would fall back to a basic quote,
+    and for inputs too large to convert to a float.
+    """
+    num_dashboards = data.get('num_dashboards', 1)
+    num_widgets = data.get('num_widgets', 0)
+    if isinstance(num_dashboards, Varying):
+        num_dashboards = np.where(num_dashboards.values < 1, 1, num_dashboards.values)
+    elif not isinstance(num_dashboards, NUMBER_TYPES) or num_dashboards < 1:
+        num_dashboards = 1
+    else:
+        num_dashboards = _float(num_dashboards)
+    if isinstance(num_widgets, Varying):
+        num_widgets = np.where(num_widgets.values < 0, 0, num_widgets.values)
+    elif not isinstance(num_widgets, NUMBER_TYPES) or num_widgets < 0:
+        num_widgets = 0
+    else:
+        num_widgets = _float(num_widgets)
+
+    file_price = 0
+    file_counts = data.get('file_counts', {})
+    if file_counts and isinstance(file_counts, dict):
+        for count in file_counts.values():
+            if isinstance(count, (Varying,) + NUMBER_TYPES):
+                file_price = file_price + _number(count) * rates.file_source
+
+    database_price = 0
+    db_entries = data.get('database_sources', [])
+    if db_entries and isinstance(db_entries, list):
+        for db in db_entries:
+            if not isinstance(db, dict):
+                continue
+            tables = db.get('tables', [])
+            try:
+                iter(tables)
+            except TypeError:
+                raise ValueError('database_sources tables must be a list')
+            for table in tables:
+                if not isinstance(table, dict):
+                    continue
+                records = table.get('records', 0)
+                if isinstance(records, Varying):
+                    database_price = database_price + database_tier_price(records.values, rates)
+                elif isinstance(records, NUMBER_TYPES):
+                    database_price = database_price + database_tier_price(_as_float(records), rates)
+
+    counts = []
+    integrations = data.get('integrations', {})
+    if integrations and isinstance(integrations, dict):
+        counts = [_number(integrations.get(t, 0)) for t in INTEGRATION_TYPES]
+
+    features = data.get('features', {})
+    drilldowns = features.get('drilldowns', 0) if features and isinstance(features, dict) else 0
+
+    branding = data.get('branding', {})
+    has_branding = bool(branding) and isinstance(branding, dict)
+    flags = [_flag(branding.get(name)) if has_branding else False for name, scale in BRANDING_OPTIONS]
+
+    support_plan = data.get('support_plan', 'Basic')
+    if isinstance(support_plan, Varying):
+        plan_codes = support_plan.values
+    else:
+        plan_codes = _plan_code(support_plan)
+
+    hosting = data.get('hosting_details', {})
+    has_hosting = bool(hosting) and isinstance(hosting, dict)
+    hosting_counts = [_number(hosting.get(key, 0)) if has_hosting else 0
+                      for key in ['widget_count', 'api_count', 'tables_count']]
+
+    with np.errstate(invalid='ignore', over='ignore', divide='ignore'):
+        parts = [
+            ('base_price', float(rates.base_price)),
+            ('widgets_price', widgets_price(num_widgets, rates)),
+            ('file_sources_price', file_price),
+            ('database_price', database_price),
+            ('integrations_price', integrations_price(counts, rates)),
+            ('features_price', features_price(_number(drilldowns), rates)),
+            ('branding_price', branding_price(has_branding, flags, num_widgets, num_dashboards, rates)),
+            ('support_price', support_price(np.asarray(plan_codes), _number(data.get('support_hours', 0)), rates)),
+            ('hosting_price', hosting_price(has_hosting, *hosting_counts, rates=rates)),
+        ]
+        # Same summation order as generate_quote so float results match
+        total = 0
+        for name, value in parts:
+            total = total + value
+        components = dict(parts)
+        components['data_sources_price'] = components.pop('file_sources_price') + components.pop('database_price')
+        components['total_price'] = total
+    return components
+
+
+def _axis_range(name, spec):
+    """(start, step, number of points) of a {"start", "stop", "step"} axis"""
+    try:
+        start, stop, step = spec['start'], spec['stop'], spec.get('step', 1)
+    except KeyError:
+        raise ValueError(f'Axis {name} needs start and stop')
+    if not all(isinstance(v, NUMBER_TYPES) and not isinstance(v, bool) for v in (start, stop, step)):
+        raise ValueError(f'Axis {name} start, stop and step must be numbers')
+    try:
+        start, stop, step = float(start), float(stop), float(step)
+    except OverflowError:
+        raise ValueError(f'Axis {name} start, stop and step must be below 1e308')
+    if not all(math.isfinite(v) for v in (start, stop, step)):
+        raise ValueError(f'Axis {name} start, stop and step must be finite')
+    if step <= 0:
+        raise ValueError(f'Axis {name} step must be positive')
+    span = (stop - start) / step
+    if not math.isfinite(span):
+        raise ValueError(f'Axis {name} has too many points')
+    # Stop is inclusive; the tolerance keeps it when float steps fall just short
+    return start, step, max(math.floor(span + 1e-9) + 1, 0)
+
+
+def axis_length(name, spec):
+    """Number of values an axis spec expands to, computed without expanding it"""
+    if isinstance(spec, dict):
+        length = _axis_range(name, spec)[2]
+    elif isinstance(spec, list):
+        length = len(spec)
+    else:
+        raise ValueError(f'Axis {name} must be a list or a range')
+    if length == 0:
+        raise ValueError(f'Axis {name} is empty')
+    return length
+
+
+def axis_values(name, spec):
+    """Expand an axis spec: a list of values or {"start", "stop", "step"} (stop inclusive)
+
+    Check axis_length first: a range expands to as many points as it spans.
+    """
+    axis_length(name, spec)
+    if isinstance(spec, dict):
+        start, step, length = _axis_range(name, spec)
+        values = start + np.arange(length) * step
+    else:
+        values = spec
+
+    if name == 'support_plan':
+        return list(values), np.array([_plan_code(v) for v in values])
+    if name.startswith('branding.'):
+        return [bool(v) for v in values], np.array([bool(v) for v in values])
+    if isinstance(values, np.ndarray):
+        return values.tolist(), values.astype(np.float64)
+    if not all(isinstance(v, NUMBER_TYPES) and not isinstance(v, bool) for v in values):
+        raise ValueError(f'Axis {name} values must be numbers')
+    return list(values), np.array([_float(v) for v in values], dtype=np.float64)
+
+
+def set_path(data, path, value):
+    """Set a dotted path such as database_sources.0.tables.1.records"""
+    keys = path.split('.')
+    if keys[0] not in QUOTE_INPUTS:
+        raise ValueError(f'Unknown quote input: {keys[0]}')
+    if len(keys) == 1 and keys[0] not in SCALAR_INPUTS:
+        raise ValueError(f'{path} is not a single value, sweep a field inside it')
+
+    node = data
+    for key, next_key in zip(keys, keys[1:] + [None]):
+        if isinstance(node, list):
+            try:
+                index = int(key)
+                node[index]
+            except (ValueError, IndexError):
+                raise ValueError(f'No list entry {key} in {path}')
+            key = index
+        elif not isinstance(node, dict):
+            raise ValueError(f'Cannot set {path}')
+        if next_key is None:
+            node[key] = value
+        else:
+            if isinstance(node, dict) and not isinstance(node.get(key), (dict, list)):
+                node[key] = {}
+            node = node[key]
+
+
+def sweep_quote(base, axes, rates=DEFAULT_RATE_CARD, max_points=1000000, components=None, expand=False):
+    """Price the Cartesian product of `axes` over the `base` payload
+
+    `axes` maps input paths to specs, or is a list of {"name": path, ...spec}
+    when the order of dimensions matters to the caller. Each axis becomes one
+    dimension of the grid, in the order given. Returns the expanded axes as
+    (name, values) pairs, the grid shape and one array per price component.
+    Components keep their own broadcastable shape (size 1 along axes they do
+    not depend on) unless `expand` is set; total_price is always the full grid.
+    """
+    if isinstance(axes, list):
+        try:
+            axes = [(axis['name'], axis.get('values', axis)) for axis in axes]
+        except (TypeError, KeyError):
+            raise ValueError('Each axis needs a name')
+    elif isinstance(axes, dict):
+        axes = list(axes.items())
+    if not axes:
+        raise ValueError('axes must be a non-empty object or list')
+    names = [name for name, spec in axes]
+    if len(set(names)) != len(names):
+        raise ValueError('Each input can only be swept once')
+    components = components or COMPONENTS
+    unknown = [c for c in components if c not in COMPONENTS]
+    if unknown:
+        raise ValueError(f'Unknown components: {unknown}')
+
+    # Sized before anything is allocated, so a huge range is rejected cheaply
+    shape = [axis_length(name, spec) for name, spec in axes]
+    if math.prod(shape) > max_points:
+        raise ValueError(f'Sweep of {math.prod(shape)} points exceeds the limit of {max_points}')
+
+    data = copy.deepcopy(base)
+    expanded = []
+    for position, (name, spec) in enumerate(axes):
+        labels, values = axis_values(name, spec)
+        grid_shape = [1] * len(axes)
+        grid_shape[position] = len(values)
+        set_path(data, name, Varying(values.reshape(grid_shape)))
+        expanded.append((name, labels))
+
+    prices = price_components(data, rates)
+    grids = {}
+    for name in components:
+        grid = np.asarray(prices[name], dtype=np.float64)
+        if expand or name == 'total_price':
+            grid = np.broadcast_to(grid, shape)
+        else:
+            grid = grid.reshape(grid.shape if grid.ndim else [1] * len(shape))
+        grids[name] = grid
+    return {'axes': expanded, 'shape': shape, 'components': grids}
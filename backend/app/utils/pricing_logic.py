@@ -1,16 +1,44 @@
-def calculate_widgets_price(num_widgets):
+from app.utils.rate_card import DEFAULT_RATE_CARD
+
+# Quote inputs supplied per request; plan and currency come from the project
+QUOTE_INPUT_KEYS = [
+    'num_dashboards', 'num_widgets', 'file_counts', 'database_sources', 'integrations',
+    'features', 'branding', 'support_hours', 'hosting_details'
+]
+
+def quote_inputs(data):
+    """The request pricing details worth keeping to reprice a quote later"""
+    return {key: data[key] for key in QUOTE_INPUT_KEYS if key in data}
+
+def build_quote_data(data, support_plan, currency):
+    """Merge request pricing details with the project's plan and currency"""
+    return {
+        'num_dashboards': data.get('num_dashboards', 1),
+        'num_widgets': data.get('num_widgets', 0),
+        'file_counts': data.get('file_counts', {}),
+        'database_sources': data.get('database_sources', []),
+        'integrations': data.get('integrations', {}),
+        'features': data.get('features', {}),
+        'branding': data.get('branding', {}),
+        'support_plan': support_plan or 'Basic',
+        'support_hours': data.get('support_hours', 0),
+        'hosting_details': data.get('hosting_details', {}),
+        'currency': currency
+    }
+
+def calculate_widgets_price(num_widgets, rates=DEFAULT_RATE_CARD):
     """Calculate price based on number of widgets"""
-    return num_widgets * 20
+    return num_widgets * rates.widget
 
-def calculate_file_source_price(file_counts):
+def calculate_file_source_price(file_counts, rates=DEFAULT_RATE_CARD):
     """Calculate price for file data sources
     file_counts is a dict like {'csv': 2, 'excel': 1, ...}
     """
     if not file_counts or not isinstance(file_counts, dict):
         return 0
-    return sum(count * 40 for count in file_counts.values() if isinstance(count, (int, float)))
+    return sum(count * rates.file_source for count in file_counts.values() if isinstance(count, (int, float)))
 
-def calculate_database_price(db_entries):
+def calculate_database_price(db_entries, rates=DEFAULT_RATE_CARD):
     """Calculate price for database sources
     db_entries is a list of dicts: [{'type': 'mysql', 'tables': [{'records': 5000}, ...]}, ...]
     """
@@ -28,19 +56,10 @@ def calculate_database_price(db_entries):
             if not isinstance(records, (int, float)):
                 continue
             
-            if records < 1000:
-                total += 40
-            elif 1000 <= records < 10000:
-                total += 100
-            elif 10000 <= records < 100000:
-                total += 200
-            elif 100000 <= records < 1000000:
-                total += 300
-            else:
-                total += 700
+            total += rates.database_tier_price(records)
     return total
 
-def calculate_integrations_price(integrations):
+def calculate_integrations_price(integrations, rates=DEFAULT_RATE_CARD):
     """Calculate price for integrations
     integrations is a dict with api, cloud, software counts
     """
@@ -53,11 +72,11 @@ def calculate_integrations_price(integrations):
     for integration_type in integration_types:
         count = integrations.get(integration_type, 0)
         if isinstance(count, (int, float)):
-            total += count * 400
+            total += count * rates.integration
     
     return total
 
-def calculate_features_price(features):
+def calculate_features_price(features, rates=DEFAULT_RATE_CARD):
     """Calculate price for features
     features is a dict of feature counts
     """
@@ -67,12 +86,12 @@ def calculate_features_price(features):
     total = 0
     drilldowns = features.get('drilldowns', 0)
     if isinstance(drilldowns, (int, float)):
-        total += drilldowns * 20
+        total += drilldowns * rates.drilldown
     
     # Add more feature pricing as needed
     return total
 
-def calculate_branding_price(branding, num_widgets, num_dashboards):
+def calculate_branding_price(branding, num_widgets, num_dashboards, rates=DEFAULT_RATE_CARD):
     """Calculate price for branding options
     branding is a dict of branding options
     """
@@ -88,59 +107,59 @@ def calculate_branding_price(branding, num_widgets, num_dashboards):
         num_dashboards = 0
     
     if branding.get('logo'):
-        total += 40
+        total += rates.branding_logo
     if branding.get('widget_color'):
-        total += num_widgets * 20
+        total += num_widgets * rates.branding_per_widget
     if branding.get('dashboard_color'):
-        total += num_dashboards * 20
+        total += num_dashboards * rates.branding_per_dashboard
     if branding.get('widget_font'):
-        total += num_widgets * 20
+        total += num_widgets * rates.branding_per_widget
     if branding.get('dashboard_style'):
-        total += num_dashboards * 20
+        total += num_dashboards * rates.branding_per_dashboard
     if branding.get('localization'):
-        total += num_widgets * 20
+        total += num_widgets * rates.branding_per_widget
     if branding.get('dashboard_localization'):
-        total += num_dashboards * 20
+        total += num_dashboards * rates.branding_per_dashboard
     
     return total
 
-def calculate_support_price(support_plan, hours=0):
+def calculate_support_price(support_plan, hours=0, rates=DEFAULT_RATE_CARD):
     """Calculate support pricing based on plan and hours"""
     if not isinstance(hours, (int, float)):
         hours = 0
     
     if support_plan == 'Priority':
-        return hours * 40
+        return hours * rates.support_priority_hourly
     elif support_plan == 'Dedicated Account Manager':
-        return 400  # Default to 20 hours/month * 20$/hour
+        return rates.support_dedicated_flat  # Default to 20 hours/month * 20$/hour
     return 0
 
-def calculate_hosting_price(hosting_details):
+def calculate_hosting_price(hosting_details, rates=DEFAULT_RATE_CARD):
     """Calculate hosting price
     hosting_details contains widget_count, api_count, tables_count
     """
     if not hosting_details or not isinstance(hosting_details, dict):
-        return 500 * 4  # Minimum hosting cost
+        return rates.hosting_deployment  # Minimum hosting cost
     
     total = 0
     
     widget_count = hosting_details.get('widget_count', 0)
     if isinstance(widget_count, (int, float)):
-        total += (widget_count // 10) * 1000
+        total += (widget_count // rates.hosting_block_size) * rates.hosting_widget_block
     
     api_count = hosting_details.get('api_count', 0)
     if isinstance(api_count, (int, float)):
-        total += (api_count // 10) * 1000
+        total += (api_count // rates.hosting_block_size) * rates.hosting_api_block
     
     tables_count = hosting_details.get('tables_count', 0)
     if isinstance(tables_count, (int, float)):
-        total += tables_count * 150
+        total += tables_count * rates.hosting_table
     
-    total += 500 * 4  # Frontend/backend deployment and testing
+    total += rates.hosting_deployment  # Frontend/backend deployment and testing
     return total
 
-def generate_quote(project_data):
-    """Generate complete quote from project data"""
+def generate_quote(project_data, rates=DEFAULT_RATE_CARD):
+    """Generate complete quote from project data, priced with `rates`"""
     if not isinstance(project_data, dict):
         project_data = {}
     
@@ -165,17 +184,17 @@ def generate_quote(project_data):
     
     # Calculate each component
     try:
-        widgets_price = calculate_widgets_price(num_widgets)
-        file_sources_price = calculate_file_source_price(file_counts)
-        database_price = calculate_database_price(db_entries)
-        integrations_price = calculate_integrations_price(integrations)
-        features_price = calculate_features_price(features)
-        branding_price = calculate_branding_price(branding, num_widgets, num_dashboards)
-        support_price = calculate_support_price(support_plan, support_hours)
-        hosting_price = calculate_hosting_price(hosting_details)
+        widgets_price = calculate_widgets_price(num_widgets, rates)
+        file_sources_price = calculate_file_source_price(file_counts, rates)
+        database_price = calculate_database_price(db_entries, rates)
+        integrations_price = calculate_integrations_price(integrations, rates)
+        features_price = calculate_features_price(features, rates)
+        branding_price = calculate_branding_price(branding, num_widgets, num_dashboards, rates)
+        support_price = calculate_support_price(support_plan, support_hours, rates)
+        hosting_price = calculate_hosting_price(hosting_details, rates)
         
         # Calculate totals
-        base_price = 1000  # Starting base price
+        base_price = rates.base_price  # Starting base price
         total_price = (base_price + widgets_price + file_sources_price + database_price +
                       integrations_price + features_price + branding_price + 
                       support_price + hosting_price)
@@ -190,20 +209,26 @@ def generate_quote(project_data):
             'support_price': float(support_price),
             'hosting_price': float(hosting_price),
             'total_price': float(total_price),
-            'currency': currency
+            'currency': currency,
+            'rate_card_version': rates.version
         }
     
     except Exception as e:
         # Return basic quote if calculation fails
-        return {
-            'base_price': 1000.0,
-            'widgets_price': 0.0,
-            'data_sources_price': 0.0,
-            'integrations_price': 0.0,
-            'features_price': 0.0,
-            'branding_price': 0.0,
-            'support_price': 0.0,
-            'hosting_price': 2000.0,
-            'total_price': 3000.0,
-            'currency': currency
-        }
\ No newline at end of file
+        return fallback_quote(currency, rates)
+
+def fallback_quote(currency, rates=DEFAULT_RATE_CARD):
+    """Basic quote used when a payload cannot be priced"""
+    return {
+        'base_price': float(rates.base_price),
+        'widgets_price': 0.0,
+        'data_sources_price': 0.0,
+        'integrations_price': 0.0,
+        'features_price': 0.0,
+        'branding_price': 0.0,
+        'support_price': 0.0,
+        'hosting_price': float(rates.hosting_deployment),
+        'total_price': float(rates.base_price + rates.hosting_deployment),
+        'currency': currency,
+        'rate_card_version': rates.version
+    }
@@ -0,0 +1,52 @@
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models import Project, Client, Quote, KanbanTicket, DemoBusinessAnalysis, Document
+from app.utils.conditional import query_validators
+from app.utils.serializers import serialize
+
+
+def load_full_projects(ids):
+    """{id: Project} with every related entity loaded, for the ids that exist
+
+    The client and the one-to-one children come back in the project query
+    itself; documents, which can be many, in one extra IN query for all the
+    projects. Two queries in total however many projects are loaded.
+    """
+    projects = Project.query.options(
+        joinedload(Project.client),
+        joinedload(Project.quote),
+        joinedload(Project.kanban_ticket),
+        joinedload(Project.demo_analysis),
+        selectinload(Project.documents)
+    ).filter(Project.id.in_(ids)).all()
+    return {project.id: project for project in projects}
+
+
+def full_project_validators(ids):
+    """Conditional GET validators covering the projects and everything in their payload"""
+    query = (
+        Project.query
+        .outerjoin(Client, Project.client_id == Client.id)
+        .outerjoin(Quote, Quote.project_id == Project.id)
+        .outerjoin(KanbanTicket, KanbanTicket.project_id == Project.id)
+        .outerjoin(DemoBusinessAnalysis, DemoBusinessAnalysis.project_id == Project.id)
+        .outerjoin(Document, Document.project_id == Project.id)
+        .filter(Project.id.in_(ids))
+    )
+    return query_validators(
+        query, Project.updated_at, Client.updated_at, Quote.updated_at, KanbanTicket.updated_at,
+        DemoBusinessAnalysis.updated_at, Document.updated_at
+    )
+
+
+def full_project_dict(project):
+    """The project with its client, quote, ticket, demo analysis and documents"""
+    return {
+        'project': serialize(project),
+        'client': serialize(project.client) if project.client else None,
+        'quote': serialize(project.quote) if project.quote else None,
+        # The ticket's project is the one loaded here: no lazy load for its title
+        'kanban_ticket': serialize(project.kanban_ticket) if project.kanban_ticket else None,
+        'demo_analysis': serialize(project.demo_analysis) if project.demo_analysis else None,
+        'documents': [serialize(document) for document in project.documents]
+    }
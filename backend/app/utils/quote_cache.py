@@ -0,0 +1,97 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from app.utils.pricing_logic import generate_quote
+
+
+class QuoteCache:
+    """Bounded LRU cache of generate_quote results with a per-entry TTL
+
+    Keys are a hash of the canonical JSON of the quote inputs plus the rate
+    card version, so publishing a new card never serves stale prices.
+    """
+
+    def __init__(self, maxsize=4096, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def init_app(self, app):
+        self.maxsize = app.config.get('QUOTE_CACHE_SIZE', self.maxsize)
+        self.ttl = app.config.get('QUOTE_CACHE_TTL', self.ttl)
+
+    @staticmethod
+    def make_key(quote_data, version):
+        canonical = json.dumps(quote_data, sort_keys=True, separators=(',', ':'), default=repr)
+        return hashlib.sha256(f'{version}:{canonical}'.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(value)
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, dict(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key=None):
+        """Drop one entry, or every entry when no key is given"""
+        with self._lock:
+            if key is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                removed = 1 if self._entries.pop(key, None) is not None else 0
+            return removed
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_ratio': self.hits / lookups if lookups else 0.0
+            }
+
+
+quote_cache = QuoteCache()
+
+
+def cached_generate_quote(quote_data, rates):
+    """generate_quote, memoized on the inputs and rate card version"""
+    key = quote_cache.make_key(quote_data, rates.version)
+    result = quote_cache.get(key)
+    if result is None:
+        result = generate_quote(quote_data, rates)
+        quote_cache.put(key, result)
+    return result
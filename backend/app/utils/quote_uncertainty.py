@@ -0,0 +1,139 @@
+import copy
+
+import numpy as np
+
+from app.utils.price_sweep import Varying, COMPONENTS, set_path, price_components, _plan_code, _float
+from app.utils.rate_card import DEFAULT_RATE_CARD
+
+PERCENTILES = [10, 50, 90]
+# Parameters each distribution needs, in the order numpy takes them
+DISTRIBUTIONS = {
+    'uniform': ['min', 'max'],
+    'triangular': ['min', 'mode', 'max'],
+    'normal': ['mean', 'std'],
+    'choice': [],
+}
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _choice(name, spec, size, rng):
+    values = spec.get('values')
+    if not isinstance(values, list) or not values:
+        raise ValueError(f'{name} choice needs a non-empty values list')
+
+    if name == 'support_plan':
+        options = np.array([_plan_code(v) for v in values])
+    elif name.startswith('branding.'):
+        options = np.array([bool(v) for v in values])
+    elif all(_is_number(v) for v in values):
+        options = np.array([_float(v) for v in values], dtype=np.float64)
+    else:
+        raise ValueError(f'{name} choice values must be numbers')
+
+    weights = spec.get('weights')
+    if weights is not None:
+        if (not isinstance(weights, list) or len(weights) != len(values)
+                or not all(_is_number(w) and w >= 0 for w in weights) or sum(weights) <= 0):
+            raise ValueError(f'{name} weights must be one non-negative number per value')
+        weights = np.array([_float(w) for w in weights], dtype=np.float64)
+        weights = weights / weights.sum()
+    return options[rng.choice(len(options), size=size, p=weights)]
+
+
+def sample_input(name, spec, size, rng):
+    """Draw `size` samples for the input at dotted path `name`
+
+    `spec` is {"distribution": "uniform", "min": .., "max": ..},
+    {"distribution": "triangular", "min": .., "mode": .., "max": ..},
+    {"distribution": "normal", "mean": .., "std": ..} or
+    {"distribution": "choice", "values": [..], "weights": [..]}.
+    Normal samples are clipped to "min" (default 0) and "max" when given,
+    and "integer": true rounds numeric samples to whole numbers.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError(f'Distribution for {name} must be an object')
+    kind = spec.get('distribution', 'uniform')
+    if kind not in DISTRIBUTIONS:
+        raise ValueError(f'Unknown distribution for {name}: {kind}')
+    if kind == 'choice':
+        return _choice(name, spec, size, rng)
+    if name == 'support_plan' or name.startswith('branding.'):
+        raise ValueError(f'{name} needs a choice distribution')
+
+    params = [spec.get(key) for key in DISTRIBUTIONS[kind]]
+    if not all(_is_number(p) for p in params):
+        raise ValueError(f'{name} {kind} distribution needs {", ".join(DISTRIBUTIONS[kind])}')
+    params = [_float(p) for p in params]
+
+    if kind == 'uniform':
+        low, high = params
+        if low > high:
+            raise ValueError(f'{name} min must not exceed max')
+        samples = rng.uniform(low, high, size)
+    elif kind == 'triangular':
+        low, mode, high = params
+        if not low <= mode <= high:
+            raise ValueError(f'{name} needs min <= mode <= max')
+        samples = rng.triangular(low, mode, high, size) if low < high else np.full(size, float(low))
+    else:
+        mean, std = params
+        if std < 0:
+            raise ValueError(f'{name} std must not be negative')
+        low, high = spec.get('min', 0), spec.get('max')
+        if not _is_number(low) or (high is not None and not _is_number(high)):
+            raise ValueError(f'{name} min and max must be numbers')
+        low, high = _float(low), None if high is None else _float(high)
+        samples = np.clip(rng.normal(mean, std, size), low, high)
+
+    if spec.get('integer'):
+        samples = np.rint(samples)
+    return samples
+
+
+def _summary(values, size, mean_total):
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 0:
+        # Not reached by any uncertain input, every sample prices the same
+        points = [float(values)] * len(PERCENTILES)
+        mean = float(values)
+    else:
+        points = np.percentile(np.broadcast_to(values, (size,)), PERCENTILES).tolist()
+        mean = float(values.mean())
+    summary = {f'p{p}': round(v, 2) for p, v in zip(PERCENTILES, points)}
+    summary['mean'] = round(mean, 2)
+    summary['share'] = round(mean / mean_total, 4) if mean_total else 0.0
+    return summary
+
+
+def simulate_quote(base, distributions, rates=DEFAULT_RATE_CARD, samples=20000, seed=None):
+    """Monte Carlo price bands for a quote whose inputs are uncertain
+
+    `distributions` maps dotted input paths (as in a sweep) to distribution
+    specs; every other input keeps its value from `base`. All samples are
+    priced in one vectorized pass. Returns P10/P50/P90 and mean of the total
+    and of each component, with each component's share of the mean total.
+    Raises ValueError for invalid specs or inputs generate_quote would not price.
+    """
+    if not isinstance(distributions, dict) or not distributions:
+        raise ValueError('distributions must be a non-empty object')
+
+    rng = np.random.default_rng(seed)
+    data = copy.deepcopy(base)
+    for name, spec in distributions.items():
+        set_path(data, name, Varying(sample_input(name, spec, samples, rng)))
+
+    prices = price_components(data, rates)
+    mean_total = float(np.mean(prices['total_price']))
+    components = {name: _summary(prices[name], samples, mean_total) for name in COMPONENTS}
+    total = components.pop('total_price')
+    del total['share']
+    return {
+        'samples': samples,
+        'seed': seed,
+        'inputs': list(distributions),
+        'total_price': total,
+        'components': components,
+    }
@@ -0,0 +1,140 @@
+import threading
+import time
+from bisect import bisect_right
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import func
+
+from app import db
+from app.models import RateCard
+
+# Version 0 is the card shipped in code, used until one is published
+DEFAULT_RATES = {
+    'base_price': 1000,
+    'widget': 20,
+    'file_source': 40,
+    'database_tier_bounds': [1000, 10000, 100000, 1000000],
+    'database_tier_prices': [40, 100, 200, 300, 700],
+    'integration': 400,
+    'drilldown': 20,
+    'branding_logo': 40,
+    'branding_per_widget': 20,
+    'branding_per_dashboard': 20,
+    'support_priority_hourly': 40,
+    'support_dedicated_flat': 400,
+    'hosting_block_size': 10,
+    'hosting_widget_block': 1000,
+    'hosting_api_block': 1000,
+    'hosting_table': 150,
+    'hosting_deployment': 2000,
+}
+
+
+class CompiledRateCard:
+    """A rate card flattened into attributes and sorted tier arrays
+
+    Instances are never mutated; publishing a new version swaps the whole
+    object, so a quote is always priced against a single consistent card.
+    """
+
+    __slots__ = tuple(DEFAULT_RATES) + ('version', 'rates', 'tier_bounds_array', 'tier_prices_array')
+
+    def __init__(self, rates, version):
+        for key, value in rates.items():
+            if key.startswith('database_tier_'):
+                value = tuple(value)
+            setattr(self, key, value)
+        self.version = version
+        self.rates = rates
+        self.tier_bounds_array = np.array(self.database_tier_bounds, dtype=np.float64)
+        self.tier_prices_array = np.array(self.database_tier_prices, dtype=np.float64)
+
+    def database_tier_price(self, records):
+        """Price of one table, tiers are [bound[i-1], bound[i])"""
+        return self.database_tier_prices[bisect_right(self.database_tier_bounds, records)]
+
+
+def compile_rate_card(rates, version):
+    """Validate a rates dict and compile it, raising ValueError if invalid"""
+    if not isinstance(rates, dict):
+        raise ValueError('rates must be an object')
+
+    unknown = sorted(set(rates) - set(DEFAULT_RATES))
+    if unknown:
+        raise ValueError(f'Unknown rates: {unknown}')
+    missing = sorted(set(DEFAULT_RATES) - set(rates))
+    if missing:
+        raise ValueError(f'Missing rates: {missing}')
+
+    for key, value in rates.items():
+        values = value if key.startswith('database_tier_') else [value]
+        if not isinstance(values, list) or not values:
+            raise ValueError(f'{key} must be a non-empty list')
+        for item in values:
+            if isinstance(item, bool) or not isinstance(item, (int, float)) or item < 0:
+                raise ValueError(f'{key} must be non-negative numbers')
+
+    bounds = rates['database_tier_bounds']
+    if any(upper <= lower for lower, upper in zip(bounds, bounds[1:])):
+        raise ValueError('database_tier_bounds must be strictly increasing')
+    if len(rates['database_tier_prices']) != len(bounds) + 1:
+        raise ValueError('database_tier_prices needs one more entry than database_tier_bounds')
+    if rates['hosting_block_size'] <= 0:
+        raise ValueError('hosting_block_size must be positive')
+
+    return CompiledRateCard(dict(rates), version)
+
+
+DEFAULT_RATE_CARD = compile_rate_card(DEFAULT_RATES, 0)
+
+_lock = threading.Lock()
+_active = DEFAULT_RATE_CARD
+_checked_at = None
+
+
+def activate_rate_card(card):
+    """Swap the process-wide card; readers see the old or new one, never a mix"""
+    global _active, _checked_at
+    with _lock:
+        _active = card
+        _checked_at = time.monotonic()
+
+
+def get_rate_card():
+    """The active compiled rate card for this process
+
+    The database is only asked for a newer version once every
+    RATE_CARD_REFRESH_SECONDS, so cards published by other workers are
+    picked up without a query per quote.
+    """
+    refresh = current_app.config.get('RATE_CARD_REFRESH_SECONDS', 30)
+    if _checked_at is not None and time.monotonic() - _checked_at < refresh:
+        return _active
+
+    latest_version = db.session.query(func.max(RateCard.version)).scalar()
+    if latest_version is not None and latest_version != _active.version:
+        latest = RateCard.query.filter_by(version=latest_version).first()
+        activate_rate_card(compile_rate_card(latest.rates, latest.version))
+    else:
+        activate_rate_card(_active)
+    return _active
+
+
+def publish_rate_card(rates, description=None):
+    """Store `rates` as the next version and make it active in this process
+    Keys missing from `rates` are carried over from the active card.
+    """
+    current = get_rate_card()
+    merged = dict(current.rates)
+    merged.update(rates)
+
+    latest_version = db.session.query(func.max(RateCard.version)).scalar() or 0
+    card = compile_rate_card(merged, latest_version + 1)
+
+    row = RateCard(version=card.version, rates=merged, description=description)
+    db.session.add(row)
+    db.session.commit()
+
+    activate_rate_card(card)
+    return row
@@ -0,0 +1,222 @@
+import threading
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import select, func, or_, update
+
+from app import db
+from app.models import Client, Project, Quote, RepricingJob
+from app.utils.batch_pricing import generate_quotes_batch
+from app.utils.pricing_logic import build_quote_data
+from app.utils.rate_card import get_rate_card
+from app.utils.serializers import serialize
+from app.utils.response_cache import response_cache
+
+ACTIVE_STATUSES = ['pending', 'running']
+
+# Worker threads started by this process, by job id
+_threads = {}
+# Held from checking for an active job until the new one is claimed
+_claim_lock = threading.Lock()
+
+
+def reprice_chunk(after_quote_id, chunk_size, rates):
+    """Reprice the next `chunk_size` quotes after `after_quote_id`
+
+    Only the columns pricing needs are read, so memory is bounded by the
+    chunk size however many quotes there are. Changes are left in the
+    session for the caller to commit. Returns (rows read, quotes repriced,
+    last quote id), with last quote id None once nothing is left.
+    """
+    rows = db.session.execute(
+        select(Quote.id, Quote.inputs, Project.support_plan, Client.id, Client.currency)
+        .join(Project, Quote.project_id == Project.id)
+        .outerjoin(Client, Project.client_id == Client.id)
+        .where(Quote.id > after_quote_id)
+        .order_by(Quote.id)
+        .limit(chunk_size)
+    ).all()
+    if not rows:
+        return 0, 0, None
+
+    # Quotes created before inputs were stored cannot be recomputed
+    priceable = [row for row in rows if row[1] is not None]
+    payloads = [
+        build_quote_data(inputs, support_plan, currency if client_id is not None else 'USD')
+        for quote_id, inputs, support_plan, client_id, currency in priceable
+    ]
+    results = generate_quotes_batch(payloads, rates)
+
+    now = datetime.utcnow()
+    updates = [
+        dict(result, id=row[0], updated_at=now)
+        for row, result in zip(priceable, results)
+    ]
+    if updates:
+        db.session.bulk_update_mappings(Quote, updates)
+        # Bulk mappings skip the flush events the response cache listens to
+        response_cache.invalidate(db.session, Quote, [update['id'] for update in updates])
+    return len(rows), len(updates), rows[-1][0]
+
+
+def run_repricing_job(app, job_id):
+    """Work through a job chunk by chunk until every quote is repriced
+
+    The job cursor is committed in the same transaction as each chunk's
+    updates, so after a crash the job resumes exactly where it stopped.
+    """
+    with app.app_context():
+        job = db.session.get(RepricingJob, job_id)
+        try:
+            rates = get_rate_card()
+            job.status = 'running'
+            job.error = None
+            job.rate_card_version = rates.version
+            job.run_started_at = datetime.utcnow()
+            job.run_start_processed = job.processed + job.skipped
+            db.session.commit()
+
+            while True:
+                read, repriced, last_quote_id = reprice_chunk(job.last_quote_id, job.chunk_size, rates)
+                if last_quote_id is None:
+                    break
+                job.processed += repriced
+                job.skipped += read - repriced
+                job.last_quote_id = last_quote_id
+                db.session.commit()
+                # Nothing loaded for the chunk needs to outlive it
+                db.session.expunge_all()
+                job = db.session.get(RepricingJob, job_id)
+
+            job.status = 'completed'
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            job = db.session.get(RepricingJob, job_id)
+            job.status = 'failed'
+            job.error = str(e)
+            db.session.commit()
+        finally:
+            db.session.remove()
+
+
+def _start_worker(job):
+    """Run `job` on a background thread"""
+    thread = threading.Thread(
+        target=run_repricing_job,
+        args=(current_app._get_current_object(), job.id),
+        name=f'repricing-job-{job.id}',
+        daemon=True
+    )
+    _threads[job.id] = thread
+    thread.start()
+    return thread
+
+
+def _running_here(job_id):
+    thread = _threads.get(job_id)
+    return thread is not None and thread.is_alive()
+
+
+def _is_stale(job):
+    stale_after = timedelta(seconds=current_app.config['REPRICING_STALE_SECONDS'])
+    heartbeat = job.updated_at or job.run_started_at or job.created_at
+    return datetime.utcnow() - heartbeat > stale_after
+
+
+def is_active(job):
+    """Whether a worker is, or may still be, running `job`
+
+    A thread of this process settles it; jobs run by another process are
+    active while they keep their heartbeat fresh.
+    """
+    if _running_here(job.id):
+        return True
+    return job.status in ACTIVE_STATUSES and not _is_stale(job)
+
+
+def active_repricing_job(exclude_id=None):
+    """The first job other than `exclude_id` that is still active, if any"""
+    for job_id in [job_id for job_id, thread in _threads.items() if not thread.is_alive()]:
+        del _threads[job_id]
+    jobs = RepricingJob.query.filter(
+        or_(RepricingJob.status.in_(ACTIVE_STATUSES), RepricingJob.id.in_(list(_threads)))
+    ).order_by(RepricingJob.id)
+    for job in jobs:
+        if job.id != exclude_id and is_active(job):
+            return job
+    return None
+
+
+def create_repricing_job(chunk_size):
+    job = RepricingJob(
+        status='pending',
+        chunk_size=chunk_size,
+        total=db.session.query(func.count(Quote.id)).scalar()
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def start_repricing_job(chunk_size):
+    """Create a job and start it, unless another job is active
+    Returns (job, None), or (None, error message)
+    """
+    with _claim_lock:
+        active = active_repricing_job()
+        if active:
+            return None, f'Repricing job {active.id} is still {active.status}'
+        job = create_repricing_job(chunk_size)
+        _start_worker(job)
+        return job, None
+
+
+def can_resume(job):
+    """Failed jobs, and pending or running ones whose worker stopped
+    reporting, can resume"""
+    if _running_here(job.id):
+        return False
+    if job.status == 'failed':
+        return True
+    return job.status in ACTIVE_STATUSES and _is_stale(job)
+
+
+def resume_repricing_job(job):
+    """Restart `job`, unless it cannot resume or another job is active
+    Returns (job, None), or (None, error message)
+    """
+    with _claim_lock:
+        if not can_resume(job):
+            return None, f'Job is {job.status} and cannot be resumed'
+        active = active_repricing_job(exclude_id=job.id)
+        if active:
+            return None, f'Repricing job {active.id} is still {active.status}'
+        # Only one caller, in any process, gets to claim the job as it was read
+        claimed = db.session.execute(
+            update(RepricingJob)
+            .where(RepricingJob.id == job.id, RepricingJob.status == job.status,
+                   RepricingJob.updated_at == job.updated_at)
+            .values(status='pending', updated_at=datetime.utcnow())
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return None, 'Job was resumed by another request'
+        _start_worker(job)
+        return job, None
+
+
+def job_progress(job):
+    """Job status with percentage complete and an ETA from this run's rate"""
+    status = serialize(job)
+    done = job.processed + job.skipped
+    status['percent'] = round(min(100.0, 100.0 * done / job.total), 2) if job.total else 100.0
+    status['eta_seconds'] = None
+
+    if job.status == 'running' and job.run_started_at:
+        elapsed = (datetime.utcnow() - job.run_started_at).total_seconds()
+        rate = (done - (job.run_start_processed or 0)) / elapsed if elapsed > 0 else 0
+        if rate > 0:
+            status['eta_seconds'] = round(max(job.total - done, 0) / rate, 1)
+    return status
@@ -0,0 +1,314 @@
+import functools
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from flask import current_app, g, request
+from sqlalchemy import event
+
+from app.utils.conditional import Validators, is_fresh, not_modified, with_validators
+
+try:
+    import redis
+except ImportError:  # optional: pip install redis
+    redis = None
+
+RESPONSE_CACHE_BACKENDS = ['auto', 'memory', 'redis', 'none']
+PENDING_KEY = 'response_cache_pending'
+
+
+class MemoryBackend:
+    """In-process LRU store with a per-entry TTL
+
+    For a single process only. Each worker would have its own copy, and a
+    hit is served without checking the database, so other workers would
+    answer with the old body and ETag until the entry expires.
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        values = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None or entry[0] < now:
+                    values.append(None)
+                    continue
+                self._entries.move_to_end(key)
+                values.append(entry[1])
+        return values
+
+    def _store(self, key, value, ttl):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def add(self, key, value, ttl):
+        """Store `value` unless a live value exists; return the stored one"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= time.monotonic():
+                return entry[1]
+            self._store(key, value, ttl)
+            return value
+
+    def delete(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'backend': 'memory', 'size': len(self._entries), 'maxsize': self.maxsize,
+                    'evictions': self.evictions}
+
+
+class RedisBackend:
+    """Store shared by every worker, in Redis (or any client with its API)
+
+    `client` may be given directly, e.g. a fakeredis client in tests;
+    otherwise one is created from `url`. Values are stored as JSON.
+    """
+
+    def __init__(self, url=None, client=None, prefix='response-cache:'):
+        if client is None:
+            if redis is None:
+                raise ValueError('The redis response cache needs the redis package installed '
+                                 '(RESPONSE_CACHE_BACKEND=none turns the cache off)')
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def get_many(self, keys):
+        values = self.client.mget([self.prefix + key for key in keys])
+        return [json.loads(value) if value is not None else None for value in values]
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl)
+
+    def add(self, key, value, ttl):
+        if self.client.set(self.prefix + key, json.dumps(value), ex=ttl, nx=True):
+            return value
+        stored = self.client.get(self.prefix + key)
+        return json.loads(stored) if stored is not None else value
+
+    def delete(self, keys):
+        if keys:
+            self.client.delete(*[self.prefix + key for key in keys])
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + '*'):
+            self.client.delete(key)
+
+    def stats(self):
+        return {'backend': 'redis'}
+
+
+class ResponseCache:
+    """Cache of whole GET responses, invalidated when their rows change
+
+    Every entry key embeds version tokens: the model's list token for
+    collection endpoints, the model's epoch and the row's token for detail
+    endpoints. Committing a change to a row drops its token and the model's
+    list token, so the next read builds new keys and stale entries are never
+    reached again (they age out of the store). A missing token is replaced
+    by a fresh random one, so a token lost to eviction cannot bring back an
+    old entry.
+
+    Changes are collected from ORM flushes and ORM bulk statements and
+    applied after the commit; a rollback discards them. Statements that do
+    not say which rows they touch bump the model's epoch instead. Writes
+    made with bulk_*_mappings or Core must call invalidate() themselves.
+    Responses read from a replica are served but not stored, since the
+    replica may not have the latest commit yet.
+    """
+
+    def __init__(self, backend=None, ttl=60):
+        self.backend = backend
+        self.ttl = ttl
+        self.models = set()
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def init_app(self, app, session):
+        name = app.config.get('RESPONSE_CACHE_BACKEND', 'auto')
+        if name not in RESPONSE_CACHE_BACKENDS:
+            raise ValueError(f"RESPONSE_CACHE_BACKEND must be one of: {', '.join(RESPONSE_CACHE_BACKENDS)}")
+        workers = app.config.get('WEB_CONCURRENCY', 1)
+        if name == 'auto':
+            name = 'redis' if workers > 1 else 'memory'
+        elif name == 'memory' and workers > 1:
+            app.logger.warning('RESPONSE_CACHE_BACKEND=memory with %d workers: a write is only seen by the '
+                               'worker that made it until cached responses expire', workers)
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', self.ttl)
+        if name == 'memory':
+            self.backend = MemoryBackend(app.config.get('RESPONSE_CACHE_SIZE', 10000))
+        elif name == 'redis':
+            self.backend = RedisBackend(app.config.get('RESPONSE_CACHE_URL'))
+        else:
+            self.backend = None
+
+        event.listen(session, 'after_flush', self._flushed)
+        event.listen(session, 'do_orm_execute', self._executed)
+        event.listen(session, 'after_commit', self._committed)
+        event.listen(session, 'after_rollback', self._rolled_back)
+
+    # Invalidation
+
+    def _pending(self, session):
+        return session.info.setdefault(PENDING_KEY, set())
+
+    def _flushed(self, session, flush_context):
+        pending = self._pending(session)
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            if type(obj) in self.models:
+                pending.add(f'v:{type(obj).__tablename__}')
+                pending.add(f'v:{type(obj).__tablename__}:{obj.id}')
+
+    def _executed(self, orm_execute_state):
+        if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+            return
+        mapper = orm_execute_state.bind_mapper
+        if mapper is None or mapper.class_ not in self.models:
+            return
+        table = mapper.class_.__tablename__
+        pending = self._pending(orm_execute_state.session)
+        pending.add(f'v:{table}')
+        if orm_execute_state.is_insert:
+            return
+        # A bulk update by primary key lists its rows; anything else
+        # (UPDATE ... WHERE, DELETE) may touch any row of the model
+        params = orm_execute_state.parameters
+        if isinstance(params, list) and params and all('id' in row for row in params):
+            pending.update(f'v:{table}:{row["id"]}' for row in params)
+        else:
+            pending.add(f'v:{table}:epoch')
+
+    def _committed(self, session):
+        pending = session.info.pop(PENDING_KEY, None)
+        if pending and self.backend is not None:
+            self.backend.delete(list(pending))
+
+    def _rolled_back(self, session):
+        session.info.pop(PENDING_KEY, None)
+
+    def invalidate(self, session, model, ids=None):
+        """Invalidate rows of `model` (all of them when `ids` is None) on commit"""
+        table = model.__tablename__
+        pending = self._pending(session)
+        pending.add(f'v:{table}')
+        if ids is None:
+            pending.add(f'v:{table}:epoch')
+        else:
+            pending.update(f'v:{table}:{row_id}' for row_id in ids)
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    # Lookup
+
+    def _tokens(self, names):
+        values = self.backend.get_many(names)
+        return [
+            value if value is not None else self.backend.add(name, uuid.uuid4().hex, self.ttl)
+            for name, value in zip(names, values)
+        ]
+
+    def _key(self, model, row_id):
+        table = model.__tablename__
+        if row_id is None:
+            names = [f'v:{table}']
+        else:
+            names = [f'v:{table}:epoch', f'v:{table}:{row_id}']
+        request_hash = hashlib.sha1(repr([request.path, sorted(request.args.items(multi=True))]).encode())
+        return f"r:{table}:{row_id if row_id is not None else 'list'}:{'.'.join(self._tokens(names))}:" \
+               f'{request_hash.hexdigest()}'
+
+    def _count(self, outcome):
+        with self._lock:
+            counts = self._counts.setdefault(request.endpoint, {'hits': 0, 'misses': 0, 'stores': 0})
+            counts[outcome] += 1
+
+    def cached(self, model, id_arg=None):
+        """Decorate a GET view returning `model` rows (the row whose id is
+        the `id_arg` view argument, or a list when None)
+        """
+        self.models.add(model)
+
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                if self.backend is None:
+                    return view(*args, **kwargs)
+                key = self._key(model, kwargs[id_arg] if id_arg else None)
+                entry = self.backend.get_many([key])[0]
+                if entry is not None:
+                    self._count('hits')
+                    last_modified = entry['last_modified']
+                    validators = Validators(
+                        entry['etag'],
+                        datetime.fromtimestamp(last_modified, timezone.utc) if last_modified is not None else None,
+                        1
+                    )
+                    if is_fresh(validators):
+                        return not_modified(validators)
+                    return with_validators(
+                        current_app.response_class(entry['body'], mimetype=entry['mimetype']), validators
+                    )
+
+                self._count('misses')
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed and not g.get('db_replica'):
+                    etag, weak = response.get_etag()
+                    last_modified = response.last_modified
+                    self.backend.set(key, {
+                        'body': response.get_data(as_text=True),
+                        'mimetype': response.mimetype,
+                        'etag': etag,
+                        'last_modified': last_modified.timestamp() if last_modified else None
+                    }, self.ttl)
+                    self._count('stores')
+                return response
+            return wrapper
+        return decorator
+
+    def stats(self):
+        with self._lock:
+            endpoints = {name: dict(counts) for name, counts in self._counts.items()}
+        hits = sum(counts['hits'] for counts in endpoints.values())
+        misses = sum(counts['misses'] for counts in endpoints.values())
+        for counts in endpoints.values():
+            lookups = counts['hits'] + counts['misses']
+            counts['hit_ratio'] = counts['hits'] / lookups if lookups else 0.0
+        return {
+            'store': self.backend.stats() if self.backend is not None else {'backend': 'none'},
+            'ttl': self.ttl,
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / (hits + misses) if hits + misses else 0.0,
+            'endpoints': endpoints
+        }
+
+
+response_cache = ResponseCache()
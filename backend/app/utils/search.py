@@ -0,0 +1,175 @@
+import re
+
+from flask import current_app
+from sqlalchemy import text, or_, and_, func
+
+from app import db
+from app.models import Project, DemoBusinessAnalysis
+
+# Searchable text per document type: (FTS5 table, model, columns)
+SEARCH_SOURCES = {
+    'project': ('project_fts', Project, [
+        'title', 'description', 'business_objective', 'analyst_notes',
+        'risk_factors', 'competitor_comparison', 'next_steps'
+    ]),
+    'demo_analysis': ('demo_analysis_fts', DemoBusinessAnalysis, [
+        'use_case_description', 'problem_statement', 'case_description'
+    ]),
+}
+FTS_TABLES = [table for table, model, columns in SEARCH_SOURCES.values()]
+HIGHLIGHT = ('**', '**')
+SNIPPET_TOKENS = 12
+SNIPPET_CHARS = 80
+
+_fts_ready = set()
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Keep autogenerate from dropping the FTS5 tables and their shadow tables"""
+    return not (type_ == 'table' and reflected and name.startswith(tuple(FTS_TABLES)))
+
+
+def search_terms(query):
+    """Words of a user query; a trailing * makes a word a prefix match"""
+    return re.findall(r'\w+\*?', query or '')
+
+
+def fts_available():
+    """Whether this database has the FTS5 index (created by migration)
+
+    Only a found index is remembered, so running the migration on a live
+    database switches search over without a restart.
+    """
+    engine = db.engine
+    if engine.url in _fts_ready:
+        return True
+    if engine.dialect.name != 'sqlite':
+        return False
+    names = {row[0] for row in db.session.execute(
+        text("SELECT name FROM sqlite_master WHERE type = 'table'")
+    )}
+    if not all(table in names for table in FTS_TABLES):
+        return False
+    _fts_ready.add(engine.url)
+    return True
+
+
+def search_engine():
+    engine = current_app.config.get('SEARCH_ENGINE', 'auto')
+    if engine == 'auto':
+        return 'fts5' if fts_available() else 'like'
+    return engine
+
+
+def _fts_query(terms):
+    # Quote every word so user input can never be read as FTS5 syntax
+    quoted = []
+    for term in terms:
+        prefix = term.endswith('*')
+        quoted.append('"' + term.rstrip('*').replace('"', '""') + '"' + ('*' if prefix else ''))
+    return ' '.join(quoted)
+
+
+def _fts_search(terms, types, limit):
+    """bm25-ranked hits from the FTS5 index
+
+    Every match is scored, so a very common word costs a pass over its
+    whole doclist (tens of milliseconds at 1M rows); only the best `limit`
+    per type are kept while ranking.
+    """
+    parts = []
+    for kind in types:
+        table = SEARCH_SOURCES[kind][0]
+        parts.append(
+            f"SELECT * FROM (SELECT '{kind}' AS type, rowid AS id, rank AS score, "
+            f"snippet({table}, -1, :open, :close, '…', {SNIPPET_TOKENS}) AS snippet "
+            f"FROM {table} WHERE {table} MATCH :query "
+            f"ORDER BY rank LIMIT :limit)"
+        )
+    sql = ' UNION ALL '.join(parts) + ' ORDER BY score LIMIT :limit'
+    rows = db.session.execute(text(sql), {
+        'query': _fts_query(terms),
+        'limit': limit,
+        'open': HIGHLIGHT[0],
+        'close': HIGHLIGHT[1]
+    }).all()
+    return [
+        {'type': row.type, 'id': row.id, 'score': round(-row.score, 4), 'snippet': row.snippet}
+        for row in rows
+    ]
+
+
+def _like_snippet(values, terms):
+    words = [term.rstrip('*').lower() for term in terms]
+    for value in values:
+        if not value:
+            continue
+        lowered = value.lower()
+        hits = [lowered.find(word) for word in words if word in lowered]
+        if not hits:
+            continue
+        start = max(min(hits) - SNIPPET_CHARS // 2, 0)
+        snippet = value[start:start + SNIPPET_CHARS]
+        for word in words:
+            snippet = re.sub(re.escape(word), lambda m: HIGHLIGHT[0] + m.group(0) + HIGHLIGHT[1],
+                             snippet, flags=re.IGNORECASE)
+        return ('…' if start else '') + snippet + ('…' if start + SNIPPET_CHARS < len(value) else '')
+    return None
+
+
+def _like_pattern(term):
+    # Words can contain _, which LIKE would read as "any character"
+    word = term.rstrip('*').lower()
+    for char in '\\%_':
+        word = word.replace(char, '\\' + char)
+    return f'%{word}%'
+
+
+def _like_search(terms, types, limit):
+    """Portable fallback: every word must appear in some column; no ranking,
+    newest documents first"""
+    results = []
+    for kind in types:
+        table, model, columns = SEARCH_SOURCES[kind]
+        fields = [getattr(model, column) for column in columns]
+        conditions = [
+            or_(*[func.lower(field).like(_like_pattern(term), escape='\\') for field in fields])
+            for term in terms
+        ]
+        rows = db.session.query(model.id, *fields).filter(and_(*conditions)).order_by(model.id.desc()).limit(limit)
+        for row in rows:
+            results.append({'type': kind, 'id': row[0], 'score': None, 'snippet': _like_snippet(row[1:], terms)})
+    return results[:limit]
+
+
+def search(query, types=None, limit=20):
+    """Ranked hits for `query` across projects and demo analyses
+
+    Uses the FTS5 index when the database has one and a LIKE scan otherwise
+    (or as SEARCH_ENGINE says). Each hit names its project and title.
+    Raises ValueError when the query has no searchable words.
+    """
+    terms = search_terms(query)
+    if not terms:
+        raise ValueError('q must contain at least one word')
+    types = types or list(SEARCH_SOURCES)
+    engine = search_engine()
+    hits = (_fts_search if engine == 'fts5' else _like_search)(terms, types, limit)
+
+    # Titles for every hit in two lookups
+    project_ids = {hit['id'] for hit in hits if hit['type'] == 'project'}
+    analysis_ids = [hit['id'] for hit in hits if hit['type'] == 'demo_analysis']
+    analysis_projects = dict(
+        db.session.query(DemoBusinessAnalysis.id, DemoBusinessAnalysis.project_id)
+        .filter(DemoBusinessAnalysis.id.in_(analysis_ids))
+    ) if analysis_ids else {}
+    project_ids.update(analysis_projects.values())
+    titles = dict(
+        db.session.query(Project.id, Project.title).filter(Project.id.in_(project_ids))
+    ) if project_ids else {}
+
+    for hit in hits:
+        project_id = hit['id'] if hit['type'] == 'project' else analysis_projects.get(hit['id'])
+        hit['project_id'] = project_id
+        hit['title'] = titles.get(project_id)
+    return {'engine': engine, 'results': hits}
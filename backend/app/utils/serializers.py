@@ -0,0 +1,65 @@
+from sqlalchemy import Date, DateTime
+
+from app import db
+
+# {model class: serializer}, filled by build_serializers at startup
+SERIALIZERS = {}
+
+
+def _serializer_source(model):
+    """Source of the model's serializer, in its to_dict key order
+
+    Columns come from the mapper (minus SERIALIZE_EXCLUDE), then the
+    SERIALIZE_EXTRA callables. Date and DateTime columns are written as
+    ISO strings exactly as to_dict does. Loaded values are read straight
+    from the instance __dict__; if any is missing (expired or deferred) the
+    slow variant goes through the attributes so the ORM can load it.
+    """
+    exclude = set(getattr(model, 'SERIALIZE_EXCLUDE', ()))
+    extras = getattr(model, 'SERIALIZE_EXTRA', {})
+
+    def fields(read):
+        parts = []
+        for attribute in model.__mapper__.column_attrs:
+            if attribute.key in exclude:
+                continue
+            value = read(attribute.key)
+            if isinstance(attribute.columns[0].type, (Date, DateTime)):
+                value = f'({value}.isoformat() if {value} else None)'
+            parts.append(f'{attribute.key!r}: {value}')
+        parts.extend(f'{key!r}: extras[{key!r}](obj)' for key in extras)
+        return ',\n        '.join(parts)
+
+    return (
+        f'def serialize_slow(obj):\n'
+        f'    return {{\n        {fields(lambda key: f"obj.{key}")}\n    }}\n'
+        f'\n'
+        f'def serialize(obj):\n'
+        f'    values = obj.__dict__\n'
+        f'    try:\n'
+        f'        return {{\n        {fields(lambda key: f"values[{key!r}]")}\n        }}\n'
+        f'    except KeyError:\n'
+        f'        return serialize_slow(obj)\n'
+    )
+
+
+def build_serializer(model):
+    namespace = {'extras': getattr(model, 'SERIALIZE_EXTRA', {})}
+    exec(compile(_serializer_source(model), f'<serializer {model.__name__}>', 'exec'), namespace)
+    SERIALIZERS[model] = namespace['serialize']
+    return namespace['serialize']
+
+
+def build_serializers():
+    """Generate a serializer for every model with a to_dict"""
+    for mapper in db.Model.registry.mappers:
+        if hasattr(mapper.class_, 'to_dict'):
+            build_serializer(mapper.class_)
+
+
+def serialize(obj):
+    """Same dict as obj.to_dict(), from the generated serializer"""
+    serializer = SERIALIZERS.get(type(obj))
+    if serializer is None:
+        serializer = build_serializer(type(obj))
+    return serializer(obj)
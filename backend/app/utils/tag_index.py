@@ -0,0 +1,95 @@
+from sqlalchemy import event, select, delete, insert, func
+from sqlalchemy.orm import attributes
+
+from app import db
+from app.models import KanbanTicket, KanbanTicketTag
+
+
+def normalize_tags(tags):
+    """Distinct non-empty string tags, in their original order"""
+    if not isinstance(tags, list):
+        return []
+    return list(dict.fromkeys(tag for tag in tags if isinstance(tag, str) and tag))
+
+
+def sync_ticket_tags(connection, tags_by_ticket):
+    """Rewrite the index rows of every ticket in {ticket_id: tags}
+
+    Called for ORM flushes by the listener below; code that writes tickets
+    with Core or bulk operations must call it on the same connection.
+    """
+    if not tags_by_ticket:
+        return
+    connection.execute(
+        delete(KanbanTicketTag).where(KanbanTicketTag.ticket_id.in_(list(tags_by_ticket)))
+    )
+    rows = [
+        {'ticket_id': ticket_id, 'tag': tag}
+        for ticket_id, tags in tags_by_ticket.items()
+        for tag in normalize_tags(tags)
+    ]
+    if rows:
+        connection.execute(insert(KanbanTicketTag), rows)
+
+
+@event.listens_for(db.session, 'after_flush')
+def _index_flushed_tickets(session, flush_context):
+    changed = {}
+    for ticket in list(session.new) + list(session.dirty):
+        if isinstance(ticket, KanbanTicket) and attributes.get_history(ticket, 'tags').has_changes():
+            changed[ticket.id] = ticket.tags
+    for ticket in session.deleted:
+        if isinstance(ticket, KanbanTicket):
+            changed[ticket.id] = []
+    sync_ticket_tags(session.connection(), changed)
+
+
+def _split(value):
+    return normalize_tags([tag.strip() for tag in value.split(',')]) if value else []
+
+
+def parse_tag_query(args):
+    """(all, any, none) tag lists from ?all=a,b&any=c,d&not=e
+
+    `tag` is accepted as an alias of `all`, and any of them may repeat.
+    """
+    def collect(*names):
+        return normalize_tags([tag for name in names for value in args.getlist(name) for tag in _split(value)])
+    return collect('all', 'tag'), collect('any'), collect('not')
+
+
+def filter_by_tags(query, all_tags=(), any_tags=(), no_tags=()):
+    """Restrict a KanbanTicket query with index lookups
+
+    all: tickets carrying every tag; any: at least one; not: none of them.
+    Each becomes a subquery on the (tag, ticket_id) index, never a scan of
+    the JSON column.
+    """
+    if all_tags:
+        query = query.filter(KanbanTicket.id.in_(
+            select(KanbanTicketTag.ticket_id)
+            .where(KanbanTicketTag.tag.in_(all_tags))
+            .group_by(KanbanTicketTag.ticket_id)
+            .having(func.count() == len(all_tags))
+        ))
+    if any_tags:
+        query = query.filter(KanbanTicket.id.in_(
+            select(KanbanTicketTag.ticket_id).where(KanbanTicketTag.tag.in_(any_tags))
+        ))
+    if no_tags:
+        query = query.filter(KanbanTicket.id.not_in(
+            select(KanbanTicketTag.ticket_id).where(KanbanTicketTag.tag.in_(no_tags))
+        ))
+    return query
+
+
+def tag_counts(ticket_query=None):
+    """{tag: ticket count}, over every ticket or the tickets `ticket_query` matches"""
+    query = select(KanbanTicketTag.tag, func.count().label('tickets'))
+    if ticket_query is not None:
+        matched = ticket_query.with_entities(KanbanTicket.id).order_by(None).subquery()
+        query = query.where(KanbanTicketTag.ticket_id.in_(select(matched.c.id)))
+    rows = db.session.execute(
+        query.group_by(KanbanTicketTag.tag).order_by(func.count().desc(), KanbanTicketTag.tag)
+    ).all()
+    return {tag: count for tag, count in rows}
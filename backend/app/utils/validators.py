@@ -1,6 +1,8 @@
 import re
 from datetime import datetime
 
+from app.utils.currencies import CURRENCIES
+
 def validate_email(email):
     """Validate email format"""
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
@@ -15,6 +17,91 @@ def validate_date_format(date_string):
         return False
 
 def validate_currency(currency):
-    """Validate currency code"""
-    valid_currencies = ['USD', 'EUR', 'GBP', 'CAD', 'AUD', 'JPY', 'CNY', 'INR']
-    return currency in valid_currencies
\ No newline at end of file
+    """Validate currency code against the currency registry"""
+    return isinstance(currency, str) and currency in CURRENCIES
+
+def client_values(data):
+    """Column values for a new Client from request data
+
+    Raises ValueError with the message the API returns for invalid data.
+    """
+    for field in ['analyst_name', 'name', 'client_type', 'email']:
+        if not data.get(field):
+            raise ValueError(f'{field} is required')
+    
+    # Validate pricing analyst name
+    if not str(data['analyst_name']).lower().startswith('pricing'):
+        raise ValueError('Analyst name must start with "pricing"')
+    
+    return {
+        'analyst_name': data['analyst_name'],
+        'name': data['name'],
+        'client_type': data['client_type'],
+        'country': data.get('country'),
+        'city': data.get('city'),
+        'currency': data.get('currency'),
+        'industry_sector': data.get('industry_sector'),
+        'company_size': data.get('company_size'),
+        'annual_revenue': data.get('annual_revenue'),
+        'contact_name': data.get('contact_name'),
+        'email': data['email'],
+        'phone': data.get('phone'),
+        'has_bi_team': data.get('has_bi_team', False),
+        'wants_bi_tool': data.get('wants_bi_tool', False),
+        'will_provide_bi_projects': data.get('will_provide_bi_projects', False)
+    }
+
+def _parse_date(data, field):
+    if not data.get(field):
+        return None
+    try:
+        return datetime.strptime(data[field], '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        raise ValueError(f'Invalid {field} format. Use YYYY-MM-DD')
+
+def project_values(data):
+    """Column values for a new Project from request data
+
+    Checks the fields only; whether the client exists is up to the caller.
+    Raises ValueError with the message the API returns for invalid data.
+    """
+    if not data.get('client_id'):
+        raise ValueError('client_id is required')
+    client_id = data['client_id']
+    if isinstance(client_id, str) and client_id.isdigit():
+        client_id = int(client_id)
+    if not isinstance(client_id, int) or isinstance(client_id, bool):
+        raise ValueError('client_id must be an integer')
+    if not data.get('title'):
+        raise ValueError('title is required')
+    
+    return {
+        'client_id': client_id,
+        'title': data['title'],
+        'description': data.get('description'),
+        'business_objective': data.get('business_objective'),
+        'expected_deliverables': data.get('expected_deliverables', []),
+        'subscription_plan': data.get('subscription_plan'),
+        'target_audience': data.get('target_audience', []),
+        'data_sources': data.get('data_sources', {}),
+        'data_volume': data.get('data_volume'),
+        'api_details': data.get('api_details', {}),
+        'google_spreadsheet': data.get('google_spreadsheet'),
+        'required_integrations': data.get('required_integrations', []),
+        'interactivity': data.get('interactivity', {}),
+        'user_access': data.get('user_access', {}),
+        'customization': data.get('customization', {}),
+        'engagement_type': data.get('engagement_type'),
+        'support_plan': data.get('support_plan'),
+        'delivery_model': data.get('delivery_model', {}),
+        'budget_range': data.get('budget_range'),
+        'competitor_comparison': data.get('competitor_comparison'),
+        'roi_expectations': data.get('roi_expectations'),
+        'tiered_pricing': data.get('tiered_pricing', {}),
+        'analyst_notes': data.get('analyst_notes'),
+        'suggested_pricing_model': data.get('suggested_pricing_model'),
+        'risk_factors': data.get('risk_factors'),
+        'next_steps': data.get('next_steps'),
+        'start_date': _parse_date(data, 'start_date'),
+        'end_date': _parse_date(data, 'end_date')
+    }
@@ -0,0 +1,71 @@
+"""Per-project vs batch quote endpoint throughput
+
+Measures one POST /api/pricing/generate/<id> per project against a single
+POST /api/pricing/generate-batch, on a throwaway SQLite database. Both
+price with generate_quote; the batch route saves the per-request and
+per-commit overhead. Run from the backend directory:
+
+    python -m benchmarks.batch_quotes --projects 2000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.workload import generate_payloads
+
+
+def bench_endpoints(payloads):
+    """Time the per-project route against the batch route"""
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    os.environ['DATABASE_URL'] = 'sqlite:///' + path
+    try:
+        from app import create_app, db
+        from app.models import Client, Project
+
+        app = create_app()
+        with app.app_context():
+            db.create_all()
+            client = Client(analyst_name='pricing bench', name='Bench', client_type='bench',
+                            email='bench@example.com', currency='USD')
+            db.session.add(client)
+            db.session.flush()
+            db.session.add_all([Project(client_id=client.id, title=f'Project {i}')
+                                for i in range(len(payloads))])
+            db.session.commit()
+            project_ids = [p.id for p in Project.query.order_by(Project.id)]
+
+        http = app.test_client()
+        start = time.perf_counter()
+        for project_id, payload in zip(project_ids, payloads):
+            http.post(f'/api/pricing/generate/{project_id}', json=payload)
+        single_time = time.perf_counter() - start
+
+        body = {'quotes': [dict(payload, project_id=project_id)
+                           for project_id, payload in zip(project_ids, payloads)]}
+        start = time.perf_counter()
+        response = http.post('/api/pricing/generate-batch', json=body)
+        batch_time = time.perf_counter() - start
+        assert response.status_code == 201, response.get_json()
+        return single_time, batch_time
+    finally:
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--projects', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    payloads = generate_payloads(args.projects, args.seed)
+    single_time, batch_time = bench_endpoints(payloads)
+    print(f'endpoints, {args.projects} projects')
+    print(f'  per project: {args.projects / single_time:,.0f} quotes/s ({single_time * 1000:.1f} ms)')
+    print(f'  batch:       {args.projects / batch_time:,.0f} quotes/s ({batch_time * 1000:.1f} ms)')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,143 @@
+"""Concurrent read/write throughput under each database profile
+
+Builds a throwaway SQLite database per profile, seeds --rows projects with
+their kanban tickets, then starts --writers and --readers worker processes
+(like gunicorn workers, each with its own app and pool) that hammer the API
+for --seconds. Writers move tickets and create projects; readers fetch
+projects and list tickets. Reports requests/s, latency percentiles and the
+"database is locked" failures for every role.
+
+    python -m benchmarks.concurrency --writers 4 --readers 8 --seconds 10
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from app.utils.db_profile import DATABASE_PROFILES
+
+STATUSES = ['Pricing Submissions', 'Quote Generated', 'Contract Signed', 'Project Started']
+
+
+def seed(path, rows):
+    os.environ['DATABASE_URL'] = 'sqlite:///' + path
+    os.environ['DATABASE_PROFILE'] = 'default'
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        connection = db.engine.raw_connection()
+        cursor = connection.cursor()
+        cursor.execute(
+            "INSERT INTO client (id, analyst_name, name, client_type, email, currency) "
+            "VALUES (1, 'pricing bench', 'bench', 'Enterprise', 'bench@example.com', 'USD')"
+        )
+        cursor.executemany(
+            "INSERT INTO project (id, client_id, title, description) VALUES (?, 1, ?, ?)",
+            ((i, f'project {i}', 'concurrency benchmark ' * 20) for i in range(1, rows + 1))
+        )
+        cursor.executemany(
+            "INSERT INTO kanban_ticket (id, project_id, status, tags) VALUES (?, ?, 'Pricing Submissions', '[]')",
+            ((i, i) for i in range(1, rows + 1))
+        )
+        connection.commit()
+        connection.close()
+
+
+def worker(role, path, profile, rows, start_at, deadline, seed_value, results):
+    os.environ['DATABASE_URL'] = 'sqlite:///' + path
+    os.environ['DATABASE_PROFILE'] = profile
+    from app import create_app
+
+    client = create_app().test_client()
+    rng = random.Random(seed_value)
+    latencies = []
+    locked = 0
+    failed = 0
+    time.sleep(max(start_at - time.time(), 0))
+    while time.time() < deadline:
+        project_id = rng.randint(1, rows)
+        start = time.perf_counter()
+        if role == 'writer':
+            if rng.random() < 0.5:
+                response = client.put(f'/api/kanban/{project_id}/status', json={'status': rng.choice(STATUSES)})
+            else:
+                response = client.post('/api/projects/', json={'client_id': 1, 'title': 'concurrency benchmark'})
+        else:
+            if rng.random() < 0.5:
+                response = client.get(f'/api/projects/{project_id}')
+            else:
+                response = client.get('/api/kanban/', query_string={'limit': 50})
+        elapsed = time.perf_counter() - start
+        if response.status_code < 400:
+            latencies.append(elapsed)
+        elif 'locked' in (response.get_json() or {}).get('error', ''):
+            locked += 1
+        else:
+            failed += 1
+    results.put((role, latencies, locked, failed))
+
+
+def percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)] * 1000 if values else 0.0
+
+
+def run(profile, args):
+    # Config reads the environment on import, so every process that builds
+    # an app is spawned fresh rather than forked from one that already has
+    context = multiprocessing.get_context('spawn')
+    path = os.path.join(tempfile.mkdtemp(), f'concurrency_{profile}.db')
+    seeder = context.Process(target=seed, args=(path, args.rows))
+    seeder.start()
+    seeder.join()
+
+    results = context.Queue()
+    start_at = time.time() + args.warmup
+    deadline = start_at + args.seconds
+    roles = ['writer'] * args.writers + ['reader'] * args.readers
+    workers = [
+        context.Process(target=worker, args=(role, path, profile, args.rows, start_at, deadline, args.seed + i, results))
+        for i, role in enumerate(roles)
+    ]
+    for process in workers:
+        process.start()
+    collected = [results.get() for _ in workers]
+    for process in workers:
+        process.join()
+
+    print(f'\n{profile} profile')
+    for role in ['writer', 'reader']:
+        latencies = sorted(l for r, ls, _, _ in collected if r == role for l in ls)
+        locked = sum(n for r, _, n, _ in collected if r == role)
+        failed = sum(n for r, _, _, n in collected if r == role)
+        print(
+            f'  {role}s  {len(latencies) / args.seconds:9.1f} req/s'
+            f'  p50 {percentile(latencies, 0.5):8.2f} ms  p99 {percentile(latencies, 0.99):8.2f} ms'
+            f'  locked {locked:6}  other errors {failed}'
+        )
+    for suffix in ['', '-wal', '-shm']:
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--warmup', type=float, default=2, help='startup allowance for the workers')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--profile', choices=DATABASE_PROFILES, action='append',
+                        help='profile to run (repeatable); all of them by default')
+    args = parser.parse_args()
+
+    for profile in args.profile or DATABASE_PROFILES:
+        run(profile, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""Streaming export throughput and memory by export size
+
+Builds a throwaway SQLite database with the largest --sizes count of
+projects (each with a client, quote and kanban ticket), then streams
+/api/projects/export for every size, selected with created_to, and reports
+rows/s plus the tracemalloc peak while the response is consumed. The peak
+should not grow with the number of rows.
+
+    python -m benchmarks.export --sizes 1000 100000 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+START = datetime(2024, 1, 1)
+
+
+def fill(connection, rows):
+    clients = max(rows // 100, 1)
+    cursor = connection.cursor()
+    cursor.executemany(
+        "INSERT INTO client (id, analyst_name, name, client_type, email, currency) "
+        "VALUES (?, 'pricing bench', ?, 'Enterprise', 'bench@example.com', 'EUR')",
+        ((i, f'client {i}') for i in range(1, clients + 1))
+    )
+    # One project per second, so created_to selects the first n projects
+    cursor.executemany(
+        "INSERT INTO project (id, client_id, title, support_plan, created_at) VALUES (?, ?, ?, 'Priority', ?)",
+        ((i, i % clients + 1, f'project {i}', (START + timedelta(seconds=i)).strftime('%Y-%m-%d %H:%M:%S.%f'))
+         for i in range(1, rows + 1))
+    )
+    cursor.executemany(
+        "INSERT INTO quote (id, project_id, total_price, currency, rate_card_version) VALUES (?, ?, ?, 'EUR', 1)",
+        ((i, i, 1000.0 + i % 5000) for i in range(1, rows + 1))
+    )
+    cursor.executemany(
+        "INSERT INTO kanban_ticket (id, project_id, status, tags) "
+        "VALUES (?, ?, 'Quote Generated', '[\"crm\", \"export\"]')",
+        ((i, i) for i in range(1, rows + 1))
+    )
+    connection.commit()
+
+
+def consume(client, size, fmt):
+    created_to = (START + timedelta(seconds=size + 1)).isoformat()
+    response = client.get('/api/projects/export', query_string={'format': fmt, 'created_to': created_to},
+                          buffered=False)
+    lines = 0
+    for chunk in response.response:
+        lines += chunk.count('\n' if isinstance(chunk, str) else b'\n')
+    response.close()
+    return lines - (1 if fmt == 'csv' else 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000])
+    parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'export.db')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + path
+
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        start = time.perf_counter()
+        connection = db.engine.raw_connection()
+        fill(connection, max(args.sizes))
+        connection.close()
+        print(f'inserted {max(args.sizes):,} projects in {time.perf_counter() - start:.1f}s')
+
+    client = app.test_client()
+    for size in args.sizes:
+        start = time.perf_counter()
+        rows = consume(client, size, args.format)
+        seconds = time.perf_counter() - start
+
+        tracemalloc.start()
+        consume(client, size, args.format)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print(f'  {rows:>9,} rows  {rows / seconds:10,.0f} rows/s  peak {peak / 1024 / 1024:6.2f} MiB')
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""Query plans and timings before and after the index migration
+
+Builds a throwaway SQLite database in the schema before the indexes
+(the early migrations cannot run on an empty database, so the tables come
+from the models with their ix_ indexes dropped and the revision stamped),
+fills every table with --rows rows, then runs the lookups the app issues
+(EXPLAIN QUERY PLAN plus best-of-N timings), upgrades to head and repeats.
+Exits non-zero if any lookup still scans its table after the upgrade.
+
+    python -m benchmarks.query_plans --rows 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BEFORE_REVISION = '46be6ba8f381'
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+STATUSES = ['Pricing Submissions', 'In Review', 'Proposal Sent', 'Negotiation', 'Won', 'Lost']
+
+# (name, SQL, parameters for a row count of n)
+LOOKUPS = [
+    ('document by project_id', 'SELECT * FROM document WHERE project_id = ?', lambda n: (n // 2,)),
+    ('demo analysis by project_id', 'SELECT * FROM demo_business_analysis WHERE project_id = ?', lambda n: (n // 2,)),
+    ('quote by project_id', 'SELECT * FROM quote WHERE project_id = ?', lambda n: (n // 2,)),
+    ('kanban ticket by project_id', 'SELECT * FROM kanban_ticket WHERE project_id = ?', lambda n: (n // 2,)),
+    ('kanban count by status', 'SELECT COUNT(*) FROM kanban_ticket WHERE status = ?', lambda n: ('Won',)),
+    ('projects by client_id', 'SELECT * FROM project WHERE client_id = ?', lambda n: (7,)),
+    ('projects created in a day', 'SELECT * FROM project WHERE created_at >= ? AND created_at < ?',
+     lambda n: ('2025-06-01 00:00:00', '2025-06-02 00:00:00')),
+]
+
+
+def fill(connection, rows, seed):
+    """Insert `rows` projects, each with a quote, ticket, analysis and document"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    span = 3 * 365 * 24 * 3600
+    clients = max(rows // 100, 1)
+
+    def created():
+        return (start + timedelta(seconds=rng.randrange(span))).strftime('%Y-%m-%d %H:%M:%S.000000')
+
+    cursor = connection.cursor()
+    cursor.executemany(
+        'INSERT INTO client (id, analyst_name, name, client_type, email, currency, created_at) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+        ((i, 'pricing bench', f'client {i}', 'Enterprise', f'c{i}@example.com', 'USD', created())
+         for i in range(1, clients + 1))
+    )
+    cursor.executemany(
+        'INSERT INTO project (id, client_id, title, created_at) VALUES (?, ?, ?, ?)',
+        ((i, rng.randint(1, clients), f'project {i}', created()) for i in range(1, rows + 1))
+    )
+    cursor.executemany(
+        'INSERT INTO quote (id, project_id, total_price, currency, created_at) VALUES (?, ?, ?, ?, ?)',
+        ((i, i, rng.uniform(3000, 30000), 'USD', created()) for i in range(1, rows + 1))
+    )
+    cursor.executemany(
+        'INSERT INTO kanban_ticket (id, project_id, status, created_at) VALUES (?, ?, ?, ?)',
+        ((i, i, rng.choice(STATUSES), created()) for i in range(1, rows + 1))
+    )
+    cursor.executemany(
+        'INSERT INTO demo_business_analysis (id, project_id, analysis_type, created_at) VALUES (?, ?, ?, ?)',
+        ((i, i, 'demo', created()) for i in range(1, rows + 1))
+    )
+    cursor.executemany(
+        'INSERT INTO document (id, project_id, filename, filepath, uploaded_at) VALUES (?, ?, ?, ?, ?)',
+        ((i, i, f'doc{i}.pdf', f'/uploads/doc{i}.pdf', created()) for i in range(1, rows + 1))
+    )
+    connection.commit()
+
+
+def inspect(connection, rows, repeat):
+    results = {}
+    cursor = connection.cursor()
+    for name, sql, params in LOOKUPS:
+        args = params(rows)
+        plan = '; '.join(row[3] for row in cursor.execute('EXPLAIN QUERY PLAN ' + sql, args))
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cursor.execute(sql, args).fetchall()
+            timings.append(time.perf_counter() - start)
+        results[name] = (plan, min(timings) * 1000)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'query_plans.db')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + path
+
+    from flask_migrate import stamp, upgrade
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        connection = db.engine.raw_connection()
+        indexes = [row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'ix_%'"
+        )]
+        for name in indexes:
+            connection.execute(f'DROP INDEX {name}')
+        connection.commit()
+        connection.close()
+        stamp(directory=MIGRATIONS, revision=BEFORE_REVISION)
+
+        start = time.perf_counter()
+        connection = db.engine.raw_connection()
+        fill(connection, args.rows, args.seed)
+        print(f'inserted {args.rows:,} rows per table in {time.perf_counter() - start:.1f}s')
+        before = inspect(connection, args.rows, args.repeat)
+        connection.close()
+
+        start = time.perf_counter()
+        upgrade(directory=MIGRATIONS)
+        print(f'index migration took {time.perf_counter() - start:.1f}s')
+
+        connection = db.engine.raw_connection()
+        after = inspect(connection, args.rows, args.repeat)
+        connection.close()
+
+    scans = []
+    for name, sql, params in LOOKUPS:
+        plan_before, ms_before = before[name]
+        plan_after, ms_after = after[name]
+        print(f'\n{name}')
+        print(f'  before {ms_before:10.3f} ms  {plan_before}')
+        print(f'  after  {ms_after:10.3f} ms  {plan_after}')
+        if 'USING' not in plan_after:
+            scans.append(name)
+
+    os.remove(path)
+    if scans:
+        print(f"\nstill scanning after the migration: {', '.join(scans)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
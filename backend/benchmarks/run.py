@@ -0,0 +1,159 @@
+"""Pricing engine benchmark suite
+
+Times every calculate_*_price function and generate_quote on a seeded
+workload, with tracemalloc peak memory and retained blocks per case.
+Results can be saved as a baseline and later runs compared against it;
+the run exits non-zero when any case is slower than the baseline by
+more than --threshold. Run from the backend directory:
+
+    python -m benchmarks.run --save-baseline
+    python -m benchmarks.run --compare --threshold 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from app.utils import pricing_logic
+from benchmarks.workload import generate_payloads, PROFILES
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def _normalized(payload, key, default):
+    value = payload.get(key, default)
+    return value if isinstance(value, (int, float)) else default
+
+
+def build_cases(payloads):
+    """(name, function, per-call arguments, quotes per call) for every case"""
+    return [
+        ('calculate_widgets_price', pricing_logic.calculate_widgets_price,
+         [(_normalized(p, 'num_widgets', 0),) for p in payloads], 1),
+        ('calculate_file_source_price', pricing_logic.calculate_file_source_price,
+         [(p['file_counts'],) for p in payloads], 1),
+        ('calculate_database_price', pricing_logic.calculate_database_price,
+         [(p['database_sources'],) for p in payloads], 1),
+        ('calculate_integrations_price', pricing_logic.calculate_integrations_price,
+         [(p['integrations'],) for p in payloads], 1),
+        ('calculate_features_price', pricing_logic.calculate_features_price,
+         [(p['features'],) for p in payloads], 1),
+        ('calculate_branding_price', pricing_logic.calculate_branding_price,
+         [(p['branding'], _normalized(p, 'num_widgets', 0), p['num_dashboards']) for p in payloads], 1),
+        ('calculate_support_price', pricing_logic.calculate_support_price,
+         [(p['support_plan'], p['support_hours']) for p in payloads], 1),
+        ('calculate_hosting_price', pricing_logic.calculate_hosting_price,
+         [(p['hosting_details'],) for p in payloads], 1),
+        ('generate_quote', pricing_logic.generate_quote,
+         [(p,) for p in payloads], 1),
+    ]
+
+
+def measure(func, calls, per_call, repeat):
+    """Best-of-`repeat` time per quote, plus memory for a single pass"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for args in calls:
+            func(*args)
+        timings.append(time.perf_counter_ns() - start)
+    quotes = len(calls) * per_call
+    ns_per_quote = min(timings) / quotes
+
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    for args in calls:
+        func(*args)
+    blocks_after = sys.getallocatedblocks()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'ns_per_quote': ns_per_quote,
+        'quotes_per_second': 1e9 / ns_per_quote if ns_per_quote else 0.0,
+        'peak_bytes': peak,
+        'retained_blocks': blocks_after - blocks_before,
+    }
+
+
+def run_suite(count, seed, profile, repeat):
+    payloads = generate_payloads(count, seed, profile)
+    results = {}
+    for name, func, calls, per_call in build_cases(payloads):
+        results[name] = measure(func, calls, per_call, repeat)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Names of cases more than `threshold` slower than the baseline"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        change = result['ns_per_quote'] / before['ns_per_quote'] - 1
+        result['change'] = change
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def print_report(results):
+    print(f"{'case':32} {'ns/quote':>12} {'quotes/s':>14} {'peak KiB':>10} {'blocks':>8} {'vs base':>8}")
+    for name, r in results.items():
+        change = f"{r['change']:+.1%}" if 'change' in r else ''
+        print(f"{name:32} {r['ns_per_quote']:12,.0f} {r['quotes_per_second']:14,.0f} "
+              f"{r['peak_bytes'] / 1024:10,.1f} {r['retained_blocks']:8,} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='realistic')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, metavar='PATH')
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, metavar='PATH')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='allowed slowdown against the baseline, 0.15 = 15%%')
+    args = parser.parse_args()
+
+    meta = {
+        'count': args.count,
+        'seed': args.seed,
+        'profile': args.profile,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+    }
+    results = run_suite(args.count, args.seed, args.profile, args.repeat)
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        for key in ['count', 'seed', 'profile']:
+            if baseline['meta'].get(key) != meta[key]:
+                print(f"warning: baseline {key}={baseline['meta'].get(key)!r}, this run {meta[key]!r}")
+        regressions = compare(results, baseline['results'], args.threshold)
+
+    print_report(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump({'meta': meta, 'results': results}, f, indent=2, sort_keys=True)
+        print(f'baseline saved to {args.save_baseline}')
+
+    if regressions:
+        print(f"regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
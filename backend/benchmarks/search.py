@@ -0,0 +1,113 @@
+"""Full-text search latency on a large synthetic database
+
+Builds a throwaway SQLite database at head (FTS5 index and triggers
+included), inserts --rows projects and a demo analysis for every tenth one
+through plain SQL so the triggers do the indexing, then times /api/search
+style queries with both engines.
+
+    python -m benchmarks.search --rows 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+BEFORE_REVISION = 'b63477d343a1'
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+QUERIES = ['churn', 'retention forecasting', 'supply chain', 'forecast*', 'zyxvuts', 'dashboard']
+
+
+# Query words placed at fixed frequency ranks, from very common to rare
+RANKED_WORDS = {3: 'dashboard', 40: 'churn', 150: 'forecasting', 400: 'retention', 900: 'supply', 2500: 'chain'}
+
+
+def vocabulary(rng, size=20000):
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    words = sorted({''.join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(size)})
+    for rank, word in RANKED_WORDS.items():
+        words.insert(rank, word)
+    return words
+
+
+def sentence(rng, words, length):
+    # Zipf-like word frequencies: low ranks are far more common
+    return ' '.join(words[min(int(rng.paretovariate(1.1)) - 1, len(words) - 1)] for _ in range(length))
+
+
+def fill(connection, rows, seed):
+    rng = random.Random(seed)
+    words = vocabulary(rng)
+    cursor = connection.cursor()
+    cursor.execute(
+        "INSERT INTO client (id, analyst_name, name, client_type, email) "
+        "VALUES (1, 'pricing bench', 'bench', 'Enterprise', 'bench@example.com')"
+    )
+    cursor.executemany(
+        'INSERT INTO project (id, client_id, title, description, business_objective, analyst_notes) '
+        'VALUES (?, 1, ?, ?, ?, ?)',
+        ((i, sentence(rng, words, 4), sentence(rng, words, 40), sentence(rng, words, 20), sentence(rng, words, 15))
+         for i in range(1, rows + 1))
+    )
+    cursor.executemany(
+        "INSERT INTO demo_business_analysis (id, project_id, analysis_type, problem_statement, case_description) "
+        "VALUES (?, ?, 'demo', ?, ?)",
+        ((i, i * 10, sentence(rng, words, 25), sentence(rng, words, 40)) for i in range(1, rows // 10 + 1))
+    )
+    connection.commit()
+
+
+def time_queries(client, engine, repeat):
+    client.application.config['SEARCH_ENGINE'] = engine
+    for query in QUERIES:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = client.get('/api/search/', query_string={'q': query, 'limit': 20})
+            timings.append(time.perf_counter() - start)
+        hits = len(response.get_json()['results'])
+        print(f'  {engine:5} {query!r:26} {min(timings) * 1000:10.2f} ms  {hits} hits')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--like', action='store_true', help='also time the LIKE fallback (slow at scale)')
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'search.db')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + path
+
+    from flask_migrate import stamp, upgrade
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        # The early migrations cannot run on an empty database
+        db.create_all()
+        stamp(directory=MIGRATIONS, revision=BEFORE_REVISION)
+        upgrade(directory=MIGRATIONS)
+
+        start = time.perf_counter()
+        connection = db.engine.raw_connection()
+        fill(connection, args.rows, args.seed)
+        connection.close()
+        print(f'inserted and indexed {args.rows:,} projects in {time.perf_counter() - start:.1f}s')
+
+    client = app.test_client()
+    with app.app_context():
+        for rank, word in RANKED_WORDS.items():
+            matches = db.session.execute(
+                db.text('SELECT COUNT(*) FROM project_fts WHERE project_fts MATCH :word'), {'word': word}
+            ).scalar()
+            print(f'  {word!r} is in {matches:,} projects')
+    time_queries(client, 'fts5', args.repeat)
+    if args.like:
+        time_queries(client, 'like', 1)
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Per-model serialization cost: to_dict + jsonify against the generated path
+
+Fills a throwaway SQLite database with --rows rows of every model that has
+a to_dict (values made up from the column types, with non-ASCII text and
+tiny floats), loads them, then for each model times the response bytes of
+a list of --rows objects:
+
+  to_dict    [obj.to_dict() ...] through Flask's DefaultJSONProvider
+  generated  [serialize(obj) ...] through FastJSONProvider (JSON_BACKEND=stdlib)
+  orjson     [serialize(obj) ...] through FastJSONProvider (JSON_BACKEND=orjson),
+             when the package is installed
+
+The generated bytes must equal the to_dict bytes, or the run fails. For
+orjson it only reports whether they happen to match.
+
+    python -m benchmarks.serializers --rows 500
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, JSON
+
+
+def column_value(column, i):
+    kind = column.type
+    if column.foreign_keys or column.primary_key:
+        return i
+    if isinstance(kind, Boolean):
+        return i % 2 == 0
+    if isinstance(kind, Integer):
+        return i * 7
+    if isinstance(kind, Float):
+        # Exponent-form floats are where JSON encoders disagree
+        return 6.3e-05 * i if i % 3 == 0 else 1250.5 + i
+    if isinstance(kind, DateTime):
+        return None if i % 5 == 0 and column.nullable else datetime(2024, 1, 1, 9, 30) + timedelta(minutes=i)
+    if isinstance(kind, Date):
+        return date(2024, 1, 1) + timedelta(days=i)
+    if isinstance(kind, JSON):
+        return {'items': [f'item {i}', 'Zürich'], 'count': i, 'enabled': True}
+    return f'{column.name} {i} café'
+
+
+def fill(db, models, rows):
+    tables = [model.__table__ for model in models]
+    for table in db.metadata.sorted_tables:
+        if table in tables:
+            db.session.execute(table.insert(), [
+                {column.name: column_value(column, i) for column in table.columns}
+                for i in range(1, rows + 1)
+            ])
+    db.session.commit()
+
+
+def best(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'serializers.db')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + path
+
+    from flask.json.provider import DefaultJSONProvider
+    from sqlalchemy import select
+    from app import create_app, db
+    from app.utils import json_provider
+    from app.utils.json_provider import FastJSONProvider
+    from app.utils.serializers import SERIALIZERS, serialize
+
+    app = create_app()
+    default = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    faster = None
+    if json_provider.orjson is not None:
+        app.config['JSON_BACKEND'] = 'orjson'
+        faster = FastJSONProvider(app)
+
+    failed = []
+    with app.app_context():
+        db.create_all()
+        models = sorted(SERIALIZERS, key=lambda model: model.__tablename__)
+        fill(db, models, args.rows)
+        # Load everything in one session so relationships (the ticket's
+        # project title) come from the identity map, as in an eager route
+        loaded = {model: db.session.scalars(select(model).order_by(model.id)).all() for model in models}
+
+        print(f'{args.rows} objects per response, best of {args.repeat} (ms)')
+        print(f"{'model':<22}{'to_dict':>10}{'generated':>11}{'speedup':>9}{'orjson':>9}{'speedup':>9}  same bytes")
+        for model, objects in loaded.items():
+            slow_ms, expected = best(
+                lambda: default.response([obj.to_dict() for obj in objects]).get_data(), args.repeat)
+            fast_ms, actual = best(
+                lambda: fast.response([serialize(obj) for obj in objects]).get_data(), args.repeat)
+            if actual != expected:
+                failed.append(model.__name__)
+            line = f'{model.__name__:<22}{slow_ms:>10.2f}{fast_ms:>11.2f}{slow_ms / fast_ms:>8.1f}x'
+            same = 'yes' if actual == expected else 'NO'
+            if faster is not None:
+                orjson_ms, encoded = best(
+                    lambda: faster.response([serialize(obj) for obj in objects]).get_data(), args.repeat)
+                line += f'{orjson_ms:>9.2f}{slow_ms / orjson_ms:>8.1f}x'
+                same += ' / ' + ('yes' if encoded == expected else 'no')
+            print(f'{line}  {same}')
+    os.remove(path)
+    if failed:
+        raise SystemExit(f"generated output differs from to_dict for: {', '.join(failed)}")
+
+
+if __name__ == '__main__':
+    main()
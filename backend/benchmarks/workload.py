@@ -0,0 +1,64 @@
+"""Deterministic synthetic quote payloads
+
+The same seed always produces the same payloads, so timings from different
+runs (and different machines) are measured against identical work.
+"""
+import random
+
+FILE_KINDS = ['csv', 'excel', 'json', 'xml', 'parquet', 'pdf']
+DATABASE_TYPES = ['mysql', 'postgres', 'mssql', 'oracle', 'mongodb', 'bigquery']
+SUPPORT_PLANS = ['Basic', 'Priority', 'Dedicated Account Manager']
+CURRENCIES = ['USD', 'EUR', 'GBP', 'CAD', 'AUD', 'INR']
+BRANDING_FLAGS = ['logo', 'widget_color', 'dashboard_color', 'widget_font',
+                  'dashboard_style', 'localization', 'dashboard_localization']
+
+PROFILES = {
+    # (databases per payload, tables per database)
+    'realistic': ((0, 3), (1, 12)),
+    'large': ((4, 12), (40, 250)),
+}
+
+
+def _records(rng):
+    # Table sizes are roughly log-uniform, which puts tables in every tier
+    return int(10 ** rng.uniform(1, 7.5))
+
+
+def random_payload(rng, profile='realistic'):
+    """One quote payload shaped like what the pricing form submits"""
+    databases, tables = PROFILES[profile]
+    return {
+        'num_dashboards': rng.randint(1, 8),
+        # Blank form fields arrive as null
+        'num_widgets': rng.choice([rng.randint(0, 80), rng.randint(0, 80), round(rng.uniform(0, 80), 1), None]),
+        'file_counts': {kind: rng.randint(0, 6) for kind in rng.sample(FILE_KINDS, rng.randint(0, 4))},
+        'database_sources': [
+            {
+                'type': rng.choice(DATABASE_TYPES),
+                'tables': [{'name': f'table_{t}', 'records': _records(rng)}
+                           for t in range(rng.randint(*tables))]
+            }
+            for _ in range(rng.randint(*databases))
+        ],
+        'integrations': {
+            'custom_apis': rng.randint(0, 4),
+            'cloud_integrations': rng.randint(0, 3),
+            'software_integrations': rng.randint(0, 3),
+            'standard_integrations': rng.randint(0, 5),
+        },
+        'features': {'drilldowns': rng.randint(0, 15)},
+        'branding': {flag: rng.random() < 0.4 for flag in rng.sample(BRANDING_FLAGS, rng.randint(0, 7))},
+        'support_plan': rng.choice(SUPPORT_PLANS),
+        'support_hours': rng.randint(0, 60),
+        'hosting_details': rng.choice([
+            {},
+            {'widget_count': rng.randint(0, 80), 'api_count': rng.randint(0, 30), 'tables_count': rng.randint(0, 60)},
+        ]),
+        'currency': rng.choice(CURRENCIES),
+    }
+
+
+def generate_payloads(count, seed=42, profile='realistic'):
+    """`count` payloads from a generator seeded with `seed`"""
+    rng = random.Random(seed)
+    return [random_payload(rng, profile) for _ in range(count)]
@@ -0,0 +1,72 @@
+"""Add full-text search index
+
+Revision ID: f16c7c13584c
+Revises: b63477d343a1
+Create Date: 2026-10-18 12:40:18.204117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f16c7c13584c'
+down_revision = 'b63477d343a1'
+branch_labels = None
+depends_on = None
+
+# (FTS5 table, content table, indexed columns, bm25 column weights)
+INDEXES = [
+    ('project_fts', 'project', [
+        'title', 'description', 'business_objective', 'analyst_notes',
+        'risk_factors', 'competitor_comparison', 'next_steps'
+    ], [5.0, 1.0, 2.0, 1.0, 1.0, 1.0, 1.0]),
+    ('demo_analysis_fts', 'demo_business_analysis', [
+        'use_case_description', 'problem_statement', 'case_description'
+    ], [2.0, 2.0, 1.0]),
+]
+
+
+def upgrade():
+    # FTS5 is SQLite only; other databases use the LIKE search engine
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    for fts, content, columns, weights in INDEXES:
+        column_list = ', '.join(columns)
+        new_values = ', '.join(f'new.{c}' for c in columns)
+        old_values = ', '.join(f'old.{c}' for c in columns)
+
+        # External content table: the text is read from `content`, not copied
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({column_list}, content='{content}', "
+            f"content_rowid='id', tokenize='porter unicode61 remove_diacritics 2')"
+        )
+        op.execute(f"INSERT INTO {fts}({fts}, rank) VALUES ('rank', 'bm25({', '.join(map(str, weights))})')")
+
+        # Triggers keep the index in sync with every write, ORM or not
+        op.execute(
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {content} BEGIN "
+            f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {content} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {column_list} ON {content} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+        )
+
+        op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    for fts, content, columns, weights in INDEXES:
+        for suffix in ['ai', 'ad', 'au']:
+            op.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+        op.execute(f'DROP TABLE IF EXISTS {fts}')
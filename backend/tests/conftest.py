@@ -0,0 +1,107 @@
+import importlib.util
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# The app reads its configuration from the environment on import
+_tmpdir = tempfile.mkdtemp(prefix='pricing-tests-')
+DATABASE_PATH = os.path.join(_tmpdir, 'test.db')
+TEMPLATE_PATH = os.path.join(_tmpdir, 'template.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DATABASE_PATH}'
+os.environ.setdefault('RATE_CARD_REFRESH_SECONDS', '0')
+
+from alembic.migration import MigrationContext  # noqa: E402
+from alembic.operations import Operations  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.utils import rate_card  # noqa: E402
+from app.utils.fx import invalidate_fx_cache  # noqa: E402
+from app.utils.quote_cache import quote_cache  # noqa: E402
+from app.utils.response_cache import response_cache  # noqa: E402
+
+MIGRATIONS = os.path.join(os.path.dirname(__file__), os.pardir, 'migrations', 'versions')
+
+
+def _run_migration(connection, filename, step='upgrade'):
+    # Migrations that create objects create_all cannot (FTS5 tables, triggers)
+    spec = importlib.util.spec_from_file_location(filename, os.path.join(MIGRATIONS, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    with Operations.context(MigrationContext.configure(connection)):
+        getattr(module, step)()
+
+
+@pytest.fixture(scope='session')
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        with db.engine.begin() as connection:
+            _run_migration(connection, 'f16c7c13584c_add_full_text_search_index.py')
+        db.session.remove()
+        db.engine.dispose()
+    shutil.copyfile(DATABASE_PATH, TEMPLATE_PATH)
+    yield app
+    shutil.rmtree(_tmpdir, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(app):
+    """An empty database and empty process-wide caches for every test"""
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+    shutil.copyfile(TEMPLATE_PATH, DATABASE_PATH)
+
+    rate_card.activate_rate_card(rate_card.DEFAULT_RATE_CARD)
+    rate_card._checked_at = None
+    quote_cache.invalidate()
+    quote_cache.hits = quote_cache.misses = quote_cache.evictions = quote_cache.expirations = 0
+    response_cache.clear()
+    response_cache._counts.clear()
+    invalidate_fx_cache()
+    yield
+
+
+@pytest.fixture
+def run_migration():
+    return _run_migration
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def ctx(app):
+    with app.app_context():
+        yield
+        db.session.remove()
+
+
+@pytest.fixture
+def make_client(client):
+    def make(**fields):
+        data = {'analyst_name': 'pricing ada', 'name': 'Acme', 'client_type': 'Enterprise',
+                'email': 'ada@example.com', 'currency': 'USD'}
+        data.update(fields)
+        response = client.post('/api/clients/', json=data)
+        assert response.status_code == 201, response.json
+        return response.json
+    return make
+
+
+@pytest.fixture
+def make_project(client):
+    def make(client_id, **fields):
+        data = {'client_id': client_id, 'title': 'Dashboard', 'support_plan': 'Priority'}
+        data.update(fields)
+        response = client.post('/api/projects/', json=data)
+        assert response.status_code == 201, response.json
+        return response.json
+    return make
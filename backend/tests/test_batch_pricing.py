@@ -0,0 +1,96 @@
+import random
+
+from app.utils.batch_pricing import generate_quotes_batch
+from app.utils.pricing_logic import generate_quote, build_quote_data
+from app.utils.rate_card import DEFAULT_RATES, compile_rate_card
+
+
+def random_payload(rng, number):
+    payload = {
+        'num_dashboards': number(),
+        'num_widgets': number(),
+        'file_counts': {'csv': number(), 'excel': number()},
+        'database_sources': [{'type': 'mysql', 'tables': [{'records': number()} for _ in range(rng.randint(0, 3))]}],
+        'integrations': {'custom_apis': number(), 'cloud_integrations': number()},
+        'features': {'drilldowns': number()},
+        'support_plan': rng.choice(['Basic', 'Priority', 'Dedicated Account Manager', None]),
+        'support_hours': number(),
+        'currency': rng.choice(['USD', 'EUR']),
+    }
+    if rng.random() < 0.6:
+        payload['branding'] = {name: rng.random() < 0.5 for name in
+                               ['logo', 'widget_color', 'dashboard_color', 'widget_font', 'localization']}
+    if rng.random() < 0.6:
+        payload['hosting_details'] = {'widget_count': number(), 'api_count': number(), 'tables_count': number()}
+    return payload
+
+
+def assert_parity(payloads, rates=None):
+    args = (rates,) if rates else ()
+    assert generate_quotes_batch(payloads, *args) == [generate_quote(p, *args) for p in payloads]
+
+
+def test_matches_generate_quote_on_realistic_payloads():
+    rng = random.Random(1)
+
+    def number():
+        return rng.choice([rng.randint(-3, 10 ** 7), rng.uniform(0, 10 ** 6), 'x', None])
+
+    assert_parity([random_payload(rng, number) for _ in range(3000)])
+
+
+def test_matches_generate_quote_with_a_custom_rate_card():
+    rng = random.Random(2)
+    rates = compile_rate_card(dict(DEFAULT_RATES, widget=33.3, base_price=1234), 7)
+
+    def number():
+        return rng.randint(0, 10 ** 5)
+
+    assert_parity([random_payload(rng, number) for _ in range(500)], rates)
+
+
+def test_unpriceable_payloads_fall_back_like_generate_quote():
+    payloads = [
+        {'database_sources': [{'tables': 5}]},
+        'not a payload',
+        {'num_widgets': 4},
+    ]
+    quotes = generate_quotes_batch(payloads)
+    assert quotes == [generate_quote(p) for p in payloads]
+    assert quotes[0]['total_price'] == DEFAULT_RATES['base_price'] + DEFAULT_RATES['hosting_deployment']
+
+
+def test_generate_batch_endpoint_creates_then_updates_quotes(client, make_client, make_project):
+    owner = make_client(currency='EUR')
+    first = make_project(owner['id'], support_plan='Priority')
+    second = make_project(owner['id'], support_plan='Basic')
+    items = [
+        {'project_id': first['id'], 'num_widgets': 12, 'support_hours': 5},
+        {'project_id': second['id'], 'num_dashboards': 3},
+    ]
+
+    response = client.post('/api/pricing/generate-batch', json={'quotes': items})
+    assert response.status_code == 201
+    assert (response.json['created'], response.json['updated']) == (2, 0)
+    quotes = {q['project_id']: q for q in response.json['quotes']}
+    expected = generate_quote(build_quote_data(items[0], 'Priority', 'EUR'))
+    assert quotes[first['id']]['total_price'] == expected['total_price']
+    assert quotes[first['id']]['currency'] == 'EUR'
+
+    items[0]['num_widgets'] = 20
+    response = client.post('/api/pricing/generate-batch', json={'quotes': items})
+    assert (response.json['created'], response.json['updated']) == (0, 2)
+    quotes = {q['project_id']: q for q in response.json['quotes']}
+    assert quotes[first['id']]['widgets_price'] == 20 * DEFAULT_RATES['widget']
+
+
+def test_generate_batch_endpoint_rejects_bad_batches(client, make_client, make_project):
+    project = make_project(make_client()['id'])
+    response = client.post('/api/pricing/generate-batch', json={'quotes': [{'project_id': 999}]})
+    assert response.status_code == 404
+    response = client.post('/api/pricing/generate-batch',
+                           json={'quotes': [{'project_id': project['id']}, {'project_id': project['id']}]})
+    assert response.status_code == 400
+    for project_id in ['1', True]:
+        response = client.post('/api/pricing/generate-batch', json={'quotes': [{'project_id': project_id}]})
+        assert response.status_code == 400
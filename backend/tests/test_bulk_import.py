@@ -0,0 +1,130 @@
+import io
+import json
+
+import pytest
+
+from app import db
+from app.models import KanbanEvent, KanbanStatusChange, KanbanTicket, KanbanTicketTag, Project
+from app.utils.bulk_import import detect_format, import_records
+
+
+def ndjson(*records):
+    return '\n'.join(record if isinstance(record, str) else json.dumps(record) for record in records).encode()
+
+
+def post(client, kind, body, fmt='ndjson', **params):
+    return client.post(f'/api/import/{kind}', data=body, query_string=dict(params, format=fmt))
+
+
+@pytest.fixture
+def owner(make_client):
+    return make_client()['id']
+
+
+def test_invalid_project_rows_are_reported_by_line(client, owner):
+    body = ndjson(
+        {'client_id': owner, 'title': 'Good'},
+        {'client_id': str(owner), 'title': 'Digit string id'},
+        {'client_id': [owner], 'title': 'List id'},
+        {'client_id': 'abc', 'title': 'Text id'},
+        {'client_id': True, 'title': 'Boolean id'},
+        {'client_id': 999, 'title': 'Unknown client'},
+        {'client_id': owner},
+        '{"client_id": ',
+        '[1, 2]',
+        '',
+        {'client_id': owner, 'title': 'Also good'},
+    )
+    response = post(client, 'projects', body, batch_size=3)
+    assert response.status_code == 201
+    stats = response.json
+    assert (stats['rows'], stats['imported'], stats['failed']) == (10, 3, 7)
+    errors = {error['line']: error['error'] for error in stats['errors']}
+    assert errors[3] == errors[4] == errors[5] == 'client_id must be an integer'
+    assert errors[6] == 'Client 999 not found'
+    assert errors[7] == 'title is required'
+    assert errors[8].startswith('Invalid JSON')
+    assert errors[9] == 'Each line must be a JSON object'
+    assert sorted(errors) == [3, 4, 5, 6, 7, 8, 9]
+
+
+def test_a_row_the_database_refuses_fails_alone(client, owner):
+    body = ndjson(*[{'client_id': owner, 'title': f'Project {n}'} for n in range(4)],
+                  {'client_id': owner, 'title': {'not': 'text'}})
+    stats = post(client, 'projects', body, batch_size=10).json
+    assert (stats['imported'], stats['failed'], stats['batches']) == (4, 1, 1)
+    assert [error['line'] for error in stats['errors']] == [5]
+    titles = [p['title'] for p in client.get('/api/projects/', query_string={'sort': 'id'}).json['items']]
+    assert titles == [f'Project {n}' for n in range(4)]
+
+
+def test_imported_projects_get_tickets_with_every_side_effect(app, client, owner):
+    body = ndjson({'client_id': owner, 'title': 'Tagged', 'tags': ['urgent', 'eu', 'urgent']},
+                  {'client_id': owner, 'title': 'Plain'})
+    assert post(client, 'projects', body).json['imported'] == 2
+
+    with app.app_context():
+        tickets = KanbanTicket.query.order_by(KanbanTicket.id).all()
+        assert [t.status for t in tickets] == ['Pricing Submissions'] * 2
+        assert all(t.status_changed_at is not None for t in tickets)
+        assert {(row.ticket_id, row.tag) for row in KanbanTicketTag.query} == {
+            (tickets[0].id, 'urgent'), (tickets[0].id, 'eu')
+        }
+        events = KanbanEvent.query.order_by(KanbanEvent.id).all()
+        assert [(e.event, e.ticket_id) for e in events] == [('ticket.created', t.id) for t in tickets]
+        assert events[0].data['project_title'] == 'Tagged'
+        history = KanbanStatusChange.query.order_by(KanbanStatusChange.id).all()
+        assert [(h.ticket_id, h.from_status, h.to_status) for h in history] == [
+            (t.id, None, 'Pricing Submissions') for t in tickets
+        ]
+        assert {h.analyst_name for h in history} == {'pricing ada'}
+
+    assert client.get('/api/kanban/search', query_string={'all': 'urgent'}).json['items'][0]['id'] == tickets[0].id
+    metrics = client.get('/api/kanban/metrics').json['throughput']['statuses']
+    assert metrics == [{'status': 'Pricing Submissions', 'entered': 2, 'exited': 0}]
+
+
+def test_csv_clients_are_typed_like_json(client):
+    body = (
+        'analyst_name,name,client_type,email,annual_revenue,has_bi_team\n'
+        'pricing ada,Acme,Enterprise,a@example.com,1200.5,yes\n'
+        'pricing ada,Bad,Enterprise,b@example.com,lots,no\n'
+        'someone,Wrong analyst,Enterprise,c@example.com,,\n'
+        'pricing bob,Blank cells,SMB,d@example.com,,\n'
+    ).encode()
+    stats = post(client, 'clients', body, fmt='csv').json
+    assert (stats['imported'], stats['failed']) == (2, 2)
+    assert {error['line']: error['error'] for error in stats['errors']} == {
+        3: 'annual_revenue must be a number', 4: 'Analyst name must start with "pricing"'
+    }
+    clients = {c['name']: c for c in client.get('/api/clients/').json['items']}
+    assert (clients['Acme']['annual_revenue'], clients['Acme']['has_bi_team']) == (1200.5, True)
+    assert clients['Blank cells']['has_bi_team'] is False
+
+
+def test_reported_errors_are_capped_but_counted(app, ctx, owner):
+    stream = io.BytesIO(ndjson(*[{'client_id': 999, 'title': 'x'}] * 5))
+    stats = import_records('projects', stream, 'ndjson', max_errors=2)
+    assert (stats['failed'], len(stats['errors'])) == (5, 2)
+    assert db.session.query(Project).count() == 0
+
+
+@pytest.mark.parametrize('kind, params, status', [
+    ('tickets', {'format': 'csv'}, 404),
+    ('projects', {'format': 'xml'}, 400),
+    ('projects', {'format': 'csv', 'batch_size': 0}, 400),
+    ('projects', {'format': 'csv', 'batch_size': 'many'}, 400),
+])
+def test_invalid_imports_are_rejected(client, kind, params, status):
+    assert client.post(f'/api/import/{kind}', data=b'', query_string=params).status_code == status
+
+
+@pytest.mark.parametrize('name, content_type, fmt', [
+    ('clients.csv', None, 'csv'),
+    ('projects.JSONL', None, 'ndjson'),
+    ('upload.bin', 'application/x-ndjson', 'ndjson'),
+    (None, 'text/csv; charset=utf-8', 'csv'),
+    ('notes.txt', 'text/plain', None),
+])
+def test_detect_format(name, content_type, fmt):
+    assert detect_format(name, content_type) == fmt
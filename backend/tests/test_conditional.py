@@ -0,0 +1,79 @@
+import time
+
+import pytest
+
+
+@pytest.fixture
+def project(make_client, make_project):
+    return make_project(make_client()['id'])
+
+
+def revalidate(client, url, etag=None, since=None, **params):
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if since:
+        headers['If-Modified-Since'] = since
+    return client.get(url, headers=headers, query_string=params)
+
+
+@pytest.mark.parametrize('url', ['/api/clients/1', '/api/clients/', '/api/projects/1', '/api/projects/',
+                                 '/api/kanban/', '/api/kanban/1', '/api/kanban/board', '/api/kanban/tags',
+                                 '/api/pricing/rate-cards'])
+def test_unchanged_resources_answer_304(client, project, url):
+    client.post('/api/pricing/rate-card', json={'rates': {'widget': 21}})
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert etag.startswith('W/"')
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    response = revalidate(client, url, etag=etag)
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+    assert revalidate(client, url, since=first.headers['Last-Modified']).status_code == 304
+
+
+def test_writes_change_the_validators(client, project):
+    url = f"/api/projects/{project['id']}"
+    etag = client.get(url).headers['ETag']
+    client.put(url, json={'title': 'Renamed'})
+    response = revalidate(client, url, etag=etag)
+    assert response.status_code == 200
+    assert response.json['title'] == 'Renamed'
+    assert response.headers['ETag'] != etag
+
+
+def test_lists_follow_the_rows_they_embed(client, project):
+    # Ticket cards show their project's title
+    etag = client.get('/api/kanban/').headers['ETag']
+    client.put(f"/api/projects/{project['id']}", json={'title': 'Renamed'})
+    assert revalidate(client, '/api/kanban/', etag=etag).status_code == 200
+
+
+def test_new_rows_and_other_arguments_change_the_etag(client, project, make_client):
+    etag = client.get('/api/clients/').headers['ETag']
+    assert revalidate(client, '/api/clients/', etag=etag, limit=1).status_code == 200
+    make_client(name='Second')
+    assert revalidate(client, '/api/clients/', etag=etag).status_code == 200
+
+
+def test_if_modified_since_compares_whole_seconds(client, project):
+    url = f"/api/projects/{project['id']}"
+    last_modified = client.get(url).headers['Last-Modified']
+    time.sleep(1.1)
+    client.put(url, json={'title': 'Renamed'})
+    assert revalidate(client, url, since=last_modified).status_code == 200
+
+
+def test_if_none_match_wins_over_if_modified_since(client, project):
+    url = f"/api/projects/{project['id']}"
+    first = client.get(url)
+    response = revalidate(client, url, etag='W/"stale"', since=first.headers['Last-Modified'])
+    assert response.status_code == 200
+
+
+def test_missing_rows_are_never_fresh(client):
+    response = revalidate(client, '/api/clients/999', etag='*', since='Tue, 01 Jan 2030 00:00:00 GMT')
+    assert response.status_code != 304
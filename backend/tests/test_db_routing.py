@@ -0,0 +1,143 @@
+import sqlite3
+import types
+
+import pytest
+
+from app import create_app, db
+from app.config import Config
+from app.utils import db_routing
+from app.utils.db_routing import STICKY_HEADER
+from app.utils.response_cache import response_cache
+
+STICKY_SECONDS = 10
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(db_routing, 'time', types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def files(tmp_path):
+    return {'primary': str(tmp_path / 'primary.db'), 'replica': str(tmp_path / 'replica.db')}
+
+
+@pytest.fixture
+def routed_app(files, monkeypatch):
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{files['primary']}")
+    monkeypatch.setattr(Config, 'DATABASE_REPLICA_URLS', f"sqlite:///{files['replica']}")
+    monkeypatch.setattr(Config, 'REPLICA_STICKY_SECONDS', STICKY_SECONDS)
+    monkeypatch.setattr(Config, 'CORS_ORIGINS', 'http://localhost:8080')
+    # The response cache is process-wide; keep the other tests' store
+    monkeypatch.setattr(Config, 'RESPONSE_CACHE_BACKEND', 'none')
+    backend = response_cache.backend
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+    yield app
+    response_cache.backend = backend
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def sync(app):
+    result = app.test_cli_runner().invoke(args=['replica', 'sync'])
+    assert 'replica_0: copied' in result.output
+
+
+def rename_in_replica(files, client_id, name):
+    # Stands in for replication lag: the replica holds an older copy
+    connection = sqlite3.connect(files['replica'])
+    connection.execute('UPDATE client SET name = ? WHERE id = ?', (name, client_id))
+    connection.commit()
+    connection.close()
+
+
+@pytest.fixture
+def acme(routed_app, files, clock):
+    response = routed_app.test_client().post('/api/clients/', json={
+        'analyst_name': 'pricing ada', 'name': 'Acme', 'client_type': 'Enterprise',
+        'email': 'ada@example.com', 'currency': 'USD'
+    })
+    assert response.status_code == 201
+    sync(routed_app)
+    rename_in_replica(files, response.json['id'], 'Replica copy')
+    return response.json['id']
+
+
+def name(client, client_id, **headers):
+    response = client.get(f'/api/clients/{client_id}', headers=headers)
+    assert response.status_code == 200
+    return response.json['name']
+
+
+def test_reads_use_the_replica_and_writes_the_primary(routed_app, files, acme):
+    http = routed_app.test_client()
+    assert name(http, acme) == 'Replica copy'
+
+    response = http.put(f'/api/clients/{acme}', json={'name': 'Renamed'})
+    assert response.status_code == 200
+    primary = sqlite3.connect(files['primary'])
+    assert primary.execute('SELECT name FROM client WHERE id = ?', (acme,)).fetchone() == ('Renamed',)
+    primary.close()
+
+
+def test_the_replica_refuses_writes(routed_app, acme):
+    # The replica connection is read only, so a stray write fails loudly
+    with routed_app.app_context():
+        with pytest.raises(Exception, match='readonly'):
+            with db.engines['replica_0'].begin() as connection:
+                connection.exec_driver_sql("UPDATE client SET name = 'x'")
+
+
+def test_reads_after_a_write_stay_on_the_primary_until_the_window_ends(routed_app, acme, clock):
+    http = routed_app.test_client()
+    http.put(f'/api/clients/{acme}', json={'name': 'Renamed'})
+    assert name(http, acme) == 'Renamed'
+
+    clock[0] += STICKY_SECONDS - 1
+    assert name(http, acme) == 'Renamed'
+    clock[0] += 2
+    assert name(http, acme) == 'Replica copy'
+    # Other clients never wrote and read from the replica throughout
+    assert name(routed_app.test_client(), acme) == 'Replica copy'
+
+
+def test_clients_without_cookies_echo_the_header(routed_app, acme, clock):
+    http = routed_app.test_client(use_cookies=False)
+    response = http.put(f'/api/clients/{acme}', json={'name': 'Renamed'})
+    until = response.headers[STICKY_HEADER]
+    assert float(until) == pytest.approx(clock[0] + STICKY_SECONDS)
+
+    assert name(http, acme) == 'Replica copy'
+    assert name(http, acme, **{STICKY_HEADER: until}) == 'Renamed'
+    clock[0] += STICKY_SECONDS + 1
+    assert name(http, acme, **{STICKY_HEADER: until}) == 'Replica copy'
+
+
+@pytest.mark.parametrize('until', ['soon', '1e12'])
+def test_the_header_cannot_pin_a_client_to_the_primary(routed_app, acme, until):
+    http = routed_app.test_client(use_cookies=False)
+    http.put(f'/api/clients/{acme}', json={'name': 'Renamed'})
+    assert name(http, acme, **{STICKY_HEADER: until}) == 'Replica copy'
+
+
+def test_cross_origin_clients_can_read_the_header(routed_app, acme):
+    http = routed_app.test_client(use_cookies=False)
+    response = http.put(f'/api/clients/{acme}', json={'name': 'Renamed'},
+                        headers={'Origin': 'http://localhost:8080'})
+    assert response.headers['Access-Control-Allow-Origin'] == 'http://localhost:8080'
+    assert STICKY_HEADER in response.headers['Access-Control-Expose-Headers']
+
+    preflight = http.options(f'/api/clients/{acme}', headers={
+        'Origin': 'http://localhost:8080', 'Access-Control-Request-Method': 'GET',
+        'Access-Control-Request-Headers': STICKY_HEADER
+    })
+    assert STICKY_HEADER.lower() in preflight.headers['Access-Control-Allow-Headers'].lower()
+    other = http.get(f'/api/clients/{acme}', headers={'Origin': 'http://evil.example'})
+    assert 'Access-Control-Allow-Origin' not in other.headers
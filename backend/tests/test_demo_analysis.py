@@ -0,0 +1,56 @@
+import pytest
+import sqlalchemy as sa
+
+from app.models import DemoBusinessAnalysis, Project
+
+
+@pytest.fixture
+def project(make_client, make_project):
+    return make_project(make_client()['id'])
+
+
+def test_posting_again_updates_the_analysis(client, project):
+    url = f"/api/demo-analysis/project/{project['id']}"
+    first = client.post(url, json={'analysis_type': 'dashboard', 'verticals': ['retail']})
+    assert first.status_code == 201
+
+    second = client.post(url, json={'analysis_type': 'forecast', 'problem_statement': 'Stock outs'})
+    assert second.status_code == 200
+    assert second.json['id'] == first.json['id']
+    assert (second.json['analysis_type'], second.json['verticals'], second.json['problem_statement']) == (
+        'forecast', [], 'Stock outs'
+    )
+    assert client.get(url).json['analysis_type'] == 'forecast'
+
+    ticket = client.get('/api/kanban/', query_string={'limit': 100}).json['items'][0]
+    assert ticket['tags'] == ['dashboard', 'forecast']
+
+
+def test_a_concurrent_create_is_a_conflict(app, client, project, monkeypatch):
+    url = f"/api/demo-analysis/project/{project['id']}"
+    client.post(url, json={'analysis_type': 'dashboard'})
+    # The other request's row was not there yet when this one looked
+    monkeypatch.setattr(Project, 'demo_analysis', None)
+    response = client.post(url, json={'analysis_type': 'forecast'})
+    assert response.status_code == 409
+    assert 'already exists' in response.json['error']
+    with app.app_context():
+        assert DemoBusinessAnalysis.query.count() == 1
+
+
+def test_unique_index_migration_refuses_duplicates(run_migration):
+    engine = sa.create_engine('sqlite://')
+    with engine.begin() as connection:
+        for table in ['quote', 'kanban_ticket', 'demo_business_analysis']:
+            connection.exec_driver_sql(f'CREATE TABLE {table} (id INTEGER PRIMARY KEY, project_id INTEGER)')
+        connection.exec_driver_sql('INSERT INTO quote (project_id) VALUES (1), (1), (2), (3), (3), (3)')
+        connection.exec_driver_sql('INSERT INTO kanban_ticket (project_id) VALUES (1), (2)')
+        connection.exec_driver_sql('INSERT INTO demo_business_analysis (project_id) VALUES (4), (4)')
+
+    with engine.begin() as connection:
+        with pytest.raises(RuntimeError) as error:
+            run_migration(connection, '4803d3934f2e_add_foreign_key_status_and_timestamp_.py')
+    assert 'quote: [1, 3]; demo_business_analysis: [4]' in str(error.value)
+    assert 'kanban_ticket' not in str(error.value)
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql('SELECT COUNT(*) FROM quote').scalar() == 6
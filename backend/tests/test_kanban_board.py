@@ -0,0 +1,70 @@
+import pytest
+
+from app.utils.kanban_board import KANBAN_STATUSES
+
+
+@pytest.fixture
+def board(client, make_client, make_project):
+    """Five tickets of one client and two of another, three of them moved"""
+    first = make_client(name='First')['id']
+    second = make_client(name='Second')['id']
+    projects = [make_project(first, title=f'First {n}') for n in range(5)]
+    projects += [make_project(second, title=f'Second {n}') for n in range(2)]
+    tickets = {t['project_id']: t['id'] for t in client.get('/api/kanban/', query_string={'limit': 100}).json['items']}
+    ids = [tickets[project['id']] for project in projects]
+    for ticket_id in (ids[1], ids[3], ids[5]):
+        client.put(f'/api/kanban/{ticket_id}/status', json={'status': 'Quote Generated'})
+    client.post(f"/api/pricing/generate/{projects[0]['id']}", json={'num_widgets': 1})
+    return {'first': first, 'second': second, 'tickets': ids}
+
+
+def column(body, status):
+    return next(c for c in body['columns'] if c['status'] == status)
+
+
+def test_every_status_is_a_column_in_display_order(client, board):
+    body = client.get('/api/kanban/board').json
+    assert [c['status'] for c in body['columns']] == KANBAN_STATUSES
+    assert body['total'] == 7
+    assert column(body, 'Pricing Submissions')['count'] == 4
+    assert column(body, 'Contract Signed') == {'status': 'Contract Signed', 'count': 0, 'tickets': []}
+
+
+def test_columns_list_the_most_recently_changed_cards_first(client, board):
+    ids = board['tickets']
+    moved = column(client.get('/api/kanban/board').json, 'Quote Generated')
+    assert [t['id'] for t in moved['tickets']] == [ids[5], ids[3], ids[1]]
+
+    client.put(f'/api/kanban/{ids[1]}/status', json={'status': 'Quote Generated'})
+    client.put(f'/api/kanban/{ids[3]}/status', json={'status': 'Contract Signed'})
+    client.put(f'/api/kanban/{ids[3]}/status', json={'status': 'Quote Generated'})
+    moved = column(client.get('/api/kanban/board').json, 'Quote Generated')
+    assert [t['id'] for t in moved['tickets']] == [ids[3], ids[5], ids[1]]
+
+
+def test_cards_carry_project_client_and_quote_fields(client, board):
+    cards = column(client.get('/api/kanban/board').json, 'Pricing Submissions')['tickets']
+    card = next(t for t in cards if t['id'] == board['tickets'][0])
+    assert (card['project_title'], card['client_name'], card['currency']) == ('First 0', 'First', 'USD')
+    assert card['total_price'] > 0
+    assert all(t['total_price'] is None for t in cards if t is not card)
+
+
+@pytest.mark.parametrize('limit, shown', [(0, 0), (2, 2), (10, 4)])
+def test_limit_caps_the_cards_but_not_the_counts(client, board, limit, shown):
+    body = client.get('/api/kanban/board', query_string={'limit': limit}).json
+    submissions = column(body, 'Pricing Submissions')
+    assert (submissions['count'], len(submissions['tickets'])) == (4, shown)
+    assert body['limit'] == limit
+
+
+def test_board_for_one_client(client, board):
+    body = client.get('/api/kanban/board', query_string={'client_id': board['second']}).json
+    assert body['total'] == 2
+    assert column(body, 'Quote Generated')['count'] == 1
+    assert {t['client_name'] for c in body['columns'] for t in c['tickets']} == {'Second'}
+
+
+@pytest.mark.parametrize('params', [{'limit': -1}, {'limit': 501}, {'limit': 'all'}, {'client_id': 'x'}])
+def test_invalid_board_arguments_are_rejected(client, params):
+    assert client.get('/api/kanban/board', query_string=params).status_code == 400
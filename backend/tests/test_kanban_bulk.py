@@ -0,0 +1,133 @@
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.models import KanbanEvent, KanbanStatusChange, KanbanTicket, KanbanTicketTag
+
+
+@pytest.fixture
+def tickets(client, make_client, make_project):
+    owner = make_client()['id']
+    projects = [make_project(owner, title=f'Project {n}', tags=['backlog'])['id'] for n in range(4)]
+    by_project = {t['project_id']: t['id'] for t in client.get('/api/kanban/', query_string={'limit': 100}).json['items']}
+    return [by_project[project_id] for project_id in projects]
+
+
+def bulk(client, *changes):
+    return client.post('/api/kanban/bulk', json={'changes': list(changes)})
+
+
+def test_moves_and_retags_in_one_request(client, tickets):
+    response = bulk(
+        client,
+        {'ticket_id': tickets[2], 'status': 'Quote Generated', 'add_tags': ['urgent'], 'remove_tags': ['backlog']},
+        {'ticket_id': tickets[0], 'status': 'Quote Generated'},
+        {'ticket_id': tickets[1], 'add_tags': ['urgent', 'backlog']},
+    )
+    assert response.status_code == 200
+    result = response.json['tickets']
+    assert [t['id'] for t in result] == [tickets[2], tickets[0], tickets[1]]
+    assert [(t['status'], t['tags']) for t in result] == [
+        ('Quote Generated', ['urgent']),
+        ('Quote Generated', ['backlog']),
+        ('Pricing Submissions', ['backlog', 'urgent']),
+    ]
+    assert result[0]['project_title'] == 'Project 2'
+    assert result[0]['status_changed_at'] == result[1]['status_changed_at'] != result[2]['status_changed_at']
+
+    stored = {t['id']: t for t in client.get('/api/kanban/', query_string={'limit': 100}).json['items']}
+    assert stored[tickets[2]]['tags'] == ['urgent']
+    assert stored[tickets[3]]['status'] == 'Pricing Submissions'
+
+
+def test_bulk_changes_keep_the_index_feed_and_history(app, client, tickets):
+    bulk(client,
+         {'ticket_id': tickets[0], 'status': 'Contract Signed', 'remove_tags': ['backlog']},
+         {'ticket_id': tickets[1], 'add_tags': ['urgent']})
+
+    urgent = client.get('/api/kanban/search', query_string={'all': 'urgent'}).json['items']
+    assert [t['id'] for t in urgent] == [tickets[1]]
+    backlog = client.get('/api/kanban/search', query_string={'all': 'backlog'}).json['items']
+    assert tickets[0] not in [t['id'] for t in backlog]
+
+    with app.app_context():
+        events = KanbanEvent.query.filter(KanbanEvent.event != 'ticket.created').order_by(KanbanEvent.id).all()
+        assert [(e.event, e.ticket_id) for e in events] == [
+            ('ticket.moved', tickets[0]), ('ticket.retagged', tickets[0]), ('ticket.retagged', tickets[1])
+        ]
+        assert events[0].data['previous_status'] == 'Pricing Submissions'
+        assert events[1].data['removed_tags'] == ['backlog']
+        assert events[2].data['added_tags'] == ['urgent']
+
+        moves = KanbanStatusChange.query.filter(KanbanStatusChange.from_status.is_not(None)).all()
+        assert [(m.ticket_id, m.from_status, m.to_status) for m in moves] == [
+            (tickets[0], 'Pricing Submissions', 'Contract Signed')
+        ]
+        assert moves[0].dwell_seconds >= 0
+
+    history = client.get(f'/api/kanban/{tickets[0]}/history').json
+    assert [h['to_status'] for h in history] == ['Pricing Submissions', 'Contract Signed']
+
+
+def test_unchanged_tickets_record_nothing(app, client, tickets):
+    response = bulk(client, {'ticket_id': tickets[0], 'status': 'Pricing Submissions', 'add_tags': ['backlog']})
+    assert response.status_code == 200
+    with app.app_context():
+        assert KanbanEvent.query.count() == 4
+        assert KanbanStatusChange.query.count() == 4
+
+
+def test_a_missing_ticket_changes_nothing(app, client, tickets):
+    response = bulk(client, {'ticket_id': tickets[0], 'status': 'Contract Signed', 'add_tags': ['urgent']},
+                    {'ticket_id': 999, 'status': 'Contract Signed'})
+    assert response.status_code == 404
+    assert '999' in response.json['error']
+    with app.app_context():
+        ticket = db.session.get(KanbanTicket, tickets[0])
+        assert (ticket.status, ticket.tags) == ('Pricing Submissions', ['backlog'])
+        assert KanbanTicketTag.query.filter_by(tag='urgent').count() == 0
+        assert KanbanEvent.query.count() == 4
+
+
+@pytest.mark.parametrize('body, message', [
+    ({}, 'changes list is required'),
+    ({'changes': []}, 'changes list is required'),
+    ({'changes': [{'status': 'Quote Generated'}]}, 'integer ticket_id'),
+    ({'changes': [{'ticket_id': '1'}]}, 'integer ticket_id'),
+    ({'changes': [{'ticket_id': 1, 'status': 'Done'}]}, 'Invalid status'),
+    ({'changes': [{'ticket_id': 1, 'add_tags': 'urgent'}]}, 'add_tags must be a list'),
+    ({'changes': [{'ticket_id': 1, 'remove_tags': ['']}]}, 'remove_tags must be a list'),
+    ({'changes': [{'ticket_id': 1}, {'ticket_id': 1}]}, 'Duplicate ticket_id'),
+    ({'changes': [{'ticket_id': n} for n in range(501)]}, 'At most 500 changes'),
+])
+def test_invalid_changes_are_rejected(client, body, message):
+    response = client.post('/api/kanban/bulk', json=body)
+    assert response.status_code == 400
+    assert message in response.json['error']
+
+
+def test_statement_count_does_not_grow_with_the_batch(app, client, make_client, make_project):
+    owner = make_client()['id']
+    for n in range(40):
+        make_project(owner)
+    ids = [t['id'] for t in client.get('/api/kanban/', query_string={'limit': 100, 'sort': 'id'}).json['items']]
+
+    def statements(changes):
+        executed = []
+        with app.app_context():
+            engine = db.engine
+
+        def listener(conn, cursor, statement, *args):
+            executed.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', listener)
+        try:
+            assert bulk(client, *changes).status_code == 200
+        finally:
+            event.remove(engine, 'before_cursor_execute', listener)
+        return len(executed)
+
+    def changes(batch, status):
+        return [{'ticket_id': ticket_id, 'status': status, 'add_tags': [status]} for ticket_id in batch]
+
+    assert statements(changes(ids[:4], 'Quote Generated')) == statements(changes(ids[4:], 'Quote Generated'))
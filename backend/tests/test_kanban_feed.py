@@ -0,0 +1,145 @@
+import json
+import time
+from itertools import islice
+
+import pytest
+
+from app.utils import kanban_feed as kanban_feed_module
+from app.utils.kanban_feed import RESET_MESSAGE, KanbanFeed, events_after, kanban_feed, stream_events
+
+
+class Subscriptions:
+    def __init__(self):
+        self.open = 0
+
+    def subscribe(self, app):
+        self.open += 1
+
+    def unsubscribe(self):
+        self.open -= 1
+
+
+@pytest.fixture(autouse=True)
+def subscriptions(monkeypatch):
+    # No poller thread: streams are read only as far as their replay
+    subscriptions = Subscriptions()
+    monkeypatch.setattr(kanban_feed, 'subscribe', subscriptions.subscribe)
+    monkeypatch.setattr(kanban_feed, 'unsubscribe', subscriptions.unsubscribe)
+    return subscriptions
+
+
+@pytest.fixture
+def tickets(client, make_client, make_project):
+    owner = make_client()['id']
+    projects = [make_project(owner, title=f'Project {n}')['id'] for n in range(3)]
+    by_project = {t['project_id']: t['id'] for t in client.get('/api/kanban/', query_string={'limit': 100}).json['items']}
+    return [by_project[project_id] for project_id in projects]
+
+
+def parse(message):
+    fields = dict(line.split(': ', 1) for line in message.strip().split('\n'))
+    return int(fields['id']), fields['event'], json.loads(fields['data'])
+
+
+def open_stream(client, chunks, **headers):
+    response = client.get('/api/kanban/stream', headers=headers, buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    try:
+        return [chunk.decode() if isinstance(chunk, bytes) else chunk for chunk in islice(response.response, chunks)]
+    finally:
+        response.close()
+
+
+def test_ticket_changes_are_stored_as_events(client, ctx, tickets):
+    client.put(f'/api/kanban/{tickets[0]}/status', json={'status': 'Quote Generated'})
+    client.post('/api/kanban/bulk', json={'changes': [{'ticket_id': tickets[1], 'add_tags': ['urgent']}]})
+
+    messages, complete = events_after(0, 100)
+    assert complete
+    events = [parse(message) for event_id, message in messages]
+    assert [event_id for event_id, name, data in events] == list(range(1, 6))
+    assert [(name, data['id']) for event_id, name, data in events] == [
+        ('ticket.created', tickets[0]), ('ticket.created', tickets[1]), ('ticket.created', tickets[2]),
+        ('ticket.moved', tickets[0]), ('ticket.retagged', tickets[1]),
+    ]
+    moved, retagged = events[3][2], events[4][2]
+    assert (moved['previous_status'], moved['status'], moved['event_id']) == ('Pricing Submissions', 'Quote Generated', 4)
+    assert (retagged['added_tags'], retagged['removed_tags'], retagged['project_title']) == (['urgent'], [], 'Project 1')
+
+
+def test_pruned_events_make_the_replay_incomplete(app, ctx, make_client, make_project):
+    app.config['KANBAN_EVENT_BUFFER'] = 3
+    try:
+        owner = make_client()['id']
+        for n in range(5):
+            make_project(owner)
+        assert [event_id for event_id, message in events_after(2, 100)[0]] == [3, 4, 5]
+        assert events_after(2, 100)[1]
+        assert not events_after(1, 100)[1]
+        assert not events_after(0, 100)[1]
+    finally:
+        app.config['KANBAN_EVENT_BUFFER'] = 1000
+
+
+def test_reconnecting_replays_events_after_last_event_id(client, tickets, subscriptions):
+    chunks = open_stream(client, 3, **{'Last-Event-ID': '1'})
+    assert chunks[0] == 'retry: 3000\n\n'
+    assert [parse(chunk)[0] for chunk in chunks[1:]] == [2, 3]
+    assert subscriptions.open == 0
+
+
+def test_reconnecting_after_a_prune_sends_only_a_reset(app, client, tickets):
+    app.config.update(KANBAN_EVENT_BUFFER=2, KANBAN_STREAM_HEARTBEAT_SECONDS=0.01)
+    try:
+        client.put(f'/api/kanban/{tickets[0]}/status', json={'status': 'Quote Generated'})
+        chunks = open_stream(client, 3, **{'Last-Event-ID': '1'})
+    finally:
+        app.config.update(KANBAN_EVENT_BUFFER=1000, KANBAN_STREAM_HEARTBEAT_SECONDS=15)
+    # The re-fetched board has events 3 and 4 already
+    assert chunks[1:] == [RESET_MESSAGE, ': keepalive\n\n']
+
+
+def test_invalid_last_event_id_is_rejected(client):
+    assert client.get('/api/kanban/stream', headers={'Last-Event-ID': 'abc'}).status_code == 400
+
+
+def test_poller_runs_only_while_streams_are_subscribed(app, ctx):
+    feed = KanbanFeed()
+    app.config['KANBAN_STREAM_POLL_SECONDS'] = 0.01
+    try:
+        for _ in range(2):
+            feed.subscribe(app)
+            feed.subscribe(app)
+            thread = feed._thread
+            feed.unsubscribe()
+            time.sleep(0.05)
+            assert thread.is_alive()
+            feed.unsubscribe()
+            thread.join(1)
+            assert not thread.is_alive()
+            assert feed._thread is None
+    finally:
+        app.config['KANBAN_STREAM_POLL_SECONDS'] = 0.5
+
+
+def test_feed_returns_newer_events_or_none_once_they_left_the_buffer():
+    feed = KanbanFeed()
+    feed._maxlen = 2
+    feed._publish([(1, 'one'), (2, 'two'), (3, 'three')])
+    assert feed.wait(0, 0) is None
+    assert feed.wait(1, 0) == [(2, 'two'), (3, 'three')]
+    assert feed.wait(2, 0) == [(3, 'three')]
+    assert feed.wait(3, 0.01) == []
+
+
+def test_live_stream_resets_then_continues_from_the_newest_event(monkeypatch):
+    feed = KanbanFeed()
+    feed._maxlen = 1
+    feed._publish([(1, 'one'), (2, 'two')])
+    monkeypatch.setattr(kanban_feed_module, 'kanban_feed', feed)
+
+    stream = stream_events(['replayed'], 0, heartbeat=0.01)
+    assert list(islice(stream, 4)) == ['retry: 3000\n\n', 'replayed', RESET_MESSAGE, ': keepalive\n\n']
+    feed._publish([(3, 'three')])
+    assert next(stream) == 'three'
@@ -0,0 +1,128 @@
+import math
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models import KanbanStatusChange, KanbanTicket
+from app.utils.kanban_metrics import (
+    DWELL_BUCKET_BASE, DWELL_BUCKET_RATIO, _bucket_seconds, dwell_bucket, dwell_metrics, record_status_changes,
+    throughput_metrics
+)
+
+
+@pytest.fixture
+def projects(make_client, make_project):
+    ada = make_client(analyst_name='pricing ada')['id']
+    bob = make_client(analyst_name='pricing bob')['id']
+    return {'pricing ada': make_project(ada)['id'], 'pricing bob': make_project(bob)['id']}
+
+
+def moves(project_id, durations, status='Quote Generated', changed_at=None):
+    changed_at = changed_at or datetime.utcnow()
+    return [
+        {'ticket_id': n + 1, 'project_id': project_id, 'from_status': status, 'to_status': 'Contract Signed',
+         'entered_at': changed_at - timedelta(seconds=seconds), 'changed_at': changed_at}
+        for n, seconds in enumerate(durations)
+    ]
+
+
+def exact_percentile(values, fraction):
+    return sorted(values)[max(math.ceil(fraction * len(values)), 1) - 1]
+
+
+@pytest.mark.parametrize('seconds', [0, 59.9, 60, 74.9, 75, 3600, 86400 * 30])
+def test_dwell_buckets_bound_their_representative(seconds):
+    bucket = dwell_bucket(seconds)
+    if bucket == 0:
+        assert seconds < DWELL_BUCKET_BASE
+        return
+    low = DWELL_BUCKET_BASE * DWELL_BUCKET_RATIO ** (bucket - 1)
+    assert low <= seconds < low * DWELL_BUCKET_RATIO
+    assert low <= _bucket_seconds(bucket) < low * DWELL_BUCKET_RATIO
+
+
+def test_percentiles_from_the_histogram_are_close_to_exact(ctx, projects):
+    rng = random.Random(3)
+    durations = [rng.lognormvariate(9, 1.2) + DWELL_BUCKET_BASE for _ in range(2000)]
+    record_status_changes(db.session.connection(), moves(projects['pricing ada'], durations))
+    db.session.commit()
+
+    stats = dwell_metrics()['statuses']
+    assert [s['status'] for s in stats] == ['Quote Generated']
+    summary = stats[0]
+    assert summary['count'] == 2000
+    assert summary['mean_seconds'] == pytest.approx(sum(durations) / 2000)
+    for name, fraction in (('p50_seconds', 0.5), ('p90_seconds', 0.9)):
+        exact = exact_percentile(durations, fraction)
+        assert exact / DWELL_BUCKET_RATIO <= summary[name] <= exact * DWELL_BUCKET_RATIO
+
+
+def test_metrics_are_split_by_analyst(ctx, projects):
+    record_status_changes(db.session.connection(), moves(projects['pricing ada'], [100, 200, 300]))
+    record_status_changes(db.session.connection(), moves(projects['pricing bob'], [5000]))
+    db.session.commit()
+
+    analysts = {a['analyst_name']: a['statuses'][0] for a in dwell_metrics()['analysts']}
+    assert {name: summary['count'] for name, summary in analysts.items()} == {'pricing ada': 3, 'pricing bob': 1}
+    assert analysts['pricing bob']['p50_seconds'] == _bucket_seconds(dwell_bucket(5000))
+    only_bob = dwell_metrics('pricing bob')
+    assert [a['analyst_name'] for a in only_bob['analysts']] == ['pricing bob']
+    assert only_bob['statuses'][0]['count'] == 1
+
+
+def test_throughput_counts_only_the_requested_days(ctx, projects):
+    old = datetime.utcnow() - timedelta(days=40)
+    record_status_changes(db.session.connection(), moves(projects['pricing ada'], [60, 60]))
+    record_status_changes(db.session.connection(), moves(projects['pricing ada'], [60], changed_at=old))
+    db.session.commit()
+
+    # The fixture's tickets entered Pricing Submissions when created
+    assert throughput_metrics(30) == [
+        {'status': 'Pricing Submissions', 'entered': 2, 'exited': 0},
+        {'status': 'Quote Generated', 'entered': 0, 'exited': 2},
+        {'status': 'Contract Signed', 'entered': 2, 'exited': 0},
+    ]
+    assert throughput_metrics(60)[1]['exited'] == 3
+    assert throughput_metrics(30, 'pricing bob') == [{'status': 'Pricing Submissions', 'entered': 1, 'exited': 0}]
+
+
+def test_moves_through_the_api_are_logged_with_their_dwell(app, client, projects):
+    ticket_id = client.get('/api/kanban/', query_string={'limit': 100}).json['items'][-1]['id']
+    with app.app_context():
+        ticket = db.session.get(KanbanTicket, ticket_id)
+        entered = ticket.status_changed_at = datetime.utcnow() - timedelta(hours=2)
+        db.session.commit()
+
+    client.put(f'/api/kanban/{ticket_id}/status', json={'status': 'Quote Generated'})
+    client.put(f'/api/kanban/{ticket_id}/status', json={'status': 'Quote Generated'})
+    history = client.get(f'/api/kanban/{ticket_id}/history').json
+    assert [(h['from_status'], h['to_status']) for h in history] == [
+        (None, 'Pricing Submissions'), ('Pricing Submissions', 'Quote Generated')
+    ]
+    assert history[0]['dwell_seconds'] is None
+    assert history[1]['dwell_seconds'] == pytest.approx(7200, abs=5)
+    assert history[1]['entered_at'] == entered.isoformat()
+
+    body = client.get('/api/kanban/metrics', query_string={'analyst': 'pricing ada'}).json
+    stage = body['time_in_stage']['statuses']
+    assert [(s['status'], s['count']) for s in stage] == [('Pricing Submissions', 1)]
+    assert body['throughput'] == {'days': 30, 'statuses': [
+        {'status': 'Pricing Submissions', 'entered': 1, 'exited': 1},
+        {'status': 'Quote Generated', 'entered': 1, 'exited': 0},
+    ]}
+
+
+def test_rewriting_the_same_status_logs_nothing(app, client, projects):
+    ticket_id = client.get('/api/kanban/', query_string={'limit': 100}).json['items'][0]['id']
+    before = client.get(f'/api/kanban/{ticket_id}').json['status_changed_at']
+    client.put(f'/api/kanban/{ticket_id}/status', json={'status': 'Pricing Submissions'})
+    assert client.get(f'/api/kanban/{ticket_id}').json['status_changed_at'] == before
+    with app.app_context():
+        assert KanbanStatusChange.query.filter_by(ticket_id=ticket_id).count() == 1
+
+
+@pytest.mark.parametrize('days', ['0', '-3', 'week'])
+def test_invalid_days_are_rejected(client, days):
+    assert client.get('/api/kanban/metrics', query_string={'days': days}).status_code == 400
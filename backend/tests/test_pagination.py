@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models import Client
+from app.utils.pagination import encode_cursor
+
+
+@pytest.fixture
+def clients(app, make_client):
+    # Repeated names and NULL / tied updated_at values exercise the id tie-break
+    ids = [make_client(name=f'Client {n % 4}')['id'] for n in range(13)]
+    with app.app_context():
+        start = datetime(2026, 1, 1)
+        for position, row in enumerate(Client.query.order_by(Client.id)):
+            row.updated_at = None if position % 5 == 0 else start + timedelta(days=position % 3)
+        db.session.commit()
+    return ids
+
+
+def walk(client, url, **params):
+    """Every item forward page by page, then back again from the last page"""
+    pages = [client.get(url, query_string=params).json]
+    while pages[-1]['next_cursor']:
+        pages.append(client.get(url, query_string=dict(params, cursor=pages[-1]['next_cursor'])).json)
+    backwards = [pages[-1]]
+    while backwards[-1]['prev_cursor']:
+        backwards.append(client.get(url, query_string=dict(params, cursor=backwards[-1]['prev_cursor'])).json)
+    assert [page['items'] for page in backwards] == [page['items'] for page in reversed(pages)]
+    assert pages[0]['prev_cursor'] is None
+    return [item['id'] for page in pages for item in page['items']]
+
+
+def expected_order(rows, sort):
+    name = sort.lstrip('-')
+    descending = sort.startswith('-')
+
+    def key(row):
+        value = row[name]
+        # NULLs first ascending, last descending: both are the low end
+        return (value is not None, value if value is not None else '', row['id'])
+
+    return [row['id'] for row in sorted(rows, key=key, reverse=descending)]
+
+
+@pytest.mark.parametrize('sort', ['id', '-id', 'name', '-name', 'updated_at', '-updated_at', 'created_at'])
+@pytest.mark.parametrize('limit', [1, 4, 50])
+def test_client_pages_cover_every_row_once_in_order(client, clients, sort, limit):
+    rows = client.get('/api/clients/', query_string={'limit': 500, 'sort': sort}).json['items']
+    assert len(rows) == 13
+    assert [row['id'] for row in rows] == expected_order(rows, sort)
+    assert walk(client, '/api/clients/', limit=limit, sort=sort) == [row['id'] for row in rows]
+
+
+def test_pages_skip_rows_already_seen_after_inserts(client, clients, make_client):
+    page = client.get('/api/clients/', query_string={'limit': 5, 'sort': 'id'}).json
+    make_client(name='Late')
+    ids = []
+    while page['next_cursor']:
+        page = client.get('/api/clients/', query_string={'limit': 5, 'sort': 'id', 'cursor': page['next_cursor']}).json
+        ids += [item['id'] for item in page['items']]
+    assert ids == sorted(clients)[5:] + [max(clients) + 1]
+
+
+def test_project_and_ticket_lists_are_keyset_paginated(client, make_client, make_project):
+    owner = make_client()['id']
+    other = make_client()['id']
+    for n in range(7):
+        make_project(owner if n % 2 else other, title=f'Project {n % 3}')
+
+    everything = client.get('/api/projects/', query_string={'sort': 'title', 'limit': 100}).json['items']
+    assert walk(client, '/api/projects/', limit=2, sort='title') == [p['id'] for p in everything]
+    assert len(walk(client, '/api/projects/', limit=2, client_id=owner)) == 3
+
+    tickets = client.get('/api/kanban/', query_string={'limit': 100}).json['items']
+    assert [t['id'] for t in tickets] == sorted((t['id'] for t in tickets), reverse=True)
+    assert walk(client, '/api/kanban/', limit=3) == [t['id'] for t in tickets]
+    assert len(walk(client, '/api/kanban/', limit=3, client_id=other)) == 4
+
+
+@pytest.mark.parametrize('params, message', [
+    ({'limit': 0}, 'limit must be between'),
+    ({'limit': 501}, 'limit must be between'),
+    ({'limit': 'ten'}, 'limit must be an integer'),
+    ({'sort': 'email'}, 'sort must be one of'),
+    ({'cursor': 'not-a-cursor'}, 'Invalid cursor'),
+    ({'cursor': encode_cursor('name', 'Acme', 1, 'next')}, 'Invalid cursor'),
+    ({'cursor': encode_cursor('-id', None, 'one', 'next')}, 'Invalid cursor'),
+    ({'created_from': 'yesterday'}, 'ISO date'),
+])
+def test_invalid_page_arguments_are_rejected(client, params, message):
+    response = client.get('/api/clients/', query_string=params)
+    assert response.status_code == 400
+    assert message in response.json['error']
@@ -0,0 +1,123 @@
+import time
+
+import numpy as np
+import pytest
+
+from app.utils.pricing_logic import generate_quote
+from app.utils.price_sweep import axis_length, axis_values, sweep_quote
+from app.utils.rate_card import DEFAULT_RATES
+
+BASE = {'num_dashboards': 2, 'support_plan': 'Priority', 'branding': {'logo': True}}
+
+
+def test_every_grid_point_matches_generate_quote():
+    axes = [
+        {'name': 'num_widgets', 'start': 0, 'stop': 30, 'step': 5},
+        {'name': 'support_plan', 'values': ['Basic', 'Priority', 'Dedicated Account Manager']},
+        {'name': 'branding.widget_color', 'values': [False, True]},
+    ]
+    result = sweep_quote(BASE, axes)
+    assert result['shape'] == [7, 3, 2]
+
+    widgets, plans, colors = (values for name, values in result['axes'])
+    for i, widget in enumerate(widgets):
+        for j, plan in enumerate(plans):
+            for k, color in enumerate(colors):
+                data = dict(BASE, num_widgets=widget, support_plan=plan,
+                            branding={'logo': True, 'widget_color': color})
+                expected = generate_quote(data)
+                for name, grid in result['components'].items():
+                    point = grid[tuple(min(index, size - 1) for index, size in zip((i, j, k), grid.shape))]
+                    assert point == expected[name], name
+
+
+def test_components_keep_their_own_shape_unless_expanded():
+    axes = {'num_widgets': [1, 2, 3], 'support_hours': [0, 10]}
+    grids = sweep_quote(BASE, axes)['components']
+    assert grids['widgets_price'].shape == (3, 1)
+    assert grids['support_price'].shape == (1, 2)
+    assert grids['base_price'].shape == (1, 1)
+    assert grids['total_price'].shape == (3, 2)
+
+    grids = sweep_quote(BASE, axes, components=['widgets_price'], expand=True)['components']
+    assert list(grids) == ['widgets_price']
+    assert grids['widgets_price'].shape == (3, 2)
+
+
+@pytest.mark.parametrize('spec, length', [
+    ({'start': 0, 'stop': 10}, 11),
+    ({'start': 0, 'stop': 1, 'step': 0.1}, 11),
+    ({'start': 0, 'stop': 0.3, 'step': 0.1}, 4),
+    ({'start': 5, 'stop': 5}, 1),
+    ([3, 1, 2], 3),
+])
+def test_ranges_include_their_stop(spec, length):
+    assert axis_length('num_widgets', spec) == length
+    labels, values = axis_values('num_widgets', spec)
+    assert len(labels) == len(values) == length
+
+
+@pytest.mark.parametrize('spec, message', [
+    ({'start': 5, 'stop': 0}, 'is empty'),
+    ([], 'is empty'),
+    ({'start': 0, 'stop': 10, 'step': 0}, 'step must be positive'),
+    ({'start': 0}, 'needs start and stop'),
+    ({'start': 0, 'stop': 10 ** 400}, 'below 1e308'),
+    ({'start': 0, 'stop': 1e308, 'step': 1e-308}, 'too many points'),
+    ({'start': 0, 'stop': True}, 'must be numbers'),
+    ('0:10', 'must be a list or a range'),
+])
+def test_invalid_axes_are_rejected(spec, message):
+    with pytest.raises(ValueError, match=message):
+        sweep_quote(BASE, {'num_widgets': spec})
+
+
+def test_oversized_sweeps_are_rejected_before_allocating():
+    started = time.perf_counter()
+    with pytest.raises(ValueError, match='exceeds the limit'):
+        sweep_quote(BASE, {'num_widgets': {'start': 0, 'stop': 10 ** 15}})
+    # Product across axes, lists included
+    with pytest.raises(ValueError, match='Sweep of 1000000 points exceeds the limit of 999999'):
+        sweep_quote(BASE, {'num_widgets': {'start': 1, 'stop': 1000}, 'support_hours': list(range(1000))},
+                    max_points=999999)
+    assert time.perf_counter() - started < 1
+
+
+def test_huge_values_are_rejected_or_priced_like_generate_quote():
+    with pytest.raises(ValueError, match='below 1e308'):
+        sweep_quote(dict(BASE, support_hours=10 ** 400), {'num_widgets': [1, 2]})
+    with pytest.raises(ValueError, match='below 1e308'):
+        sweep_quote(BASE, {'num_widgets': [1, 10 ** 400]})
+
+    result = sweep_quote(dict(BASE, support_hours=10 ** 20), {'num_widgets': [1, 2]})
+    expected = generate_quote(dict(BASE, support_hours=10 ** 20, num_widgets=2))
+    assert result['components']['total_price'][1] == expected['total_price']
+
+
+def test_sweep_endpoint(client, make_client, make_project):
+    project = make_project(make_client(currency='EUR')['id'], support_plan='Basic')
+    response = client.post('/api/pricing/sweep', json={
+        'project_id': project['id'],
+        'axes': [{'name': 'num_widgets', 'start': 0, 'stop': 4, 'step': 2}],
+        'components': ['widgets_price', 'total_price'],
+    })
+    assert response.status_code == 200
+    body = response.json
+    assert body['shape'] == [3]
+    assert body['currency'] == 'EUR'
+    assert body['axes'] == [{'name': 'num_widgets', 'values': [0.0, 2.0, 4.0]}]
+    assert body['components']['widgets_price']['values'] == [0, 2 * DEFAULT_RATES['widget'], 4 * DEFAULT_RATES['widget']]
+    assert np.allclose(body['components']['total_price']['values'],
+                       [generate_quote({'num_widgets': n, 'support_plan': 'Basic'})['total_price'] for n in (0, 2, 4)])
+
+
+@pytest.mark.parametrize('body', [
+    {},
+    {'axes': {'num_widgets': [1]}, 'base': [1]},
+    {'axes': {'num_widgets': {'start': 0, 'stop': 10 ** 12}}},
+    {'axes': {'num_widgets': [1]}, 'base': {'support_hours': 10 ** 400}},
+    {'axes': {'nonsense': [1]}},
+    {'axes': {'num_widgets': [1]}, 'components': ['nonsense']},
+])
+def test_sweep_endpoint_rejects_bad_requests(client, body):
+    assert client.post('/api/pricing/sweep', json=body).status_code == 400
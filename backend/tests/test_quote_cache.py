@@ -0,0 +1,100 @@
+import types
+
+import pytest
+
+from app.utils import quote_cache as quote_cache_module
+from app.utils.pricing_logic import generate_quote
+from app.utils.quote_cache import QuoteCache, cached_generate_quote, quote_cache
+from app.utils.rate_card import DEFAULT_RATE_CARD, compile_rate_card, DEFAULT_RATES
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(quote_cache_module, 'time', types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_keys_ignore_key_order_but_not_the_rate_card_version():
+    first = {'num_widgets': 3, 'branding': {'logo': True, 'widget_color': False}}
+    second = {'branding': {'widget_color': False, 'logo': True}, 'num_widgets': 3}
+    assert QuoteCache.make_key(first, 1) == QuoteCache.make_key(second, 1)
+    assert QuoteCache.make_key(first, 1) != QuoteCache.make_key(first, 2)
+    assert QuoteCache.make_key(first, 1) != QuoteCache.make_key(dict(first, num_widgets=4), 1)
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = QuoteCache(maxsize=10, ttl=60)
+    cache.put('a', {'total_price': 1})
+    clock[0] += 59
+    assert cache.get('a') == {'total_price': 1}
+    clock[0] += 2
+    assert cache.get('a') is None
+    assert cache.stats()['expirations'] == 1
+    assert cache.stats()['size'] == 0
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    cache = QuoteCache(maxsize=2, ttl=60)
+    cache.put('a', {'total_price': 1})
+    cache.put('b', {'total_price': 2})
+    cache.get('a')
+    cache.put('c', {'total_price': 3})
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    stats = cache.stats()
+    assert (stats['size'], stats['evictions'], stats['hits'], stats['misses']) == (2, 1, 3, 1)
+    assert stats['hit_ratio'] == 0.75
+
+
+def test_cached_results_cannot_be_mutated_by_callers():
+    cache = QuoteCache()
+    value = {'total_price': 1}
+    cache.put('a', value)
+    value['total_price'] = 2
+    cache.get('a')['total_price'] = 3
+    assert cache.get('a') == {'total_price': 1}
+
+
+def test_a_zero_size_cache_stores_nothing():
+    cache = QuoteCache(maxsize=0)
+    cache.put('a', {'total_price': 1})
+    assert cache.get('a') is None
+
+
+def test_invalidate_one_or_every_entry():
+    cache = QuoteCache()
+    for key in 'abc':
+        cache.put(key, {})
+    assert cache.invalidate('a') == 1
+    assert cache.invalidate('a') == 0
+    assert cache.invalidate() == 2
+    assert cache.stats()['size'] == 0
+
+
+def test_cached_generate_quote_matches_and_reuses_generate_quote():
+    data = {'num_widgets': 5, 'support_plan': 'Priority'}
+    assert cached_generate_quote(data, DEFAULT_RATE_CARD) == generate_quote(data)
+    assert cached_generate_quote(data, DEFAULT_RATE_CARD) == generate_quote(data)
+    assert (quote_cache.hits, quote_cache.misses) == (1, 1)
+
+    # A new rate card version is a different entry, priced with the new rates
+    rates = compile_rate_card(dict(DEFAULT_RATES, widget=1), 1)
+    assert cached_generate_quote(data, rates)['widgets_price'] == 5
+    assert quote_cache.misses == 2
+
+
+def test_cache_endpoints_and_invalidation_on_publish(client, make_client, make_project):
+    project = make_project(make_client()['id'])
+    for _ in range(2):
+        client.post(f"/api/pricing/generate/{project['id']}", json={'num_widgets': 2})
+    stats = client.get('/api/pricing/cache').json
+    assert (stats['size'], stats['hits'], stats['misses']) == (1, 1, 1)
+
+    client.post('/api/pricing/rate-card', json={'rates': {'widget': 30}})
+    assert client.get('/api/pricing/cache').json['size'] == 0
+    quote = client.post(f"/api/pricing/generate/{project['id']}", json={'num_widgets': 2}).json
+    assert quote['widgets_price'] == 60
+
+    assert client.delete('/api/pricing/cache', json={'key': 'missing'}).json == {'invalidated': 0}
+    assert client.delete('/api/pricing/cache').json == {'invalidated': 1}
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from app.utils.pricing_logic import generate_quote
+from app.utils.quote_uncertainty import sample_input, simulate_quote
+from app.utils.rate_card import DEFAULT_RATES
+
+BASE = {'num_dashboards': 2, 'num_widgets': 10, 'support_plan': 'Priority', 'branding': {'logo': True}}
+DISTRIBUTIONS = {
+    'num_widgets': {'distribution': 'triangular', 'min': 5, 'mode': 20, 'max': 60, 'integer': True},
+    'support_hours': {'distribution': 'normal', 'mean': 10, 'std': 4},
+    'support_plan': {'distribution': 'choice', 'values': ['Basic', 'Priority'], 'weights': [3, 1]},
+}
+WIDGETS = {'num_widgets': {'min': 0, 'max': 1}}
+
+
+def test_a_seed_reproduces_the_bands():
+    first = simulate_quote(BASE, DISTRIBUTIONS, samples=5000, seed=7)
+    assert first == simulate_quote(BASE, DISTRIBUTIONS, samples=5000, seed=7)
+    assert first != simulate_quote(BASE, DISTRIBUTIONS, samples=5000, seed=8)
+    assert (first['samples'], first['seed'], first['inputs']) == (5000, 7, list(DISTRIBUTIONS))
+
+
+def test_bands_are_ordered_and_shares_add_up():
+    result = simulate_quote(BASE, DISTRIBUTIONS, samples=5000, seed=1)
+    for summary in [result['total_price'], *result['components'].values()]:
+        assert summary['p10'] <= summary['p50'] <= summary['p90']
+    assert result['total_price']['p10'] < result['total_price']['p90']
+    assert sum(c['share'] for c in result['components'].values()) == pytest.approx(1, abs=1e-3)
+    # Untouched inputs price the same in every sample
+    base = result['components']['base_price']
+    assert base['p10'] == base['p90'] == DEFAULT_RATES['base_price']
+
+
+def test_a_degenerate_distribution_prices_like_generate_quote():
+    distributions = {'num_widgets': {'distribution': 'uniform', 'min': 25, 'max': 25}}
+    result = simulate_quote(BASE, distributions, samples=100, seed=1)
+    expected = generate_quote(dict(BASE, num_widgets=25))['total_price']
+    assert result['total_price']['p10'] == result['total_price']['p90'] == pytest.approx(expected)
+
+
+def test_normal_samples_are_clipped_and_rounded():
+    rng = np.random.default_rng(0)
+    samples = sample_input('support_hours', {'distribution': 'normal', 'mean': 0, 'std': 10, 'max': 5,
+                                             'integer': True}, 1000, rng)
+    assert samples.min() == 0 and samples.max() == 5
+    assert np.array_equal(samples, np.rint(samples))
+
+
+@pytest.mark.parametrize('distributions, message', [
+    ({}, 'non-empty object'),
+    ({'num_widgets': {'distribution': 'beta'}}, 'Unknown distribution'),
+    ({'num_widgets': {'distribution': 'uniform', 'min': 5, 'max': 1}}, 'min must not exceed max'),
+    ({'num_widgets': {'distribution': 'triangular', 'min': 0, 'mode': 9, 'max': 5}}, 'min <= mode <= max'),
+    ({'num_widgets': {'distribution': 'normal', 'mean': 5, 'std': -1}}, 'std must not be negative'),
+    ({'num_widgets': {'distribution': 'uniform', 'min': 0}}, 'needs min, max'),
+    ({'support_plan': {'distribution': 'uniform', 'min': 0, 'max': 1}}, 'needs a choice'),
+    ({'num_widgets': {'distribution': 'choice', 'values': [1, 2], 'weights': [1]}}, 'one non-negative number'),
+    ({'num_widgets': {'distribution': 'uniform', 'min': 0, 'max': 10 ** 400}}, 'below 1e308'),
+    ({'num_widgets': {'distribution': 'choice', 'values': [1, 10 ** 400]}}, 'below 1e308'),
+])
+def test_invalid_distributions_are_rejected(distributions, message):
+    with pytest.raises(ValueError, match=message):
+        simulate_quote(BASE, distributions, samples=10, seed=1)
+
+
+def test_generate_endpoint_adds_bands_and_stores_the_plain_quote(client, make_client, make_project):
+    project = make_project(make_client()['id'])
+    body = {'num_widgets': 10, 'uncertainty': {'distributions': {'num_widgets': DISTRIBUTIONS['num_widgets']},
+                                                'samples': 2000, 'seed': 3}}
+    response = client.post(f"/api/pricing/generate/{project['id']}", json=body)
+    assert response.status_code == 201
+    bands = response.json['uncertainty']['total_price']
+    assert bands['p10'] <= bands['p50'] <= bands['p90']
+    assert response.json['widgets_price'] == 10 * DEFAULT_RATES['widget']
+
+
+@pytest.mark.parametrize('body', [
+    {'uncertainty': []},
+    {'uncertainty': {'distributions': WIDGETS, 'samples': 0}},
+    {'uncertainty': {'distributions': WIDGETS, 'seed': -1}},
+    {'uncertainty': {'distributions': WIDGETS, 'seed': True}},
+    {'uncertainty': {'distributions': {'num_widgets': {'min': 0, 'max': 10 ** 400}}}},
+    {'uncertainty': {'distributions': WIDGETS}, 'support_hours': 10 ** 400},
+])
+def test_generate_endpoint_rejects_bad_uncertainty(client, make_client, make_project, body):
+    project = make_project(make_client()['id'])
+    assert client.post(f"/api/pricing/generate/{project['id']}", json=body).status_code == 400
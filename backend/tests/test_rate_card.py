@@ -0,0 +1,84 @@
+import pytest
+
+from app import db
+from app.models import RateCard
+from app.utils import rate_card
+from app.utils.rate_card import DEFAULT_RATES, DEFAULT_RATE_CARD, compile_rate_card, get_rate_card
+
+
+def test_default_card_is_version_zero(client):
+    response = client.get('/api/pricing/rate-card')
+    assert response.json == {'version': 0, 'rates': DEFAULT_RATES}
+
+
+def test_publishing_creates_the_next_version_and_carries_rates_over(client):
+    response = client.post('/api/pricing/rate-card', json={'rates': {'widget': 25}, 'description': 'v1'})
+    assert response.status_code == 201
+    assert response.json['version'] == 1
+    response = client.post('/api/pricing/rate-card', json={'rates': {'base_price': 1500}})
+    assert response.json['version'] == 2
+
+    active = client.get('/api/pricing/rate-card').json
+    assert active['version'] == 2
+    assert active['rates'] == dict(DEFAULT_RATES, widget=25, base_price=1500)
+    versions = client.get('/api/pricing/rate-cards').json
+    assert [card['version'] for card in versions] == [2, 1]
+
+
+def test_quotes_are_priced_with_the_active_version(client, make_client, make_project):
+    project = make_project(make_client()['id'])
+    before = client.post(f"/api/pricing/generate/{project['id']}", json={'num_widgets': 10}).json
+    assert before['rate_card_version'] == 0
+    assert before['widgets_price'] == 10 * DEFAULT_RATES['widget']
+
+    client.post('/api/pricing/rate-card', json={'rates': {'widget': 50}})
+    after = client.post(f"/api/pricing/generate/{project['id']}", json={'num_widgets': 10}).json
+    assert after['rate_card_version'] == 1
+    assert after['widgets_price'] == 500
+
+
+@pytest.mark.parametrize('rates, message', [
+    ({'widget': -1}, 'widget must be non-negative numbers'),
+    ({'widget': True}, 'widget must be non-negative numbers'),
+    ({'nonsense': 1}, 'Unknown rates'),
+    ({'database_tier_bounds': [10, 5]}, 'strictly increasing'),
+    ({'database_tier_prices': [1, 2]}, 'one more entry'),
+    ({'hosting_block_size': 0}, 'hosting_block_size must be positive'),
+])
+def test_invalid_rates_are_rejected_without_a_new_version(client, rates, message):
+    response = client.post('/api/pricing/rate-card', json={'rates': rates})
+    assert response.status_code == 400
+    assert message in response.json['error']
+    assert client.get('/api/pricing/rate-card').json['version'] == 0
+
+
+def test_versions_published_by_other_workers_are_picked_up(ctx):
+    # Another process stores version 1; this one only reads the table
+    db.session.add(RateCard(version=1, rates=dict(DEFAULT_RATES, widget=99)))
+    db.session.commit()
+    assert get_rate_card().version == 1
+    assert get_rate_card().widget == 99
+
+
+def test_refresh_interval_avoids_a_query_per_quote(app, ctx):
+    app.config['RATE_CARD_REFRESH_SECONDS'] = 60
+    try:
+        assert get_rate_card().version == 0
+        db.session.add(RateCard(version=1, rates=DEFAULT_RATES))
+        db.session.commit()
+        assert get_rate_card().version == 0
+        rate_card._checked_at = None
+        assert get_rate_card().version == 1
+    finally:
+        app.config['RATE_CARD_REFRESH_SECONDS'] = 0
+
+
+@pytest.mark.parametrize('records, price', [(0, 40), (999, 40), (1000, 100), (99999, 200), (10 ** 6, 700), (10 ** 30, 700)])
+def test_database_tiers_include_their_lower_bound(records, price):
+    assert DEFAULT_RATE_CARD.database_tier_price(records) == price
+
+
+def test_compiled_card_exposes_rates_as_attributes():
+    card = compile_rate_card(dict(DEFAULT_RATES, drilldown=7), 3)
+    assert (card.version, card.drilldown) == (3, 7)
+    assert card.database_tier_bounds == tuple(DEFAULT_RATES['database_tier_bounds'])
@@ -0,0 +1,172 @@
+import time
+import types
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app import db
+from app.models import Quote, RepricingJob
+from app.utils import repricing
+from app.utils.repricing import (
+    can_resume, create_repricing_job, job_progress, resume_repricing_job, run_repricing_job
+)
+
+
+@pytest.fixture
+def quotes(client, make_client, make_project):
+    owner = make_client()
+    for widgets in range(1, 8):
+        project = make_project(owner['id'])
+        response = client.post(f"/api/pricing/generate/{project['id']}", json={'num_widgets': widgets})
+        assert response.status_code in (200, 201)
+    # Priced with version 0, repriced with version 1
+    client.post('/api/pricing/rate-card', json={'rates': {'widget': 100}})
+
+
+def widget_prices():
+    return [quote.widgets_price for quote in Quote.query.order_by(Quote.id)]
+
+
+def reload(job):
+    # The job ran in its own app context and session
+    db.session.expire_all()
+    return db.session.get(RepricingJob, job.id)
+
+
+def wait_for(client, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = client.get(f'/api/pricing/reprice/{job_id}').json
+        if status['status'] in ('completed', 'failed'):
+            return status
+        time.sleep(0.02)
+    raise AssertionError(f'Job {job_id} did not finish')
+
+
+def test_job_reprices_every_quote_in_chunks(app, ctx, quotes):
+    job = create_repricing_job(chunk_size=3)
+    assert job.total == 7
+    run_repricing_job(app, job.id)
+
+    job = reload(job)
+    assert (job.status, job.processed, job.skipped, job.rate_card_version) == ('completed', 7, 0, 1)
+    assert widget_prices() == [100 * n for n in range(1, 8)]
+    assert job_progress(job)['percent'] == 100.0
+
+
+def test_quotes_without_inputs_are_skipped(app, ctx, quotes):
+    first = Quote.query.order_by(Quote.id).first()
+    first.inputs = None
+    db.session.commit()
+
+    job = create_repricing_job(chunk_size=10)
+    run_repricing_job(app, job.id)
+    job = reload(job)
+    assert (job.processed, job.skipped) == (6, 1)
+    assert widget_prices()[0] == 20
+
+
+def test_a_failed_job_resumes_after_its_last_committed_chunk(app, ctx, quotes, monkeypatch):
+    reprice_chunk = repricing.reprice_chunk
+    calls = []
+
+    def failing_chunk(*args):
+        calls.append(args[0])
+        if len(calls) == 2:
+            raise RuntimeError('worker died')
+        return reprice_chunk(*args)
+
+    monkeypatch.setattr(repricing, 'reprice_chunk', failing_chunk)
+    job = create_repricing_job(chunk_size=3)
+    run_repricing_job(app, job.id)
+
+    job = reload(job)
+    assert (job.status, job.error, job.processed) == ('failed', 'worker died', 3)
+    assert widget_prices() == [100, 200, 300, 80, 100, 120, 140]
+    assert can_resume(job)
+
+    # The first chunk is not repriced again
+    run_repricing_job(app, job.id)
+    job = reload(job)
+    assert (job.status, job.error, job.processed) == ('completed', None, 7)
+    assert calls[2] == calls[1]
+    assert widget_prices() == [100 * n for n in range(1, 8)]
+
+
+def test_only_failed_or_stale_jobs_can_resume(app, ctx):
+    job = create_repricing_job(chunk_size=10)
+    assert not can_resume(job)
+    job.updated_at = datetime.utcnow() - timedelta(seconds=app.config['REPRICING_STALE_SECONDS'] + 1)
+    assert can_resume(job)
+    job.status = 'completed'
+    assert not can_resume(job)
+
+
+@pytest.fixture
+def no_workers(monkeypatch):
+    started = []
+    monkeypatch.setattr(repricing, '_start_worker', started.append)
+    return started
+
+
+def make_stale(app, job):
+    job.updated_at = datetime.utcnow() - timedelta(seconds=app.config['REPRICING_STALE_SECONDS'] + 1)
+    db.session.commit()
+
+
+def test_a_stale_job_is_not_resumed_while_its_thread_is_alive(app, ctx, monkeypatch):
+    job = create_repricing_job(chunk_size=10)
+    job.status = 'running'
+    make_stale(app, job)
+    monkeypatch.setitem(repricing._threads, job.id, types.SimpleNamespace(is_alive=lambda: True))
+    assert not can_resume(job)
+    assert repricing.active_repricing_job().id == job.id
+
+
+def test_only_one_job_is_active_at_a_time(app, client, ctx, no_workers):
+    running = create_repricing_job(chunk_size=10)
+    response = client.post('/api/pricing/reprice')
+    assert response.status_code == 409
+    assert response.json['error'] == f'Repricing job {running.id} is still pending'
+
+    failed = create_repricing_job(chunk_size=10)
+    failed.status = 'failed'
+    db.session.commit()
+    assert client.post(f'/api/pricing/reprice/{failed.id}/resume').status_code == 409
+
+    # Once the other job stops reporting, either request goes through
+    make_stale(app, running)
+    response = client.post(f'/api/pricing/reprice/{failed.id}/resume')
+    assert (response.status_code, response.json['status']) == (202, 'pending')
+    assert [job.id for job in no_workers] == [failed.id]
+    assert client.post('/api/pricing/reprice').status_code == 409
+
+
+def test_a_job_is_claimed_by_one_resume_only(ctx, monkeypatch, no_workers):
+    job = create_repricing_job(chunk_size=10)
+    job.status = 'failed'
+    db.session.commit()
+
+    def resumed_elsewhere(exclude_id=None):
+        # Another process claims the job after this one checked it
+        db.session.execute(
+            update(RepricingJob).where(RepricingJob.id == job.id)
+            .values(status='pending', updated_at=datetime.utcnow()),
+            execution_options={'synchronize_session': False}
+        )
+
+    monkeypatch.setattr(repricing, 'active_repricing_job', resumed_elsewhere)
+    assert resume_repricing_job(job) == (None, 'Job was resumed by another request')
+    assert no_workers == []
+
+
+def test_reprice_endpoints(client, quotes):
+    assert client.post('/api/pricing/reprice', json={'chunk_size': 0}).status_code == 400
+    response = client.post('/api/pricing/reprice', json={'chunk_size': 2})
+    assert response.status_code == 202
+    status = wait_for(client, response.json['id'])
+    assert (status['status'], status['processed'], status['percent']) == ('completed', 7, 100.0)
+
+    response = client.post(f"/api/pricing/reprice/{status['id']}/resume")
+    assert response.status_code == 409
@@ -0,0 +1,195 @@
+import fnmatch
+import types
+
+import pytest
+from flask import Flask
+from sqlalchemy import update
+from sqlalchemy.orm import sessionmaker
+
+from app import db
+from app.models import Client
+from app.utils import response_cache as response_cache_module
+from app.utils.response_cache import MemoryBackend, RedisBackend, ResponseCache, response_cache
+
+
+class DictRedis:
+    """The few Redis commands RedisBackend uses, over a dict"""
+
+    def __init__(self):
+        self.data = {}
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode()
+        return True
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match):
+        return [key for key in list(self.data) if fnmatch.fnmatch(key, match)]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache_module, 'time', types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def owner(make_client):
+    return make_client()
+
+
+def counts(client, endpoint):
+    return client.get('/api/cache/responses').json['endpoints'].get(endpoint, {})
+
+
+def test_repeated_reads_are_served_from_the_cache(client, owner):
+    url = f"/api/clients/{owner['id']}"
+    first = client.get(url)
+    second = client.get(url)
+    assert second.json == first.json
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert counts(client, 'clients.get_client') == {'hits': 1, 'misses': 1, 'stores': 1, 'hit_ratio': 0.5}
+    # A hit still answers conditional requests
+    response = client.get(url, headers={'If-None-Match': first.headers['ETag']})
+    assert response.status_code == 304
+
+
+def test_arguments_are_part_of_the_key(client, owner):
+    url = f"/api/clients/{owner['id']}"
+    full = client.get(url).json
+    summary = client.get(url, query_string={'fields': 'name'}).json
+    assert summary != full
+    assert counts(client, 'clients.get_client')['hits'] == 0
+
+
+def test_orm_writes_invalidate_the_row_and_its_lists(client, owner, make_client):
+    other = make_client(name='Other')
+    client.get(f"/api/clients/{owner['id']}")
+    client.get(f"/api/clients/{other['id']}")
+    client.get('/api/clients/')
+    client.put(f"/api/clients/{owner['id']}", json={'name': 'Renamed'})
+
+    assert client.get(f"/api/clients/{owner['id']}").json['name'] == 'Renamed'
+    assert 'Renamed' in [c['name'] for c in client.get('/api/clients/').json['items']]
+    client.get(f"/api/clients/{other['id']}")
+    assert counts(client, 'clients.get_client')['hits'] == 1
+    assert counts(client, 'clients.get_all_clients')['hits'] == 0
+
+
+def test_rolled_back_changes_invalidate_nothing(app, client, owner):
+    url = f"/api/clients/{owner['id']}"
+    client.get(url)
+    with app.app_context():
+        db.session.get(Client, owner['id']).name = 'Never committed'
+        db.session.flush()
+        db.session.rollback()
+    assert client.get(url).json['name'] == owner['name']
+    assert counts(client, 'clients.get_client')['hits'] == 1
+
+
+def test_bulk_statements_invalidate_by_primary_key_or_whole_model(app, client, owner, make_client):
+    other = make_client(name='Other')
+    urls = [f"/api/clients/{owner['id']}", f"/api/clients/{other['id']}"]
+    for url in urls:
+        client.get(url)
+    with app.app_context():
+        db.session.execute(update(Client), [{'id': owner['id'], 'name': 'By key'}])
+        db.session.commit()
+    assert client.get(urls[0]).json['name'] == 'By key'
+    assert client.get(urls[1]).json['name'] == 'Other'
+
+    with app.app_context():
+        db.session.execute(update(Client).where(Client.name == 'Other').values(name='By filter'))
+        db.session.commit()
+    assert client.get(urls[1]).json['name'] == 'By filter'
+
+
+def test_repricing_invalidates_cached_quotes(client, owner, make_project):
+    project = make_project(owner['id'])
+    quote = client.post(f"/api/pricing/generate/{project['id']}", json={'num_widgets': 1}).json
+    url = f"/api/pricing/quote/{quote['id']}"
+    client.get(url)
+    client.post('/api/pricing/rate-card', json={'rates': {'widget': 1000}})
+    client.post('/api/pricing/generate-batch', json={'quotes': [{'project_id': project['id'], 'num_widgets': 1}]})
+    assert client.get(url).json['widgets_price'] == 1000
+
+
+def test_clearing_the_cache(client, owner):
+    url = f"/api/clients/{owner['id']}"
+    client.get(url)
+    assert client.delete('/api/cache/responses').json == {'cleared': True}
+    client.get(url)
+    stats = client.get('/api/cache/responses').json
+    assert (stats['hits'], stats['misses'], stats['store']['backend']) == (0, 2, 'memory')
+
+
+def test_memory_backend_expires_and_evicts(clock):
+    backend = MemoryBackend(maxsize=2)
+    backend.set('a', 1, ttl=10)
+    backend.set('b', 2, ttl=10)
+    backend.get_many(['a'])
+    backend.set('c', 3, ttl=10)
+    assert backend.get_many(['a', 'b', 'c']) == [1, None, 3]
+    assert backend.stats()['evictions'] == 1
+
+    assert backend.add('a', 9, ttl=10) == 1
+    clock[0] += 11
+    assert backend.get_many(['a']) == [None]
+    assert backend.add('a', 9, ttl=10) == 9
+
+
+def test_redis_backend_round_trips_json():
+    backend = RedisBackend(client=DictRedis())
+    backend.set('entry', {'body': '{}', 'etag': 'x'}, ttl=10)
+    assert backend.get_many(['entry', 'missing']) == [{'body': '{}', 'etag': 'x'}, None]
+    assert backend.add('entry', {'other': True}, ttl=10) == {'body': '{}', 'etag': 'x'}
+    backend.delete(['entry'])
+    assert backend.add('entry', 'token', ttl=10) == 'token'
+    backend.clear()
+    assert backend.client.data == {}
+
+
+@pytest.mark.parametrize('setting, workers, expected', [
+    ('auto', 1, MemoryBackend),
+    ('auto', 4, RedisBackend),
+    ('memory', 4, MemoryBackend),
+    ('none', 4, type(None)),
+])
+def test_backend_follows_the_worker_count(monkeypatch, setting, workers, expected):
+    monkeypatch.setattr(response_cache_module, 'redis',
+                        types.SimpleNamespace(Redis=types.SimpleNamespace(from_url=lambda url: DictRedis())))
+    app = Flask(__name__)
+    app.config.update(RESPONSE_CACHE_BACKEND=setting, WEB_CONCURRENCY=workers)
+    cache = ResponseCache()
+    cache.init_app(app, sessionmaker())
+    assert type(cache.backend) is expected
+
+
+def test_a_shared_cache_needs_redis_installed(monkeypatch):
+    monkeypatch.setattr(response_cache_module, 'redis', None)
+    app = Flask(__name__)
+    app.config.update(WEB_CONCURRENCY=2)
+    with pytest.raises(ValueError, match='redis package'):
+        ResponseCache().init_app(app, sessionmaker())
+
+
+def test_a_disabled_cache_serves_every_request_fresh(client, owner):
+    backend = response_cache.backend
+    response_cache.backend = None
+    try:
+        assert client.get(f"/api/clients/{owner['id']}").json['name'] == owner['name']
+        assert client.get('/api/cache/responses').json['store'] == {'backend': 'none'}
+    finally:
+        response_cache.backend = backend
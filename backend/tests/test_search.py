@@ -0,0 +1,122 @@
+import pytest
+
+from app import db
+from app.models import DemoBusinessAnalysis
+from app.utils import search as search_module
+
+FTS_MIGRATION = 'f16c7c13584c_add_full_text_search_index.py'
+
+
+@pytest.fixture
+def projects(app, make_client, make_project):
+    owner = make_client()['id']
+    ids = {
+        'title': make_project(owner, title='Churn dashboard', description='Quarterly revenue report')['id'],
+        'description': make_project(owner, title='Quarterly revenue report', description='Churn dashboard')['id'],
+        'other': make_project(owner, title='Inventory tracker', description='Warehouse stock levels')['id'],
+    }
+    # Enough unrelated documents for the matched words to carry weight in bm25
+    for n in range(6):
+        make_project(owner, title=f'Filler {n}', description='Nothing relevant here')
+    with app.app_context():
+        db.session.add(DemoBusinessAnalysis(project_id=ids['other'],
+                                            problem_statement='Stock churn across regional warehouses'))
+        db.session.commit()
+        ids['analysis'] = DemoBusinessAnalysis.query.one().id
+    return ids
+
+
+def search(client, **params):
+    response = client.get('/api/search/', query_string=params)
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def test_title_matches_rank_above_body_matches(client, projects):
+    body = search(client, q='churn dashboard', type='project')
+    assert body['engine'] == 'fts5'
+    assert [hit['id'] for hit in body['results']] == [projects['title'], projects['description']]
+    first, second = body['results']
+    assert first['score'] > second['score']
+    assert first['title'] == 'Churn dashboard'
+    assert '**Churn**' in first['snippet'] and '**dashboard**' in first['snippet']
+
+
+def test_results_span_projects_and_demo_analyses(client, projects):
+    hits = search(client, q='churn')['results']
+    assert {(hit['type'], hit['id']) for hit in hits} == {
+        ('project', projects['title']), ('project', projects['description']), ('demo_analysis', projects['analysis'])
+    }
+    analysis = next(hit for hit in hits if hit['type'] == 'demo_analysis')
+    assert (analysis['project_id'], analysis['title']) == (projects['other'], 'Inventory tracker')
+    assert [hit['type'] for hit in search(client, q='churn', type='demo_analysis')['results']] == ['demo_analysis']
+
+
+def test_prefix_terms_and_every_word_required(client, projects):
+    assert {hit['id'] for hit in search(client, q='dash*', type='project')['results']} == {
+        projects['title'], projects['description']
+    }
+    assert search(client, q='dash', type='project')['results'] == []
+    assert search(client, q='churn inventory')['results'] == []
+
+
+def test_older_matches_are_ranked_with_the_newest(client, make_client, make_project, projects):
+    owner = make_client()['id']
+    for n in range(5):
+        make_project(owner, title=f'Report {n}', description='Mentions churn once')
+    hits = search(client, q='churn dashboard', type='project', limit=1)['results']
+    assert [hit['id'] for hit in hits] == [projects['title']]
+
+
+@pytest.mark.parametrize('q', ['churn OR "', 'churn NEAR(', 'title:churn', 'churn AND -'])
+def test_query_syntax_is_never_interpreted(client, projects, q):
+    hits = search(client, q=q, type='project')['results']
+    assert {hit['id'] for hit in hits} <= {projects['title'], projects['description']}
+
+
+def test_index_follows_project_updates(client, projects):
+    client.put(f"/api/projects/{projects['other']}", json={'title': 'Churn forecasting'})
+    ids = [hit['id'] for hit in search(client, q='forecasting')['results']]
+    assert ids == [projects['other']]
+    assert search(client, q='inventory')['results'] == []
+
+
+def test_like_fallback_finds_the_same_documents(app, client, projects):
+    app.config['SEARCH_ENGINE'] = 'like'
+    try:
+        body = search(client, q='churn dash*')
+    finally:
+        app.config['SEARCH_ENGINE'] = 'auto'
+    assert body['engine'] == 'like'
+    assert {hit['id'] for hit in body['results']} == {projects['title'], projects['description']}
+    assert all(hit['score'] is None and '**' in hit['snippet'] for hit in body['results'])
+
+
+def test_like_treats_underscores_literally(app, client, make_client, make_project):
+    owner = make_client()['id']
+    literal = make_project(owner, title='rate_card refresh')['id']
+    make_project(owner, title='ratexcard refresh')
+    app.config['SEARCH_ENGINE'] = 'like'
+    try:
+        hits = search(client, q='rate_card')['results']
+    finally:
+        app.config['SEARCH_ENGINE'] = 'auto'
+    assert [hit['id'] for hit in hits] == [literal]
+
+
+def test_an_index_added_later_is_picked_up(app, client, projects, run_migration, monkeypatch):
+    monkeypatch.setattr(search_module, '_fts_ready', set())
+    with app.app_context(), db.engine.begin() as connection:
+        run_migration(connection, FTS_MIGRATION, 'downgrade')
+    assert search(client, q='churn')['engine'] == 'like'
+
+    with app.app_context(), db.engine.begin() as connection:
+        run_migration(connection, FTS_MIGRATION)
+    assert search(client, q='churn')['engine'] == 'fts5'
+    assert search(client, q='churn', type='project')['results'][0]['id'] == projects['title']
+
+
+@pytest.mark.parametrize('params', [{}, {'q': '!!'}, {'q': 'churn', 'limit': 0}, {'q': 'churn', 'limit': 'x'},
+                                    {'q': 'churn', 'type': 'client'}])
+def test_invalid_searches_are_rejected(client, params):
+    assert client.get('/api/search/', query_string=params).status_code == 400
@@ -0,0 +1,91 @@
+import pytest
+
+from app import db
+from app.models import KanbanTicket, KanbanTicketTag
+from app.utils.tag_index import normalize_tags
+
+TAGS = [
+    ['urgent', 'eu'],
+    ['urgent', 'us', 'enterprise'],
+    ['eu', 'enterprise'],
+    ['backlog'],
+    [],
+    ['urgent', 'eu', 'enterprise'],
+]
+
+
+@pytest.fixture
+def tickets(client, make_client, make_project):
+    owner = make_client()['id']
+    projects = [make_project(owner, tags=tags)['id'] for tags in TAGS]
+    by_project = {t['project_id']: t['id'] for t in client.get('/api/kanban/', query_string={'limit': 100}).json['items']}
+    return [by_project[project_id] for project_id in projects]
+
+
+def matching(tickets, all_tags=(), any_tags=(), no_tags=()):
+    return sorted(
+        ticket_id for ticket_id, tags in zip(tickets, TAGS)
+        if set(all_tags) <= set(tags)
+        and (not any_tags or set(any_tags) & set(tags))
+        and not set(no_tags) & set(tags)
+    )
+
+
+def search(client, **params):
+    response = client.get('/api/kanban/search', query_string=dict(params, limit=100))
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+@pytest.mark.parametrize('params, all_tags, any_tags, no_tags', [
+    ({'all': 'urgent'}, ['urgent'], [], []),
+    ({'tag': 'urgent'}, ['urgent'], [], []),
+    ({'all': 'urgent,eu'}, ['urgent', 'eu'], [], []),
+    ({'all': ['urgent', 'eu', 'enterprise']}, ['urgent', 'eu', 'enterprise'], [], []),
+    ({'any': 'us,backlog'}, [], ['us', 'backlog'], []),
+    ({'not': 'urgent'}, [], [], ['urgent']),
+    ({'all': 'enterprise', 'not': 'us'}, ['enterprise'], [], ['us']),
+    ({'all': 'eu', 'any': 'urgent,enterprise', 'not': 'us'}, ['eu'], ['urgent', 'enterprise'], ['us']),
+    ({'all': 'missing'}, ['missing'], [], []),
+    ({'all': ' urgent , ,urgent'}, ['urgent'], [], []),
+])
+def test_search_matches_all_any_and_not(client, tickets, params, all_tags, any_tags, no_tags):
+    found = search(client, **params)['items']
+    assert sorted(t['id'] for t in found) == matching(tickets, all_tags, any_tags, no_tags)
+
+
+def test_tag_counts_cover_every_match_not_only_the_page(client, tickets):
+    body = client.get('/api/kanban/search', query_string={'all': 'urgent', 'limit': 1}).json
+    assert len(body['items']) == 1
+    assert body['tag_counts'] == {'urgent': 3, 'enterprise': 2, 'eu': 2, 'us': 1}
+    assert client.get('/api/kanban/tags').json == {'enterprise': 3, 'eu': 3, 'urgent': 3, 'backlog': 1, 'us': 1}
+
+
+def test_index_follows_orm_and_bulk_retags(app, client, tickets):
+    with app.app_context():
+        ticket = db.session.get(KanbanTicket, tickets[3])
+        ticket.tags = ['urgent', 'urgent', '', 7]
+        db.session.commit()
+    assert tickets[3] in [t['id'] for t in search(client, all='urgent')['items']]
+    assert search(client, all='backlog')['items'] == []
+
+    client.post('/api/kanban/bulk', json={'changes': [
+        {'ticket_id': tickets[0], 'add_tags': ['backlog'], 'remove_tags': ['urgent']},
+    ]})
+    assert [t['id'] for t in search(client, all='backlog')['items']] == [tickets[0]]
+    assert tickets[0] not in [t['id'] for t in search(client, all='urgent')['items']]
+
+    with app.app_context():
+        db.session.delete(db.session.get(KanbanTicket, tickets[1]))
+        db.session.commit()
+        assert KanbanTicketTag.query.filter_by(ticket_id=tickets[1]).count() == 0
+
+
+def test_search_needs_a_tag_filter(client):
+    assert client.get('/api/kanban/search').status_code == 400
+    assert client.get('/api/kanban/search', query_string={'all': ' , '}).status_code == 400
+
+
+def test_normalize_tags_keeps_the_first_of_each_string_tag():
+    assert normalize_tags(['b', 'a', 'b', '', None, 3, 'a']) == ['b', 'a']
+    assert normalize_tags('urgent') == []